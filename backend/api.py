@@ -1,17 +1,33 @@
 """Main FastAPI application with GraphQL integration"""
 from fastapi import FastAPI, Request
-from strawberry.fastapi import GraphQLRouter
+from fastapi.responses import PlainTextResponse
 from dotenv import load_dotenv
 from jose import jwt, JWTError
 from app.supabase.utils.client import create_authenticated_client
 from app.supabase.config import supabase_config
 
+from app.graphql.router import CohabGraphQLRouter
 from app.graphql.schema import schema
 from app.graphql.context import CustomContext
+from app.graphql.extensions import create_call_ledger, metrics_call_observers, tracing_call_observers
+from app.observability import (
+    RequestIdMiddleware,
+    TracingMiddleware,
+    TrafficCaptureMiddleware,
+    configure_logging,
+    create_capture_writer,
+    metrics_registry,
+    observability_config,
+    shutdown_logging,
+    tracer,
+)
 
 # Load environment variables
 load_dotenv()
 
+# Log through a background writer so logging never blocks the event loop
+configure_logging()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="Cohab API",
@@ -19,6 +35,29 @@ app = FastAPI(
     version="1.0.0",
 )
 
+# Request spans; a no-op unless TRACING_EXPORTER is set
+app.add_middleware(TracingMiddleware, tracer=tracer)
+# Anonymized GraphQL traffic for replay; only when TRAFFIC_CAPTURE_PATH is set
+capture_writer = create_capture_writer()
+if capture_writer is not None:
+    app.add_middleware(
+        TrafficCaptureMiddleware,
+        writer=capture_writer,
+        sample_rate=observability_config.traffic_capture_sample_rate,
+    )
+# Added last so it runs first and the request id is set for everything else
+app.add_middleware(RequestIdMiddleware)
+
+
+@app.on_event("shutdown")
+async def flush_traces():
+    """Export spans, captured requests and log records still buffered when the worker stops"""
+    tracer.shutdown()
+    if capture_writer is not None:
+        capture_writer.close()
+    shutdown_logging()
+
+
 # Context getter for GraphQL
 async def get_context(request: Request) -> CustomContext:
     """Get GraphQL context with dependencies"""
@@ -29,29 +68,35 @@ async def get_context(request: Request) -> CustomContext:
         
         # Extract user_id from JWT payload
         if token and supabase_config.jwt_secret:
-            try:
-                # Verify and decode JWT using Supabase secret
-                payload = jwt.decode(
-                    token,
-                    supabase_config.jwt_secret,
-                    algorithms=["HS256"],
-                    options={"verify_aud": False}  # Supabase doesn't use aud claim
-                )
-                user_id = payload.get("sub")  # 'sub' contains the user ID
-            except JWTError as e:
-                pass  # Invalid token signature or format, user_id remains None
+            with tracer.start_span("auth.decode_jwt") as span:
+                try:
+                    # Verify and decode JWT using Supabase secret
+                    payload = jwt.decode(
+                        token,
+                        supabase_config.jwt_secret,
+                        algorithms=["HS256"],
+                        options={"verify_aud": False}  # Supabase doesn't use aud claim
+                    )
+                    user_id = payload.get("sub")  # 'sub' contains the user ID
+                except JWTError as e:
+                    pass  # Invalid token signature or format, user_id remains None
+                if span is not None:
+                    span.set_attribute("auth.valid", user_id is not None)
         
-        supabase_client = await create_authenticated_client(token)
+        with tracer.start_span("supabase.create_client"):
+            supabase_client = await create_authenticated_client(token)
     except Exception as e:
         raise Exception(f"Failed to create authenticated client: {e}")
     return CustomContext(
         supabase=supabase_client,
         user_id=user_id,
+        call_observers=[*metrics_call_observers(), *tracing_call_observers()],
+        call_ledger=create_call_ledger(),
     )
 
 
 # Create GraphQL router
-graphql_app = GraphQLRouter(
+graphql_app = CohabGraphQLRouter(
     schema,
     context_getter=get_context,
 )
@@ -76,6 +121,15 @@ async def health():
     return {"status": "healthy"}
 
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus metrics for this worker process"""
+    return PlainTextResponse(
+        metrics_registry.render(),
+        media_type="text/plain; version=0.0.4",
+    )
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
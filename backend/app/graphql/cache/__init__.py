@@ -0,0 +1,38 @@
+"""
+Response cache for read-only GraphQL queries.
+
+Query fields marked with @cacheControl(maxAge, scopes) can be served from a
+per-worker cache keyed by (normalized document, variables, user). Each entry
+is validated against per-household version stamps, which database triggers
+bump whenever a household's members, chores or expenses change, so a repeat
+query costs one version check instead of its PostgREST calls. The same stamps
+give each response an ETag, and a request whose If-None-Match matches it gets
+a 304 without running the query at all.
+
+See app.graphql.extensions.response_cache and database/migrations/household_versions.sql.
+"""
+from .config import ResponseCacheConfig, response_cache_config
+from .directives import CACHE_SCOPES, CacheControl
+from .response_cache import (
+    CachePlan,
+    ResponseCache,
+    cache_key,
+    fetch_versions,
+    make_etag,
+    plan_cache,
+    response_cache,
+)
+
+__all__ = [
+    "ResponseCacheConfig",
+    "response_cache_config",
+    "CACHE_SCOPES",
+    "CacheControl",
+    "CachePlan",
+    "ResponseCache",
+    "cache_key",
+    "fetch_versions",
+    "make_etag",
+    "plan_cache",
+    "response_cache",
+]
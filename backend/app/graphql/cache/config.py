@@ -0,0 +1,28 @@
+import os
+from dataclasses import dataclass
+
+
+@dataclass
+class ResponseCacheConfig:
+    """Configuration for the GraphQL response cache."""
+
+    # Needs database/migrations/household_versions.sql to be applied
+    enabled: bool = False
+
+    # Responses kept per worker; least recently used ones are evicted first
+    max_entries: int = 10_000
+
+    @classmethod
+    def from_env(cls) -> "ResponseCacheConfig":
+        """Create ResponseCacheConfig from environment variables."""
+        enabled = os.getenv("RESPONSE_CACHE", "false").lower() in ("1", "true", "yes")
+        max_entries = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "10000"))
+
+        if max_entries < 0:
+            raise ValueError("RESPONSE_CACHE_MAX_ENTRIES must not be negative.")
+
+        return cls(enabled=enabled, max_entries=max_entries)
+
+
+# Global instance
+response_cache_config = ResponseCacheConfig.from_env()
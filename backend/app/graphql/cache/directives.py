@@ -0,0 +1,33 @@
+"""Field-level cache hints"""
+from typing import List
+
+import strawberry
+from strawberry.schema_directive import Location
+
+
+# What a household's version stamps cover; database/migrations/household_versions.sql
+# bumps a scope's version whenever a row it covers changes
+CACHE_SCOPES = (
+    "members",  # the household, its roommates and their profiles
+    "chores",  # chores and chore assignments
+    "expenses",  # expenses and expense splits
+)
+
+
+@strawberry.schema_directive(locations=[Location.FIELD_DEFINITION], name="cacheControl")
+class CacheControl:
+    """
+    Marks a query field's response as cacheable for up to ``max_age`` seconds,
+    for as long as the household version stamps in ``scopes`` are unchanged.
+
+    The households are the field's `householdId` argument, or every household
+    the caller belongs to when it has none.
+    """
+
+    max_age: int
+    scopes: List[str]
+
+    def __post_init__(self):
+        unknown = set(self.scopes) - set(CACHE_SCOPES)
+        if unknown:
+            raise ValueError(f"Unknown cache scopes: {', '.join(sorted(unknown))}")
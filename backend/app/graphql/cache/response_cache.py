@@ -0,0 +1,183 @@
+"""Response cache for query operations, validated against household version stamps"""
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set
+
+from graphql import (
+    DocumentNode,
+    FieldNode,
+    GraphQLSchema,
+    OperationDefinitionNode,
+    StringValueNode,
+    VariableNode,
+    get_named_type,
+)
+from graphql.utilities import strip_ignored_characters
+
+from .config import response_cache_config
+from .directives import CacheControl
+
+
+@dataclass
+class CachePlan:
+    """What a cacheable operation's response depends on"""
+
+    max_age: int
+    scopes: Set[str] = field(default_factory=set)
+    household_ids: Set[str] = field(default_factory=set)
+    # Some field has no householdId argument, so it depends on every household
+    # the caller belongs to (and on which households those are)
+    include_memberships: bool = False
+
+
+def _cache_control(schema: GraphQLSchema, parent_type_name: str, field_name: str) -> Optional[CacheControl]:
+    parent = schema.get_type(parent_type_name)
+    definition = getattr(parent, "fields", {}).get(field_name)
+    if definition is None:
+        return None
+    strawberry_field = definition.extensions.get("strawberry-definition")
+    return next(
+        (directive for directive in getattr(strawberry_field, "directives", []) if isinstance(directive, CacheControl)),
+        None,
+    )
+
+
+def plan_cache(
+    schema: GraphQLSchema,
+    document: DocumentNode,
+    operation_name: Optional[str],
+    variables: Dict[str, Any],
+) -> Optional[CachePlan]:
+    """
+    The cache plan for a query, or None if its response can't be cached.
+
+    A query is cacheable when every field it selects under the domain
+    namespaces (e.g. `chores { householdChores }`) has a @cacheControl hint.
+    Its max age is the smallest of theirs. Fragments at those two levels make
+    a query uncacheable.
+    """
+    operations = [
+        definition for definition in document.definitions
+        if isinstance(definition, OperationDefinitionNode)
+        and (operation_name is None or (definition.name and definition.name.value == operation_name))
+    ]
+    if len(operations) != 1 or schema.query_type is None:
+        return None
+
+    plan = None
+    for namespace in operations[0].selection_set.selections:
+        if not isinstance(namespace, FieldNode):
+            return None
+        if namespace.name.value == "__typename":
+            continue
+        namespace_field = schema.query_type.fields.get(namespace.name.value)
+        if namespace_field is None or namespace.selection_set is None:
+            return None
+        namespace_type = get_named_type(namespace_field.type).name
+
+        for selection in namespace.selection_set.selections:
+            if not isinstance(selection, FieldNode):
+                return None
+            if selection.name.value == "__typename":
+                continue
+            hint = _cache_control(schema, namespace_type, selection.name.value)
+            if hint is None:
+                return None
+
+            plan = plan or CachePlan(max_age=hint.max_age)
+            plan.max_age = min(plan.max_age, hint.max_age)
+            plan.scopes.update(hint.scopes)
+
+            household_id = None
+            for argument in selection.arguments or ():
+                if argument.name.value != "householdId":
+                    continue
+                if isinstance(argument.value, VariableNode):
+                    household_id = variables.get(argument.value.name.value)
+                elif isinstance(argument.value, StringValueNode):
+                    household_id = argument.value.value
+            if household_id is None:
+                plan.include_memberships = True
+            else:
+                plan.household_ids.add(str(household_id))
+
+    return plan
+
+
+@lru_cache(maxsize=512)
+def _document_hash(query: str) -> str:
+    return hashlib.sha256(strip_ignored_characters(query).encode()).hexdigest()
+
+
+def cache_key(query: str, operation_name: Optional[str], variables: Optional[Dict[str, Any]], user_id: str) -> str:
+    """Key of a response: the normalized document, operation, variables and caller"""
+    parts = [_document_hash(query), operation_name or "", json.dumps(variables or {}, sort_keys=True, default=str), user_id]
+    return hashlib.sha256("\x00".join(parts).encode()).hexdigest()
+
+
+def make_etag(key: str, versions: List[Dict[str, Any]]) -> str:
+    """ETag for the response under `key` while the household versions are `versions`"""
+    stamp = json.dumps(versions, sort_keys=True, default=str)
+    return f'W/"{hashlib.sha256((key + stamp).encode()).hexdigest()[:32]}"'
+
+
+async def fetch_versions(supabase: Any, plan: CachePlan) -> List[Dict[str, Any]]:
+    """Current version stamps of the households and scopes the plan depends on (one RPC call)"""
+    result = await supabase.rpc("cache_versions", {
+        "p_household_ids": sorted(plan.household_ids),
+        "p_scopes": sorted(plan.scopes),
+        "p_include_memberships": plan.include_memberships,
+    }).execute()
+    return result.data or []
+
+
+@dataclass
+class CachedResponse:
+    etag: str
+    data: Any
+    expires_at: float
+
+
+class ResponseCache:
+    """
+    Response data by cache key, least recently used first out.
+
+    An entry is served only while its ETag matches the one computed from the
+    current household versions and it is younger than its max age.
+    """
+
+    def __init__(self, max_entries: int = 10_000):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CachedResponse]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str, etag: str) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.etag != etag or entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry.data
+
+    def set(self, key: str, etag: str, data: Any, max_age: int) -> None:
+        if self.max_entries <= 0 or max_age <= 0:
+            return
+        self._entries[key] = CachedResponse(etag, data, time.monotonic() + max_age)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Global instance, one per worker
+response_cache = ResponseCache(response_cache_config.max_entries)
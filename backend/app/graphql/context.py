@@ -1,7 +1,9 @@
 """GraphQL context for dependency injection"""
-from typing import Optional
+from typing import Optional, Sequence
 from supabase import AsyncClient
 from strawberry.fastapi import BaseContext
+from app.supabase.utils.call_ledger import CallLedger
+from app.supabase.utils.instrumented import CallObserver, InstrumentedClient
 from .utils.dataloaders import Dataloaders, create_dataloaders
 
 
@@ -12,7 +14,17 @@ class CustomContext(BaseContext):
         self,
         supabase: AsyncClient,
         user_id: Optional[str] = None,
+        call_observers: Sequence[CallObserver] = (),
+        call_ledger: Optional[CallLedger] = None,
     ):
+        # Tests pass a ledger with a budget to fail on query-count regressions
+        self.call_ledger = call_ledger
+        if call_ledger is not None:
+            call_observers = [*call_observers, call_ledger]
+
+        # Only pay for the wrapper when someone is listening
+        if call_observers:
+            supabase = InstrumentedClient(supabase, call_observers)
         self.supabase = supabase
         self.user_id = user_id
         self.dataloaders = create_dataloaders(supabase)
@@ -0,0 +1,32 @@
+"""Strawberry schema extensions"""
+from .call_accounting import CallAccountingExtension, create_call_ledger
+from .metrics import (
+    MetricsExtension,
+    OperationMetricsExtension,
+    SupabaseMetricsObserver,
+    metrics_call_observers,
+    metrics_extensions,
+)
+from .response_cache import ResponseCacheExtension, response_cache_extensions
+from .tracing import (
+    TracingCallObserver,
+    TracingExtension,
+    tracing_call_observers,
+    tracing_extensions,
+)
+
+__all__ = [
+    "CallAccountingExtension",
+    "create_call_ledger",
+    "MetricsExtension",
+    "OperationMetricsExtension",
+    "SupabaseMetricsObserver",
+    "metrics_call_observers",
+    "metrics_extensions",
+    "ResponseCacheExtension",
+    "response_cache_extensions",
+    "TracingCallObserver",
+    "TracingExtension",
+    "tracing_call_observers",
+    "tracing_extensions",
+]
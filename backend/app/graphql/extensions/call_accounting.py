@@ -0,0 +1,54 @@
+"""Schema extension reporting the Supabase calls made by each operation"""
+import logging
+from typing import Any, Dict, Optional
+
+from strawberry.extensions import SchemaExtension
+
+from app.observability import observability_config
+from app.supabase.utils.call_ledger import CallLedger
+
+
+logger = logging.getLogger(__name__)
+
+
+def create_call_ledger() -> Optional[CallLedger]:
+    """A ledger for one request, if call accounting or a call budget is configured"""
+    if not observability_config.call_accounting and observability_config.call_budget is None:
+        return None
+
+    return CallLedger(
+        budget=observability_config.call_budget,
+        n_plus_one_threshold=observability_config.n_plus_one_threshold,
+    )
+
+
+class CallAccountingExtension(SchemaExtension):
+    """
+    Warns about probable N+1 call patterns and, when call accounting is on, adds
+    the request's Supabase calls to the response under `extensions.supabaseCalls`.
+
+    Does nothing for requests whose context has no call ledger.
+    """
+
+    def _ledger(self) -> Optional[CallLedger]:
+        return getattr(self.execution_context.context, "call_ledger", None)
+
+    def on_operation(self):
+        yield
+        ledger = self._ledger()
+        if ledger is None:
+            return
+
+        for shape, count in ledger.suspected_n_plus_one().items():
+            logger.warning(
+                "Probable N+1 in operation %s: %s ran %d times",
+                self.execution_context.operation_name or "anonymous",
+                shape,
+                count,
+            )
+
+    def get_results(self) -> Dict[str, Any]:
+        ledger = self._ledger()
+        if ledger is None or not observability_config.call_accounting:
+            return {}
+        return {"supabaseCalls": ledger.summary()}
@@ -0,0 +1,109 @@
+"""Schema extension recording operation, resolver and Supabase call latencies"""
+import random
+from inspect import isawaitable
+from time import perf_counter
+from typing import Any, Callable, List, Type
+
+from strawberry.extensions import SchemaExtension
+
+from app.observability import metrics_registry, observability_config, sampled_operation
+from app.supabase.utils.instrumented import CallObserver, SupabaseCall
+
+
+OPERATION_DURATION = metrics_registry.histogram(
+    "cohab_graphql_operation_duration_seconds",
+    "Time to execute a GraphQL operation",
+    ("operation", "type"),
+)
+
+RESOLVER_DURATION = metrics_registry.histogram(
+    "cohab_graphql_resolver_duration_seconds",
+    "Time spent in async GraphQL resolvers of sampled operations",
+    ("operation", "path"),
+)
+
+SUPABASE_CALL_DURATION = metrics_registry.histogram(
+    "cohab_supabase_call_duration_seconds",
+    "Time to execute a PostgREST or RPC call in sampled operations",
+    ("operation", "kind", "target", "verb"),
+)
+
+
+def _operation_name(extension: SchemaExtension) -> str:
+    return extension.execution_context.operation_name or "anonymous"
+
+
+class OperationMetricsExtension(SchemaExtension):
+    """Records the latency of every operation."""
+
+    def on_operation(self):
+        start = perf_counter()
+        yield
+        # Documents that fail to parse have no operation type
+        context = self.execution_context
+        OPERATION_DURATION.observe(
+            perf_counter() - start,
+            _operation_name(self),
+            context.operation_type.value if context.graphql_document else "unknown",
+        )
+
+
+class MetricsExtension(OperationMetricsExtension):
+    """
+    Also samples operations and times the async resolvers of sampled ones.
+
+    Only installed when sampling is on: an extension that implements resolve()
+    wraps every field of every operation, sampled or not.
+    """
+
+    def on_execute(self):
+        if random.random() >= observability_config.metrics_sample_rate:
+            yield
+            return
+
+        token = sampled_operation.set(_operation_name(self))
+        try:
+            yield
+        finally:
+            sampled_operation.reset(token)
+
+    def resolve(self, _next: Callable, root: Any, info: Any, *args: Any, **kwargs: Any) -> Any:
+        result = _next(root, info, *args, **kwargs)
+
+        # Plain attribute fields resolve synchronously; only awaitables do real work
+        operation = sampled_operation.get()
+        if operation is None or not isawaitable(result):
+            return result
+
+        return self._timed(result, operation, f"{info.parent_type.name}.{info.field_name}")
+
+    @staticmethod
+    async def _timed(result: Any, operation: str, path: str) -> Any:
+        start = perf_counter()
+        try:
+            return await result
+        finally:
+            RESOLVER_DURATION.observe(perf_counter() - start, operation, path)
+
+
+class SupabaseMetricsObserver(CallObserver):
+    """Records the latency of Supabase calls made by sampled operations"""
+
+    def call_finished(self, call: SupabaseCall) -> None:
+        operation = sampled_operation.get()
+        if operation is not None:
+            SUPABASE_CALL_DURATION.observe(call.duration, operation, call.kind, call.target, call.verb or "select")
+
+
+def metrics_extensions() -> List[Type[SchemaExtension]]:
+    """Schema extensions for the configured sample rate"""
+    if observability_config.metrics_sample_rate:
+        return [MetricsExtension]
+    return [OperationMetricsExtension]
+
+
+def metrics_call_observers() -> List[CallObserver]:
+    """Supabase call observers for the configured sample rate"""
+    if observability_config.metrics_sample_rate:
+        return [SupabaseMetricsObserver()]
+    return []
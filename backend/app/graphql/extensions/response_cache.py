@@ -0,0 +1,88 @@
+"""Schema extension serving cacheable queries from the response cache"""
+import logging
+from typing import List, Optional, Type
+
+from graphql import ExecutionResult
+from strawberry.extensions import SchemaExtension
+from strawberry.types.graphql import OperationType
+
+from app.graphql.cache import (
+    CachePlan,
+    cache_key,
+    fetch_versions,
+    make_etag,
+    plan_cache,
+    response_cache,
+    response_cache_config,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+class ResponseCacheExtension(SchemaExtension):
+    """
+    Serves authenticated queries whose fields all carry @cacheControl hints
+    from the response cache.
+
+    Before running such a query it fetches the version stamps of the households
+    the query depends on (one RPC call) and derives the response's ETag from
+    them. If the request's If-None-Match has that ETag the query is skipped and
+    the router sends 304 Not Modified; if the cache holds a response with that
+    ETag it is returned as is. Otherwise the query runs and, if it succeeds, its
+    response is cached. Versions are read before the query runs, so a change
+    made while it runs gives the next request a new ETag.
+
+    Successful responses carry the ETag and a `Cache-Control: private, max-age`
+    header with the smallest maxAge of the query's fields.
+    """
+
+    def _plan(self) -> Optional[CachePlan]:
+        context = self.execution_context
+        if not getattr(context.context, "user_id", None) or context.operation_type != OperationType.QUERY:
+            return None
+        return plan_cache(context.schema._schema, context.graphql_document, context.operation_name, context.variables or {})
+
+    async def on_execute(self):
+        execution_context = self.execution_context
+        context = execution_context.context
+        plan = self._plan()
+        if plan is None:
+            yield
+            return
+
+        key = cache_key(execution_context.query, execution_context.operation_name, execution_context.variables, context.user_id)
+        try:
+            etag = make_etag(key, await fetch_versions(context.supabase, plan))
+        except Exception:
+            logger.exception("Could not read household versions; serving the query uncached")
+            yield
+            return
+
+        request = getattr(context, "request", None)
+        response = getattr(context, "response", None)
+        if_none_match = request.headers.get("if-none-match", "") if request is not None else ""
+
+        if response is not None and etag in (tag.strip() for tag in if_none_match.split(",")):
+            response.status_code = 304
+            execution_context.result = ExecutionResult(data=None)
+        else:
+            cached = response_cache.get(key, etag)
+            if cached is not None:
+                execution_context.result = ExecutionResult(data=cached)
+
+        yield
+
+        result = execution_context.result
+        if not isinstance(result, ExecutionResult) or result.errors:
+            return
+        if result.data is not None:
+            response_cache.set(key, etag, result.data, plan.max_age)
+        if response is not None:
+            response.headers["ETag"] = etag
+            response.headers["Cache-Control"] = f"private, max-age={plan.max_age}"
+
+
+def response_cache_extensions() -> List[Type[SchemaExtension]]:
+    """The response cache extension if RESPONSE_CACHE is on"""
+    return [ResponseCacheExtension] if response_cache_config.enabled else []
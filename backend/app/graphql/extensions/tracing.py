@@ -0,0 +1,90 @@
+"""Schema extension and call observer producing trace spans"""
+from inspect import isawaitable
+from typing import Any, Callable, Dict, List, Type
+
+from strawberry.extensions import SchemaExtension
+
+from app.observability import tracer
+from app.supabase.utils.instrumented import CallObserver, SupabaseCall
+
+
+class TracingExtension(SchemaExtension):
+    """
+    Opens a span for each GraphQL operation and each async resolver in it.
+
+    Only installed when tracing is on, for the same reason as MetricsExtension:
+    implementing resolve() wraps every field of every operation.
+    """
+
+    def on_operation(self):
+        with tracer.start_span("graphql.operation") as span:
+            yield
+            context = self.execution_context
+            operation_name = context.operation_name or "anonymous"
+            operation_type = context.operation_type.value if context.graphql_document else "unknown"
+            span.update_name(f"graphql.{operation_type} {operation_name}")
+            span.set_attribute("graphql.operation.name", operation_name)
+            span.set_attribute("graphql.operation.type", operation_type)
+
+            errors = context.pre_execution_errors or (context.result.errors if context.result else None)
+            if errors:
+                tracer.set_error(span, errors[0].message)
+
+    def resolve(self, _next: Callable, root: Any, info: Any, *args: Any, **kwargs: Any) -> Any:
+        result = _next(root, info, *args, **kwargs)
+
+        # Plain attribute fields resolve synchronously; only awaitables do real work
+        if not isawaitable(result):
+            return result
+
+        return self._traced(result, f"{info.parent_type.name}.{info.field_name}", info.path.as_list())
+
+    @staticmethod
+    async def _traced(result: Any, field: str, path: List[Any]) -> Any:
+        attributes = {"graphql.field": field, "graphql.path": ".".join(map(str, path))}
+        with tracer.start_span(f"resolve {field}", attributes=attributes):
+            return await result
+
+
+class TracingCallObserver(CallObserver):
+    """
+    Opens a client span around each Supabase call and passes its trace context
+    on in the request's traceparent header.
+
+    One instance per request; spans are keyed by the call they belong to.
+    """
+
+    def __init__(self):
+        self._spans: Dict[int, Any] = {}
+
+    def call_started(self, call: SupabaseCall) -> None:
+        span = tracer.start(
+            f"supabase.{call.verb or 'select'} {call.target}",
+            "client",
+            {"db.system": "postgresql", "db.operation": call.verb or "select"},
+        )
+        span.set_attribute("db.rpc" if call.kind == "rpc" else "db.table", call.target)
+        tracer.inject(span, call.headers)
+        self._spans[id(call)] = span
+
+    def call_finished(self, call: SupabaseCall) -> None:
+        span = self._spans.pop(id(call), None)
+        if span is None:
+            return
+
+        span.set_attribute("db.statement_shape", call.shape)
+        if call.rows is not None:
+            span.set_attribute("db.rows", call.rows)
+        if call.error is not None:
+            tracer.set_error(span, call.error)
+        tracer.end(span)
+
+
+def tracing_extensions() -> List[Type[SchemaExtension]]:
+    """Schema extensions for the configured tracer"""
+    return [TracingExtension] if tracer.enabled else []
+
+
+def tracing_call_observers() -> List[CallObserver]:
+    """Supabase call observers for the configured tracer"""
+    return [TracingCallObserver()] if tracer.enabled else []
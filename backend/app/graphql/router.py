@@ -0,0 +1,22 @@
+"""FastAPI router for the GraphQL endpoint"""
+from typing import Any
+
+from fastapi import Response
+from strawberry.fastapi import GraphQLRouter
+
+
+class CohabGraphQLRouter(GraphQLRouter):
+    """
+    GraphQLRouter that sends 304 Not Modified without a body.
+
+    The response cache extension sets the status when a request's If-None-Match
+    matches the current ETag of its response; the JSON body GraphQLRouter would
+    still render is dropped, as a 304 must not have one.
+    """
+
+    def create_response(self, response_data: Any, sub_response: Response) -> Response:
+        if sub_response.status_code == 304:
+            response = Response(status_code=304)
+            response.headers.raw.extend(sub_response.headers.raw)
+            return response
+        return super().create_response(response_data, sub_response)
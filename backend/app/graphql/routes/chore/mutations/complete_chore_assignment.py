@@ -4,6 +4,7 @@ from typing import Optional
 from ....types import ChoreAssignment, Chore, Profile # Assuming these are defined elsewhere
 from ..inputs import CompleteChoreAssignmentInput
 from app.graphql.info import Info
+from app.graphql.utils.field_selectors import get_child_requested_db_fields
 from app.graphql.utils.parsers import parse_datetime_fields
 
 @strawberry.mutation
@@ -22,11 +23,15 @@ async def complete_chore_assignment(
         raise Exception("Not authenticated")
     
     # 2. Call the atomic RPC function
-    # It handles authorization, validation, point updates, and chore completion.
+    # It handles authorization, validation, point updates, and chore completion,
+    # and returns the assignment with its chore and user embedded, projected to
+    # the fields this mutation's selection set asks for.
     rpc_params = {
         "p_assignment_id": str(input.assignment_id),
         "p_user_id": str(context.user_id),
-        "p_proof_url": input.proof_url
+        "p_proof_url": input.proof_url,
+        "p_chore_fields": get_child_requested_db_fields(info, "chore", Chore),
+        "p_user_fields": get_child_requested_db_fields(info, "user", Profile),
     }
     
     # The function will raise an exception on failure (e.g., auth error), which Strawberry will catch.
@@ -37,28 +42,15 @@ async def complete_chore_assignment(
         # that didn't raise a PostgreSQL exception.
         return None
 
-    updated_assignment = result.data[0]
+    updated_assignment = result.data
 
-    # 3. Fetch nested data to fully construct the GraphQL response type
-    # The RPC function only returns the 'chore_assignments' row, so we need to
-    # fetch the related 'chore' and 'user' (profile) data.
-    
-    # Fetch the chore template
-    chore_result = await context.supabase.table("chores").select("*").eq(
-        "id", updated_assignment["chore_id"]
-    ).single().execute()
-    
-    # Fetch the user's profile
-    user_result = await context.supabase.table("profiles").select("*").eq(
-        "id", updated_assignment["user_id"]
-    ).single().execute()
-
-    if not chore_result.data or not user_result.data:
+    # 3. The chore and user come back embedded in the same JSON result
+    if not updated_assignment.get("chore") or not updated_assignment.get("user"):
         raise Exception("Could not retrieve full chore or user details after completion.")
 
     # 4. Parse and construct the final Strawberry object to return to the client
-    chore_data = parse_datetime_fields(chore_result.data, "created_at", "updated_at")
-    user_data = parse_datetime_fields(user_result.data, "created_at", "updated_at")
+    chore_data = parse_datetime_fields(updated_assignment["chore"], "created_at", "updated_at")
+    user_data = parse_datetime_fields(updated_assignment["user"], "created_at", "updated_at")
     assignment_data = parse_datetime_fields(updated_assignment, "due_date", "completed_at", "created_at")
 
     return ChoreAssignment(
@@ -4,6 +4,7 @@ from typing import Optional
 from ....types import Chore
 from ..inputs import CreateChoreInput
 from app.graphql.info import Info
+from app.graphql.utils.field_selectors import get_requested_db_fields
 from app.graphql.utils.parsers import parse_datetime_fields
 
 
@@ -19,7 +20,7 @@ async def create_chore(
         raise Exception("Not authenticated")
     
     # Verify user is in the household
-    roommate_result = await context.supabase.table("roommates").select("*").eq("user_id", context.user_id).eq("household_id", input.household_id).eq("status", "accepted").execute()
+    roommate_result = await context.supabase.table("roommates").select("id").eq("user_id", context.user_id).eq("household_id", input.household_id).eq("status", "accepted").execute()
     
     if not roommate_result.data:
         raise Exception("Not a member of this household")
@@ -35,7 +36,9 @@ async def create_chore(
         "created_by": context.user_id,
     }
     
-    result = await context.supabase.table("chores").insert(chore_data).execute()
+    # Only return the columns the selection set asks for (id is always included)
+    fields = get_requested_db_fields(Chore, info)
+    result = await context.supabase.table("chores").insert(chore_data).select(fields).execute()
     
     if result.data:
         chore_data = parse_datetime_fields(result.data[0], "created_at", "updated_at")
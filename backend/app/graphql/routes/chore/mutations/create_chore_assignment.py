@@ -1,12 +1,18 @@
 """Create chore assignment mutation resolver"""
+import logging
 import strawberry
 from typing import Optional
 from ....types import ChoreAssignment, Chore, Profile
 from ..inputs import CreateChoreAssignmentInput
 from app.graphql.info import Info
+from app.graphql.utils.concurrency import fan_out
+from app.graphql.utils.field_selectors import get_child_requested_db_fields
 from app.graphql.utils.parsers import parse_datetime_fields, datetime_to_iso
 
 
+logger = logging.getLogger(__name__)
+
+
 @strawberry.mutation
 async def create_chore_assignment(
     info: Info,
@@ -21,8 +27,19 @@ async def create_chore_assignment(
     if not input.user_id:
         raise Exception("No user ID provided for assignment")
     
-    # Get the chore to verify household membership
-    chore_result = await context.supabase.table("chores").select("*").eq("id", input.chore_id).execute()
+    # Only fetch the chore and profile columns the selection set asks for
+    # (the chore's household is always needed for the membership check)
+    chore_fields = ",".join(sorted({"household_id", *get_child_requested_db_fields(info, "chore", Chore)}))
+    user_fields = ",".join(get_child_requested_db_fields(info, "user", Profile))
+    
+    # The chore, both users' memberships and the assignee's profile are independent,
+    # so fetch them together and check membership once the household is known
+    chore_result, caller_memberships, assignee_memberships, user_result = await fan_out(
+        context.supabase.table("chores").select(chore_fields).eq("id", input.chore_id).execute(),
+        context.supabase.table("roommates").select("household_id").eq("user_id", context.user_id).eq("status", "accepted").execute(),
+        context.supabase.table("roommates").select("household_id").eq("user_id", input.user_id).eq("status", "accepted").execute(),
+        context.supabase.table("profiles").select(user_fields).eq("id", input.user_id).execute(),
+    )
     
     if not chore_result.data:
         raise Exception("Chore not found")
@@ -30,36 +47,26 @@ async def create_chore_assignment(
     household_id = chore_result.data[0]["household_id"]
     
     # Verify user is in the household
-    roommate_result = await context.supabase.table("roommates").select("*").eq("user_id", context.user_id).eq("household_id", household_id).eq("status", "accepted").execute()
-    
-    if not roommate_result.data:
+    if not any(r["household_id"] == household_id for r in caller_memberships.data):
         raise Exception("Not a member of this household")
     
-    # Debug logging
-    print(f"[DEBUG] Checking if user {input.user_id} is a member of household {household_id}")
-    
     # Verify assigned user is in the household
-    assigned_roommate = await context.supabase.table("roommates")\
-        .select("*") \
-        .eq("user_id", input.user_id) \
-        .eq("household_id", household_id) \
-        .eq("status", "accepted") \
-        .execute()
-    
-    print(f"[DEBUG] Assigned roommate query result: {assigned_roommate}")
-    
-    if not assigned_roommate.data:
-        # Check if the user exists at all
-        user_check = await context.supabase.table("profiles").select("id").eq("id", input.user_id).execute()
-        print(f"[DEBUG] User exists check: {user_check}")
-        
-        # Check if the user is a pending member
-        pending_check = await context.supabase.table("roommates") \
-            .select("*") \
-            .eq("user_id", input.user_id) \
-            .eq("household_id", household_id) \
-            .execute()
-        print(f"[DEBUG] Pending membership check: {pending_check}")
+    if not any(r["household_id"] == household_id for r in assignee_memberships.data):
+        # The pending membership lookup only serves this log line, so skip it
+        # unless debug logging is on
+        if logger.isEnabledFor(logging.DEBUG):
+            pending_check = await context.supabase.table("roommates") \
+                .select("status") \
+                .eq("user_id", input.user_id) \
+                .eq("household_id", household_id) \
+                .execute()
+            logger.debug(
+                "Assignee %s is not an accepted member of household %s (profile found: %s, memberships: %s)",
+                input.user_id,
+                household_id,
+                bool(user_result.data),
+                pending_check.data,
+            )
         
         raise Exception(f"Assigned user is not a member of this household. User ID: {input.user_id}, Household ID: {household_id}")
     
@@ -73,9 +80,6 @@ async def create_chore_assignment(
     result = await context.supabase.table("chore_assignments").insert(assignment_data).execute()
     
     if result.data:
-        # Get the full chore and user data
-        user_result = await context.supabase.table("profiles").select("*").eq("id", input.user_id).execute()
-        
         chore_data = parse_datetime_fields(chore_result.data[0], "created_at", "updated_at")
         user_data = parse_datetime_fields(user_result.data[0], "created_at", "updated_at")
         assignment_data = parse_datetime_fields(result.data[0], "due_date", "completed_at", "created_at")
@@ -1,5 +1,6 @@
 """Delete chore mutation resolver"""
 import strawberry
+from postgrest.types import ReturnMethod
 from app.graphql.info import Info
 
 
@@ -23,12 +24,12 @@ async def delete_chore(
     household_id = chore_result.data[0]["household_id"]
     
     # Verify user is in the household
-    roommate_result = await context.supabase.table("roommates").select("*").eq("user_id", context.user_id).eq("household_id", household_id).eq("status", "accepted").execute()
+    roommate_result = await context.supabase.table("roommates").select("id").eq("user_id", context.user_id).eq("household_id", household_id).eq("status", "accepted").execute()
     
     if not roommate_result.data:
         raise Exception("Not a member of this household")
     
     # Delete the chore (cascade will delete assignments)
-    await context.supabase.table("chores").delete().eq("id", chore_id).execute()
+    await context.supabase.table("chores").delete(returning=ReturnMethod.minimal).eq("id", chore_id).execute()
     
     return True
@@ -1,5 +1,6 @@
 """Delete chore assignment mutation resolver"""
 import strawberry
+from postgrest.types import ReturnMethod
 from app.graphql.info import Info
 
 
@@ -16,7 +17,7 @@ async def delete_chore_assignment(
     
     # Get the assignment to verify access
     assignment_result = await context.supabase.table("chore_assignments").select(
-        "*, chores:chore_id(household_id)"
+        "id, chores:chore_id(household_id)"
     ).eq("id", assignment_id).execute()
     
     if not assignment_result.data:
@@ -25,12 +26,12 @@ async def delete_chore_assignment(
     household_id = assignment_result.data[0]["chores"]["household_id"]
     
     # Verify user is in the household
-    roommate_result = await context.supabase.table("roommates").select("*").eq("user_id", context.user_id).eq("household_id", household_id).eq("status", "accepted").execute()
+    roommate_result = await context.supabase.table("roommates").select("id").eq("user_id", context.user_id).eq("household_id", household_id).eq("status", "accepted").execute()
     
     if not roommate_result.data:
         raise Exception("Not a member of this household")
     
     # Delete the assignment
-    await context.supabase.table("chore_assignments").delete().eq("id", assignment_id).execute()
+    await context.supabase.table("chore_assignments").delete(returning=ReturnMethod.minimal).eq("id", assignment_id).execute()
     
     return True
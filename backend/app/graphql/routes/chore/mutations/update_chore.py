@@ -4,6 +4,7 @@ from typing import Optional
 from ....types import Chore
 from ..inputs import UpdateChoreInput
 from app.graphql.info import Info
+from app.graphql.utils.field_selectors import get_requested_db_fields
 from app.graphql.utils.parsers import parse_datetime_fields
 
 
@@ -19,20 +20,6 @@ async def update_chore(
     if not context.user_id:
         raise Exception("Not authenticated")
     
-    # Get the chore to verify household membership
-    chore_result = await context.supabase.table("chores").select("household_id").eq("id", chore_id).execute()
-    
-    if not chore_result.data:
-        raise Exception("Chore not found")
-    
-    household_id = chore_result.data[0]["household_id"]
-    
-    # Verify user is in the household
-    roommate_result = await context.supabase.table("roommates").select("*").eq("user_id", context.user_id).eq("household_id", household_id).eq("status", "accepted").execute()
-    
-    if not roommate_result.data:
-        raise Exception("Not a member of this household")
-    
     # Build update data
     update_data = {}
     if input.title is not None:
@@ -49,10 +36,23 @@ async def update_chore(
     if not update_data:
         raise Exception("No fields to update")
     
+    # The RPC applies the update only if the user is an accepted member of the
+    # chore's household, and reports which check failed otherwise.
     # Note: updated_at is automatically set by database trigger
-    result = await context.supabase.table("chores").update(update_data).eq("id", chore_id).execute()
+    fields = get_requested_db_fields(Chore, info)
+    rpc_params = {
+        "p_chore_id": chore_id,
+        "p_user_id": str(context.user_id),
+        "p_changes": update_data,
+        "p_fields": None if fields == "*" else fields.split(","),
+    }
+    result = await context.supabase.rpc("update_household_chore", rpc_params).execute()
+    
+    status = result.data.get("status") if result.data else None
+    if status == "not_found":
+        raise Exception("Chore not found")
+    if status != "updated":
+        raise Exception("Not a member of this household")
     
-    if result.data:
-        chore_data = parse_datetime_fields(result.data[0], "created_at", "updated_at")
-        return Chore(**chore_data)
-    return None
+    chore_data = parse_datetime_fields(result.data["chore"], "created_at", "updated_at")
+    return Chore(**chore_data)
@@ -4,6 +4,7 @@ from .chore import chore
 from .household_chores import household_chores
 from .my_chore_assignments import my_chore_assignments
 from .household_chore_assignments import household_chore_assignments
+from .household_leaderboard import household_leaderboard
 
 
 @strawberry.type
@@ -14,6 +15,7 @@ class ChoreQueries:
     household_chores = household_chores
     my_chore_assignments = my_chore_assignments
     household_chore_assignments = household_chore_assignments
+    household_leaderboard = household_leaderboard
 
 
 __all__ = [
@@ -22,4 +24,5 @@ __all__ = [
     "household_chores",
     "my_chore_assignments",
     "household_chore_assignments",
+    "household_leaderboard",
 ]
@@ -1,12 +1,18 @@
 """Get household chore assignments query resolver"""
+import logging
 import strawberry
 from typing import List
 from ....types import ChoreAssignment, Chore, Profile
+from app.graphql.cache import CacheControl
 from app.graphql.info import Info
+from app.graphql.utils.concurrency import fan_out
 from app.graphql.utils.parsers import parse_datetime_fields
 
 
-@strawberry.field
+logger = logging.getLogger(__name__)
+
+
+@strawberry.field(directives=[CacheControl(max_age=60, scopes=["chores", "members"])])
 async def household_chore_assignments(
     info: Info,
     household_id: str,
@@ -16,37 +22,29 @@ async def household_chore_assignments(
     """Get all chore assignments for a household"""
     context = info.context
     
-    # First get all chores in the household
-    chores_result = await context.supabase.table("chores") \
-        .select("*") \
-        .eq("household_id", household_id) \
-        .execute()
+    # Chores and members of the household are independent, so load them together
+    chores_result, roommates_result = await fan_out(
+        context.supabase.table("chores") \
+            .select("*") \
+            .eq("household_id", household_id) \
+            .execute(),
+        context.supabase.table("roommates") \
+            .select("user_id") \
+            .eq("household_id", household_id) \
+            .execute(),
+    )
     
     if not chores_result.data:
         return []
         
     chore_ids = [chore['id'] for chore in chores_result.data]
     
-    # First get all users in the household
-    roommates_result = await context.supabase.table("roommates") \
-        .select("user_id") \
-        .eq("household_id", household_id) \
-        .execute()
-    
     if not roommates_result.data:
         return []
         
     user_ids = [r['user_id'] for r in roommates_result.data]
     
-    # Get user profiles
-    profiles_result = await context.supabase.table("profiles") \
-        .select("*") \
-        .in_("id", user_ids) \
-        .execute()
-    
-    profiles_map = {p['id']: p for p in profiles_result.data}
-    
-    # Then get assignments for these chores
+    # Then get user profiles and assignments for these chores, also concurrently
     query = context.supabase.table("chore_assignments").select(
         "*, chores:chore_id(*)"
     ).in_("chore_id", chore_ids)
@@ -54,13 +52,21 @@ async def household_chore_assignments(
     if not include_completed:
         query = query.eq("is_complete", False)
     
-    result = await query.order("due_date", desc=False).limit(limit).execute()
+    profiles_result, result = await fan_out(
+        context.supabase.table("profiles") \
+            .select("*") \
+            .in_("id", user_ids) \
+            .execute(),
+        query.order("due_date", desc=False).limit(limit).execute(),
+    )
+    
+    profiles_map = {p['id']: p for p in profiles_result.data}
     
     assignments = []
     for assignment in result.data:
         # Skip if chore data is missing
         if not assignment.get("chores"):
-            print(f"[WARN] Skipping assignment {assignment.get('id')} - missing chore data")
+            logger.warning("Skipping assignment %s - missing chore data", assignment.get("id"))
             continue
             
         try:
@@ -70,7 +76,7 @@ async def household_chore_assignments(
             # Get user profile from our pre-fetched profiles
             user_data = profiles_map.get(user_id)
             if not user_data:
-                print(f"[WARN] Skipping assignment {assignment.get('id')} - user {user_id} not found in household")
+                logger.warning("Skipping assignment %s - user %s not found in household", assignment.get("id"), user_id)
                 continue
                 
             user_data = parse_datetime_fields(user_data, "created_at", "updated_at")
@@ -81,7 +87,7 @@ async def household_chore_assignments(
             
             if not all(key in chore_data for key in required_chore_fields):
                 missing = [f for f in required_chore_fields if f not in chore_data]
-                print(f"[WARN] Skipping assignment {assignment.get('id')} - missing required chore fields: {missing}")
+                logger.warning("Skipping assignment %s - missing required chore fields: %s", assignment.get("id"), missing)
                 continue
             
             assignments.append(ChoreAssignment(
@@ -95,7 +101,7 @@ async def household_chore_assignments(
                 created_at=assignment_data["created_at"]
             ))
         except Exception as e:
-            print(f"[ERROR] Error processing assignment {assignment.get('id')}: {str(e)}")
+            logger.exception("Error processing assignment %s", assignment.get("id"))
             continue
     
     return assignments
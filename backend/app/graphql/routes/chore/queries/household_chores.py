@@ -2,12 +2,13 @@
 import strawberry
 from typing import List
 from ....types import Chore
+from app.graphql.cache import CacheControl
 from app.graphql.info import Info
 from app.graphql.utils.field_selectors import get_requested_db_fields
 from app.graphql.utils.parsers import parse_datetime_fields
 
 
-@strawberry.field
+@strawberry.field(directives=[CacheControl(max_age=60, scopes=["chores", "members"])])
 async def household_chores(
     info: Info, 
     household_id: str,
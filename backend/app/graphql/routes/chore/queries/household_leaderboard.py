@@ -0,0 +1,75 @@
+"""Get household points leaderboard query resolver"""
+import strawberry
+from datetime import date, datetime, timedelta, timezone
+from typing import List
+from ....types import LeaderboardEntry
+from app.graphql.info import Info
+
+
+LEADERBOARD_WINDOWS = ("all_time", "monthly", "weekly")
+
+
+def period_start(window: str, now: datetime) -> date:
+    """First day of the current period, matching points_period_start() in the database"""
+    today = now.astimezone(timezone.utc).date()
+    if window == "weekly":
+        return today - timedelta(days=today.weekday())
+    return today.replace(day=1)
+
+
+def rank_entries(rows: List[dict]) -> List[LeaderboardEntry]:
+    """Rank rows already ordered by points; tied roommates share a rank"""
+    entries = []
+    for position, row in enumerate(rows, start=1):
+        points = row.get("points") or 0
+        rank = entries[-1].rank if entries and entries[-1].points == points else position
+        entries.append(LeaderboardEntry(rank=rank, user_id=row["user_id"], points=points))
+    return entries
+
+
+@strawberry.field
+async def household_leaderboard(
+    info: Info,
+    household_id: str,
+    window: str = "all_time",  # 'all_time', 'monthly', 'weekly'
+    limit: int = 50
+) -> List[LeaderboardEntry]:
+    """Get the household's roommates ranked by chore points earned in the window"""
+    context = info.context
+
+    if window not in LEADERBOARD_WINDOWS:
+        raise Exception(f"Invalid leaderboard window. Must be one of: {', '.join(LEADERBOARD_WINDOWS)}")
+
+    roommates_query = context.supabase.table("roommates") \
+        .select("user_id,points") \
+        .eq("household_id", household_id) \
+        .eq("status", "accepted")
+
+    if window == "all_time":
+        result = await roommates_query.order("points", desc=True, nullsfirst=False).order("user_id").limit(limit).execute()
+        return rank_entries(result.data)
+
+    # Only current roommates are ranked: the member list filters the aggregates
+    # (which outlive a roommate leaving) before the limit, and fills in roommates
+    # who earned nothing this period, who have no aggregate row, with zero
+    roommates_result = await roommates_query.execute()
+    members = {roommate["user_id"] for roommate in roommates_result.data}
+    if not members:
+        return []
+
+    periods_result = await context.supabase.table("household_points_periods") \
+        .select("user_id,points") \
+        .eq("household_id", household_id) \
+        .eq("period", window) \
+        .eq("period_start", period_start(window, datetime.now(timezone.utc)).isoformat()) \
+        .in_("user_id", sorted(members)) \
+        .order("points", desc=True) \
+        .order("user_id") \
+        .limit(limit) \
+        .execute()
+
+    rows = periods_result.data
+    ranked = {row["user_id"] for row in rows}
+    rows += [{"user_id": user_id, "points": 0} for user_id in sorted(members - ranked)]
+
+    return rank_entries(rows[:limit])
@@ -1,4 +1,5 @@
 """Get my chore assignments query resolver"""
+import logging
 import strawberry
 from typing import List
 from ....types import ChoreAssignment, Chore, Profile
@@ -6,6 +7,9 @@ from app.graphql.info import Info
 from app.graphql.utils.parsers import parse_datetime_fields
 
 
+logger = logging.getLogger(__name__)
+
+
 @strawberry.field
 async def my_chore_assignments(
     info: Info,
@@ -60,7 +64,7 @@ async def my_chore_assignments(
             ))
         except Exception as e:
             # Log the error but don't fail the entire request
-            print(f"Error processing chore assignment {assignment.get('id')}: {str(e)}")
+            logger.exception("Error processing chore assignment %s", assignment.get("id"))
             continue
     
     return assignments
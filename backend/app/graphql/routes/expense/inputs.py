@@ -35,3 +35,45 @@ class MarkExpensePaidInput:
     """Input for marking an expense split as paid"""
     
     expense_split_id: str
+
+
+@strawberry.input
+class SettleUpInput:
+    """Input for settling up: either everything with one roommate, or the given splits"""
+    
+    household_id: str
+    counterparty_id: Optional[str] = None
+    split_ids: Optional[List[str]] = None
+
+
+@strawberry.input
+class CreateExpenseTemplateInput:
+    """Input for creating a monthly expense template"""
+    
+    household_id: str
+    kind: str = "bill"  # 'rent' or 'bill'
+    title: Optional[str] = None  # Defaults to "Rent" for rent
+    description: Optional[str] = None
+    amount: Optional[float] = None  # Rent without one follows the household's rent_amount
+    currency: Optional[str] = None  # Defaults to the household's currency
+    category: Optional[str] = None
+    paid_by: Optional[str] = None  # Defaults to the creator
+    split_with: Optional[List[str]] = None  # Defaults to all roommates
+    day_of_month: int = 1
+
+
+@strawberry.input
+class UpdateExpenseTemplateInput:
+    """Input for updating an expense template"""
+    
+    title: Optional[str] = None
+    description: Optional[str] = None
+    # Passing null, not just leaving these out, clears them: rent then follows the
+    # household's rent_amount, and the expense is split with all roommates
+    amount: Optional[float] = strawberry.UNSET
+    currency: Optional[str] = None
+    category: Optional[str] = None
+    paid_by: Optional[str] = None
+    split_with: Optional[List[str]] = strawberry.UNSET
+    day_of_month: Optional[int] = None
+    is_active: Optional[bool] = None
@@ -5,6 +5,10 @@ from .update_expense import update_expense
 from .mark_expense_paid import mark_expense_paid
 from .delete_expense import delete_expense
 from .generate_payment_url import generate_payment_url
+from .settle_up import settle_up
+from .create_expense_template import create_expense_template
+from .update_expense_template import update_expense_template
+from .delete_expense_template import delete_expense_template
 
 
 @strawberry.type
@@ -16,6 +20,10 @@ class ExpenseMutations:
     mark_expense_paid = mark_expense_paid
     delete_expense = delete_expense
     generate_payment_url = generate_payment_url
+    settle_up = settle_up
+    create_expense_template = create_expense_template
+    update_expense_template = update_expense_template
+    delete_expense_template = delete_expense_template
 
 
 __all__ = [
@@ -25,4 +33,8 @@ __all__ = [
     "mark_expense_paid",
     "delete_expense",
     "generate_payment_url",
+    "settle_up",
+    "create_expense_template",
+    "update_expense_template",
+    "delete_expense_template",
 ]
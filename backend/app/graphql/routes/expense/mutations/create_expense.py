@@ -1,9 +1,11 @@
 """Create expense mutation resolver"""
 import strawberry
+from postgrest.types import ReturnMethod
 from typing import Optional
 from ....types import Expense
 from ..inputs import CreateExpenseInput
 from app.graphql.info import Info
+from app.graphql.utils.field_selectors import get_requested_db_fields
 from app.graphql.utils.parsers import parse_datetime_fields, datetime_to_iso
 
 
@@ -19,7 +21,7 @@ async def create_expense(
         raise Exception("Not authenticated")
     
     # Verify user is in the household
-    roommate_result = await context.supabase.table("roommates").select("*").eq("user_id", context.user_id).eq("household_id", input.household_id).eq("status", "accepted").execute()
+    roommate_result = await context.supabase.table("roommates").select("id").eq("user_id", context.user_id).eq("household_id", input.household_id).eq("status", "accepted").execute()
     
     if not roommate_result.data:
         raise Exception("Not a member of this household")
@@ -36,22 +38,26 @@ async def create_expense(
         "due_date": datetime_to_iso(input.due_date),
     }
     
-    expense_result = await context.supabase.table("expenses").insert(expense_data).execute()
+    # Only return the columns the selection set asks for (id is always included)
+    fields = get_requested_db_fields(Expense, info)
+    expense_result = await context.supabase.table("expenses").insert(expense_data).select(fields).execute()
     
     if expense_result.data:
         expense_id = expense_result.data[0]["id"]
         
-        # Create splits
+        # Create splits in a single bulk insert; nothing needs to come back
         split_amount = input.amount / len(input.split_with)
         
-        for user_id in input.split_with:
-            split_data = {
+        splits_data = [
+            {
                 "expense_id": expense_id,
                 "user_id": user_id,
                 "amount": split_amount,
                 "is_paid": user_id == context.user_id,  # Creator auto-pays
             }
-            await context.supabase.table("expense_splits").insert(split_data).execute()
+            for user_id in input.split_with
+        ]
+        await context.supabase.table("expense_splits").insert(splits_data, returning=ReturnMethod.minimal).execute()
         
         expense_data = parse_datetime_fields(expense_result.data[0], "created_at", "due_date")
         return Expense(**expense_data)
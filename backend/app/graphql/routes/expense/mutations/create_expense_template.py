@@ -0,0 +1,72 @@
+"""Create expense template mutation resolver"""
+import strawberry
+from ....types import ExpenseTemplate
+from ..inputs import CreateExpenseTemplateInput
+from app.graphql.info import Info
+from app.graphql.utils.concurrency import fan_out
+from app.graphql.utils.field_selectors import get_requested_db_fields
+from app.graphql.utils.parsers import parse_datetime_fields
+
+
+TEMPLATE_KINDS = ("rent", "bill")
+
+
+@strawberry.mutation
+async def create_expense_template(
+    info: Info,
+    input: CreateExpenseTemplateInput
+) -> ExpenseTemplate:
+    """
+    Create a monthly expense template. Rent without an amount follows the
+    household's rent_amount; the recurring expenses job generates it every month.
+    """
+    context = info.context
+
+    if not context.user_id:
+        raise Exception("Not authenticated")
+
+    if input.kind not in TEMPLATE_KINDS:
+        raise Exception("Template kind must be 'rent' or 'bill'")
+    if input.kind == "bill" and input.amount is None:
+        raise Exception("A bill needs an amount")
+    if input.amount is not None and input.amount <= 0:
+        raise Exception("Amount must be positive")
+    if not 1 <= input.day_of_month <= 28:
+        raise Exception("Day of month must be between 1 and 28")
+
+    members_result, rent_result = await fan_out(
+        context.supabase.table("roommates").select("user_id").eq("household_id", input.household_id).eq("status", "accepted").execute(),
+        context.supabase.table("expense_templates").select("id").eq("household_id", input.household_id).eq("kind", "rent").execute(),
+    )
+
+    members = {member["user_id"] for member in members_result.data}
+    if context.user_id not in members:
+        raise Exception("Not a member of this household")
+
+    paid_by = input.paid_by or context.user_id
+    if paid_by not in members or not members.issuperset(input.split_with or []):
+        raise Exception("Expenses can only be paid by and split with roommates")
+
+    if input.kind == "rent" and rent_result.data:
+        raise Exception("This household already has a rent template")
+
+    template_data = {
+        "household_id": input.household_id,
+        "kind": input.kind,
+        "title": input.title or ("Rent" if input.kind == "rent" else None),
+        "description": input.description,
+        "amount": input.amount,
+        "currency": input.currency,
+        "category": input.category or ("rent" if input.kind == "rent" else None),
+        "paid_by": paid_by,
+        "split_with": input.split_with,
+        "day_of_month": input.day_of_month,
+        "created_by": context.user_id,
+    }
+    if not template_data["title"]:
+        raise Exception("A bill needs a title")
+
+    fields = get_requested_db_fields(ExpenseTemplate, info)
+    result = await context.supabase.table("expense_templates").insert(template_data).select(fields).execute()
+
+    return ExpenseTemplate(**parse_datetime_fields(result.data[0], "created_at", "updated_at"))
@@ -1,6 +1,8 @@
 """Delete expense mutation resolver"""
 import strawberry
+from postgrest.types import CountMethod, ReturnMethod
 from app.graphql.info import Info
+from app.graphql.utils.conditional_writes import raise_for_missed_write
 
 
 @strawberry.mutation
@@ -14,13 +16,10 @@ async def delete_expense(
     if not context.user_id:
         raise Exception("Not authenticated")
     
-    # Verify user created the expense
-    expense_result = await context.supabase.table("expenses").select("paid_by").eq("id", expense_id).execute()
+    # Delete expense, only if the user created it (splits should cascade)
+    result = await context.supabase.table("expenses").delete(count=CountMethod.exact, returning=ReturnMethod.minimal).eq("id", expense_id).eq("paid_by", context.user_id).execute()
     
-    if not expense_result.data or expense_result.data[0]["paid_by"] != context.user_id:
-        raise Exception("Not authorized to delete this expense")
-    
-    # Delete expense (splits should cascade)
-    await context.supabase.table("expenses").delete().eq("id", expense_id).execute()
+    if not result.count:
+        await raise_for_missed_write(context.supabase, "expenses", expense_id, "Expense", "delete this expense")
     
     return True
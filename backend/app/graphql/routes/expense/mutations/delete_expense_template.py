@@ -0,0 +1,25 @@
+"""Delete expense template mutation resolver"""
+import strawberry
+from postgrest.types import CountMethod, ReturnMethod
+from app.graphql.info import Info
+from app.graphql.utils.conditional_writes import raise_for_missed_write
+
+
+@strawberry.mutation
+async def delete_expense_template(
+    info: Info,
+    template_id: str
+) -> bool:
+    """Delete an expense template; expenses already generated from it are kept"""
+    context = info.context
+    
+    if not context.user_id:
+        raise Exception("Not authenticated")
+    
+    # Delete the template; RLS limits the write to the user's households
+    result = await context.supabase.table("expense_templates").delete(count=CountMethod.exact, returning=ReturnMethod.minimal).eq("id", template_id).execute()
+    
+    if not result.count:
+        await raise_for_missed_write(context.supabase, "expense_templates", template_id, "Expense template", "delete this expense template")
+    
+    return True
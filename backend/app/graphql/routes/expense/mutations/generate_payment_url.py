@@ -1,5 +1,6 @@
 """Generate payment URL mutation resolver"""
 import strawberry
+from postgrest.types import ReturnMethod
 from typing import Optional
 from app.graphql.info import Info
 from app.utils.payment_urls import PaymentURLGenerator
@@ -105,7 +106,7 @@ async def generate_payment_url(
         .update({
             "payment_url": payment_url,
             "payment_method": payment_method
-        })\
+        }, returning=ReturnMethod.minimal)\
         .eq("id", input.expense_split_id)\
         .execute()
     
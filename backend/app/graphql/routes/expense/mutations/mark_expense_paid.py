@@ -1,7 +1,11 @@
 """Mark expense paid mutation resolver"""
 import strawberry
+from datetime import datetime, timezone
+from postgrest.types import CountMethod, ReturnMethod
 from ..inputs import MarkExpensePaidInput
 from app.graphql.info import Info
+from app.graphql.utils.conditional_writes import raise_for_missed_write
+from app.graphql.utils.parsers import datetime_to_iso
 
 
 @strawberry.mutation
@@ -15,14 +19,11 @@ async def mark_expense_paid(
     if not context.user_id:
         raise Exception("Not authenticated")
     
-    # Verify user owns this split
-    split_result = await context.supabase.table("expense_splits").select("user_id").eq("id", input.expense_split_id).execute()
+    # Update split, only if the user owns it
+    update_data = {"is_paid": True, "paid_at": datetime_to_iso(datetime.now(timezone.utc))}
+    result = await context.supabase.table("expense_splits").update(update_data, count=CountMethod.exact, returning=ReturnMethod.minimal).eq("id", input.expense_split_id).eq("user_id", context.user_id).execute()
     
-    if not split_result.data or split_result.data[0]["user_id"] != context.user_id:
-        raise Exception("Not authorized to mark this split as paid")
-    
-    # Update split
-    update_data = {"is_paid": True}
-    await context.supabase.table("expense_splits").update(update_data).eq("id", input.expense_split_id).execute()
+    if not result.count:
+        await raise_for_missed_write(context.supabase, "expense_splits", input.expense_split_id, "Expense split", "mark this split as paid")
     
     return True
@@ -0,0 +1,45 @@
+"""Settle up mutation resolver"""
+import strawberry
+from ....types import SettlementTotal, SettleUpResult
+from ..inputs import SettleUpInput
+from app.graphql.info import Info
+
+
+@strawberry.mutation
+async def settle_up(
+    info: Info,
+    input: SettleUpInput
+) -> SettleUpResult:
+    """
+    Mark paid, in one transaction, every unpaid split between the caller and
+    a roommate, or the given splits. Balances are updated with the splits and
+    each roommate involved gets one notification for all of it.
+    """
+    context = info.context
+
+    if not context.user_id:
+        raise Exception("Not authenticated")
+
+    if (input.counterparty_id is None) == (input.split_ids is None):
+        raise Exception("Pass either a counterparty or split ids to settle")
+
+    result = await context.supabase.rpc("settle_up", {
+        "p_household_id": input.household_id,
+        "p_counterparty_id": input.counterparty_id,
+        "p_split_ids": input.split_ids,
+    }).execute()
+
+    return SettleUpResult(
+        split_ids=result.data["split_ids"],
+        totals=[
+            SettlementTotal(
+                counterparty_id=total["counterparty_id"],
+                currency=total["currency"],
+                splits=total["splits"],
+                paid=float(total["paid"]),
+                received=float(total["received"]),
+                net=round(float(total["received"]) - float(total["paid"]), 2),
+            )
+            for total in result.data["totals"]
+        ],
+    )
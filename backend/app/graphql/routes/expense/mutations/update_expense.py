@@ -4,6 +4,8 @@ from typing import Optional
 from ....types import Expense
 from ..inputs import UpdateExpenseInput
 from app.graphql.info import Info
+from app.graphql.utils.conditional_writes import raise_for_missed_write
+from app.graphql.utils.field_selectors import get_requested_db_fields
 from app.graphql.utils.parsers import parse_datetime_fields, datetime_to_iso
 
 
@@ -19,12 +21,6 @@ async def update_expense(
     if not context.user_id:
         raise Exception("Not authenticated")
     
-    # Verify user created the expense
-    expense_result = await context.supabase.table("expenses").select("paid_by").eq("id", expense_id).execute()
-    
-    if not expense_result.data or expense_result.data[0]["paid_by"] != context.user_id:
-        raise Exception("Not authorized to update this expense")
-    
     # Build update dict
     update_data = {}
     if input.title is not None:
@@ -43,10 +39,12 @@ async def update_expense(
     if not update_data:
         raise Exception("No fields to update")
     
-    # Update expense
-    result = await context.supabase.table("expenses").update(update_data).eq("id", expense_id).execute()
+    # Update expense, only if the user created it, returning just the requested columns
+    fields = get_requested_db_fields(Expense, info)
+    result = await context.supabase.table("expenses").update(update_data).eq("id", expense_id).eq("paid_by", context.user_id).select(fields).execute()
+    
+    if not result.data:
+        await raise_for_missed_write(context.supabase, "expenses", expense_id, "Expense", "update this expense")
     
-    if result.data:
-        expense_data = parse_datetime_fields(result.data[0], "created_at", "due_date")
-        return Expense(**expense_data)
-    return None
+    expense_data = parse_datetime_fields(result.data[0], "created_at", "due_date")
+    return Expense(**expense_data)
@@ -0,0 +1,70 @@
+"""Update expense template mutation resolver"""
+import strawberry
+from ....types import ExpenseTemplate
+from ..inputs import UpdateExpenseTemplateInput
+from app.graphql.info import Info
+from app.graphql.utils.conditional_writes import raise_for_missed_write
+from app.graphql.utils.field_selectors import get_requested_db_fields
+from app.graphql.utils.parsers import parse_datetime_fields
+
+
+@strawberry.mutation
+async def update_expense_template(
+    info: Info,
+    template_id: str,
+    input: UpdateExpenseTemplateInput
+) -> ExpenseTemplate:
+    """Update an expense template; expenses already generated from it are left as they are"""
+    context = info.context
+    
+    if not context.user_id:
+        raise Exception("Not authenticated")
+    
+    # Build update dict
+    update_data = {}
+    for field in ("title", "description", "currency", "category", "paid_by", "day_of_month", "is_active"):
+        value = getattr(input, field)
+        if value is not None:
+            update_data[field] = value
+    # These two can be cleared with an explicit null
+    for field in ("amount", "split_with"):
+        value = getattr(input, field)
+        if value is not strawberry.UNSET:
+            update_data[field] = value
+    
+    if not update_data:
+        raise Exception("No fields to update")
+    if update_data.get("amount") is not None and update_data["amount"] <= 0:
+        raise Exception("Amount must be positive")
+    if not 1 <= update_data.get("day_of_month", 1) <= 28:
+        raise Exception("Day of month must be between 1 and 28")
+    
+    # Only a new payer, new sharers or a cleared amount need the template read first
+    clears_amount = "amount" in update_data and update_data["amount"] is None
+    new_people = [update_data["paid_by"]] if "paid_by" in update_data else []
+    new_people += update_data.get("split_with") or []
+    if clears_amount or new_people:
+        template_result = await context.supabase.table("expense_templates").select("household_id,kind").eq("id", template_id).execute()
+        
+        if not template_result.data:
+            raise Exception("Expense template not found")
+        if clears_amount and template_result.data[0]["kind"] != "rent":
+            raise Exception("A bill needs an amount")
+        
+        if new_people:
+            members_result = await context.supabase.table("roommates").select("user_id").eq("household_id", template_result.data[0]["household_id"]).eq("status", "accepted").execute()
+            members = {member["user_id"] for member in members_result.data}
+            
+            if context.user_id not in members:
+                raise Exception("Not a member of this household")
+            if not members.issuperset(new_people):
+                raise Exception("Expenses can only be paid by and split with roommates")
+    
+    # Update the template; RLS limits the write to the user's households
+    fields = get_requested_db_fields(ExpenseTemplate, info)
+    result = await context.supabase.table("expense_templates").update(update_data).eq("id", template_id).select(fields).execute()
+    
+    if not result.data:
+        await raise_for_missed_write(context.supabase, "expense_templates", template_id, "Expense template", "update this expense template")
+    
+    return ExpenseTemplate(**parse_datetime_fields(result.data[0], "created_at", "updated_at"))
@@ -3,7 +3,10 @@ import strawberry
 from .expense import expense
 from .household_expenses import household_expenses
 from .my_expenses import my_expenses
+from .my_balance_summary import my_balance_summary
 from .expense_splits import expense_splits
+from .expense_templates import expense_templates
+from .household_spending import household_spending
 
 
 @strawberry.type
@@ -13,7 +16,10 @@ class ExpenseQueries:
     expense = expense
     household_expenses = household_expenses
     my_expenses = my_expenses
+    my_balance_summary = my_balance_summary
     expense_splits = expense_splits
+    expense_templates = expense_templates
+    household_spending = household_spending
 
 
 __all__ = [
@@ -21,5 +27,8 @@ __all__ = [
     "expense",
     "household_expenses",
     "my_expenses",
+    "my_balance_summary",
     "expense_splits",
+    "expense_templates",
+    "household_spending",
 ]
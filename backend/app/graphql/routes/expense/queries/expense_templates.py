@@ -0,0 +1,22 @@
+"""Get household expense templates query resolver"""
+import strawberry
+from typing import List
+from ....types import ExpenseTemplate
+from app.graphql.cache import CacheControl
+from app.graphql.info import Info
+from app.graphql.utils.field_selectors import get_requested_db_fields
+from app.graphql.utils.parsers import parse_datetime_fields
+
+
+@strawberry.field(directives=[CacheControl(max_age=60, scopes=["expenses", "members"])])
+async def expense_templates(
+    info: Info,
+    household_id: str
+) -> List[ExpenseTemplate]:
+    """Get a household's rent and recurring bills, rent first"""
+    context = info.context
+    
+    fields = get_requested_db_fields(ExpenseTemplate, info)
+    result = await context.supabase.table("expense_templates").select(fields).eq("household_id", household_id).order("kind", desc=True).order("created_at").execute()
+    
+    return [ExpenseTemplate(**parse_datetime_fields(template, "created_at", "updated_at")) for template in result.data]
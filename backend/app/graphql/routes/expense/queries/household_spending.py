@@ -0,0 +1,120 @@
+"""Get household spending analytics query resolver"""
+import strawberry
+from datetime import date, datetime, timezone
+from typing import Annotated, Any, Dict, List, Optional, Tuple
+from ....types import CategorySpending, HouseholdSpending, MemberSpending, SpendingPeriod
+from app.graphql.cache import CacheControl
+from app.graphql.info import Info
+
+
+SPENDING_GRANULARITIES = ("month", "quarter", "year")
+MAX_SPENDING_MONTHS = 36
+
+
+def spending_period_start(month: date, granularity: str) -> date:
+    """First day of the month, quarter or year containing month"""
+    if granularity == "year":
+        return month.replace(month=1, day=1)
+    if granularity == "quarter":
+        return month.replace(month=(month.month - 1) // 3 * 3 + 1, day=1)
+    return month.replace(day=1)
+
+
+def _months_between(start: date, end: date) -> int:
+    return (end.year - start.year) * 12 + end.month - start.month + 1
+
+
+def _periods(rows: List[Dict[str, Any]], granularity: str) -> List[SpendingPeriod]:
+    """Fold monthly (category, currency, roommate) rollups into periods"""
+    totals: Dict[Tuple[date, str], Dict[str, Dict[str, Any]]] = {}
+    for row in rows:
+        month = date.fromisoformat(row["month"])
+        categories = totals.setdefault((spending_period_start(month, granularity), row["currency"]), {})
+        category = categories.setdefault(row["category"], {"expense_count": 0, "total": 0.0, "members": {}})
+        category["expense_count"] += row["expense_count"]
+        category["total"] += float(row["paid"])
+        if row["user_id"] is None:
+            # Expenses without a payer count towards the category, not a roommate
+            continue
+        member = category["members"].setdefault(row["user_id"], {"paid": 0.0, "share": 0.0})
+        member["paid"] += float(row["paid"])
+        member["share"] += float(row["share"])
+
+    periods = []
+    for (start, currency), categories in sorted(totals.items()):
+        category_spending = []
+        for name, category in categories.items():
+            members = [
+                MemberSpending(user_id=user_id, paid=round(member["paid"], 2), share=round(member["share"], 2))
+                for user_id, member in category["members"].items()
+                if round(member["paid"], 2) or round(member["share"], 2)
+            ]
+            if not members and not category["expense_count"]:
+                # Everything in it was deleted or moved
+                continue
+            members.sort(key=lambda member: (-member.paid, -member.share, member.user_id))
+            category_spending.append(CategorySpending(
+                category=name,
+                total=round(category["total"], 2),
+                expense_count=category["expense_count"],
+                members=members,
+            ))
+        if not category_spending:
+            continue
+        category_spending.sort(key=lambda category: (-category.total, category.category))
+        periods.append(SpendingPeriod(
+            period_start=start,
+            currency=currency,
+            total=round(sum(category.total for category in category_spending), 2),
+            expense_count=sum(category.expense_count for category in category_spending),
+            categories=category_spending,
+        ))
+    return periods
+
+
+@strawberry.field(directives=[CacheControl(max_age=60, scopes=["expenses", "members"])])
+async def household_spending(
+    info: Info,
+    household_id: str,
+    from_: Annotated[Optional[date], strawberry.argument(name="from")] = None,
+    to: Optional[date] = None,
+    granularity: str = "month"  # 'month', 'quarter', 'year'
+) -> HouseholdSpending:
+    """
+    Get a household's spending per category, and each roommate's part of it,
+    per month, quarter or year from the month of `from` to the month of `to`
+    (by default the last twelve months).
+
+    Reads the household's monthly rollups, a few rows per month, rather than
+    its expenses.
+    """
+    context = info.context
+
+    if granularity not in SPENDING_GRANULARITIES:
+        raise Exception(f"Invalid granularity. Must be one of: {', '.join(SPENDING_GRANULARITIES)}")
+
+    end = (to or datetime.now(timezone.utc).date()).replace(day=1)
+    if from_ is None:
+        # Twelve months up to and including the month of `to`
+        month_index = end.year * 12 + end.month - 12
+        from_ = date(month_index // 12, month_index % 12 + 1, 1)
+    # Periods are whole: the first one starts at its beginning
+    start = spending_period_start(from_, granularity)
+
+    if start > end:
+        raise Exception("from must not be after to")
+    if _months_between(start, end) > MAX_SPENDING_MONTHS:
+        raise Exception(f"Spending can be read for at most {MAX_SPENDING_MONTHS} months at a time")
+
+    result = await context.supabase.table("household_spending_months") \
+        .select("month,category,currency,user_id,paid,share,expense_count") \
+        .eq("household_id", household_id) \
+        .gte("month", start.isoformat()) \
+        .lte("month", end.isoformat()) \
+        .execute()
+
+    return HouseholdSpending(
+        household_id=household_id,
+        granularity=granularity,
+        periods=_periods(result.data, granularity),
+    )
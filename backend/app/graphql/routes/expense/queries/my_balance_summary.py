@@ -0,0 +1,48 @@
+"""Get my balance summary query resolver"""
+import strawberry
+from typing import Dict, Tuple
+from ....types import BalanceSummary, CounterpartyBalance, CurrencyBalance, HouseholdBalanceSummary
+from app.graphql.info import Info
+
+
+@strawberry.field
+async def my_balance_summary(info: Info) -> BalanceSummary:
+    """Get what the current user owes and is owed, per household and roommate"""
+    context = info.context
+
+    if not context.user_id:
+        raise Exception("Not authenticated")
+
+    # Summed in the database from the maintained household_balances rows
+    result = await context.supabase.rpc("my_balance_summary", {}).execute()
+
+    households: Dict[Tuple[str, str], HouseholdBalanceSummary] = {}
+    totals: Dict[str, CurrencyBalance] = {}
+    for row in result.data or []:
+        owed_by_me, owed_to_me = float(row["owed_by_me"]), float(row["owed_to_me"])
+
+        household = households.get((row["household_id"], row["currency"]))
+        if household is None:
+            household = households[(row["household_id"], row["currency"])] = HouseholdBalanceSummary(
+                household_id=row["household_id"],
+                currency=row["currency"],
+                owed_by_me=0,
+                owed_to_me=0,
+                net=0,
+                counterparties=[],
+            )
+        household.counterparties.append(CounterpartyBalance(
+            user_id=row["counterparty_id"],
+            currency=row["currency"],
+            owed_by_me=owed_by_me,
+            owed_to_me=owed_to_me,
+            net=round(owed_to_me - owed_by_me, 2),
+        ))
+
+        total = totals.setdefault(row["currency"], CurrencyBalance(currency=row["currency"], owed_by_me=0, owed_to_me=0, net=0))
+        for balance in (household, total):
+            balance.owed_by_me = round(balance.owed_by_me + owed_by_me, 2)
+            balance.owed_to_me = round(balance.owed_to_me + owed_to_me, 2)
+            balance.net = round(balance.owed_to_me - balance.owed_by_me, 2)
+
+    return BalanceSummary(households=list(households.values()), totals=list(totals.values()))
@@ -1,30 +1,61 @@
 """Get my expenses query resolver"""
 import strawberry
-from typing import List
+import uuid
+from datetime import datetime
+from typing import List, Optional
 from ....types import Expense
 from app.graphql.info import Info
 from app.graphql.utils.field_selectors import get_requested_db_fields
-from app.graphql.utils.parsers import parse_datetime_fields
+from app.graphql.utils.parsers import datetime_to_iso, parse_datetime_fields
+
+
+MAX_MY_EXPENSES_LIMIT = 100
 
 
 @strawberry.field
-async def my_expenses(info: Info) -> List[Expense]:
-    """Get expenses for current user"""
+async def my_expenses(
+    info: Info,
+    limit: int = 50,
+    before_created_at: Optional[datetime] = None,
+    before_id: Optional[str] = None
+) -> List[Expense]:
+    """
+    Get expenses split with the current user, newest first. For the next page
+    pass the createdAt and id of the last expense as beforeCreatedAt and beforeId.
+    """
     context = info.context
     
     if not context.user_id:
         return []
-    
-    # Get expense splits for the user
-    splits_result = await context.supabase.table("expense_splits").select("expense_id").eq("user_id", context.user_id).execute()
-    
-    if not splits_result.data:
-        return []
-    
-    expense_ids = [s["expense_id"] for s in splits_result.data]
-    
-    # Get the actual expenses
+
+    limit = max(1, min(limit, MAX_MY_EXPENSES_LIMIT))
+
+    # before_id goes into a PostgREST filter string, so only a well-formed id may
+    if before_id:
+        try:
+            before_id = str(uuid.UUID(before_id))
+        except ValueError:
+            raise Exception("Invalid beforeId")
+
+    # Expenses joined to the user's splits, in one call
     fields = get_requested_db_fields(Expense, info)
-    result = await context.supabase.table("expenses").select(fields).in_("id", expense_ids).order("created_at", desc=True).execute()
-    
-    return [Expense(**parse_datetime_fields(expense, "created_at", "due_date")) for expense in result.data]
+    query = context.supabase.table("expenses") \
+        .select(f"{fields},expense_splits!inner(user_id)") \
+        .eq("expense_splits.user_id", context.user_id)
+
+    if before_created_at is not None:
+        before = datetime_to_iso(before_created_at)
+        if before_id:
+            query = query.or_(f'created_at.lt."{before}",and(created_at.eq."{before}",id.lt.{before_id})')
+        else:
+            query = query.lt("created_at", before)
+
+    result = await query.order("created_at", desc=True).order("id", desc=True).limit(limit).execute()
+
+    return [
+        Expense(**parse_datetime_fields(
+            {key: value for key, value in expense.items() if key != "expense_splits"},
+            "created_at", "due_date",
+        ))
+        for expense in result.data
+    ]
@@ -1,11 +1,12 @@
 """Room domain resolvers"""
 from .queries import HouseholdQueries
 from .mutations import HouseholdMutations
-from .inputs import CreateHouseholdInput, UpdateHouseholdInput
+from .inputs import CreateHouseholdInput, UpdateHouseholdInput, HouseholdListingFilter
 
 __all__ = [
     "HouseholdQueries",
     "HouseholdMutations",
     "CreateHouseholdInput",
     "UpdateHouseholdInput",
+    "HouseholdListingFilter",
 ]
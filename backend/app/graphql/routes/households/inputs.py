@@ -30,3 +30,14 @@ class UpdateHouseholdInput:
     amenities: Optional[List[str]] = None
     images: Optional[List[str]] = None
     is_available: Optional[bool] = None
+
+
+@strawberry.input
+class HouseholdListingFilter:
+    """Filters for searching available household listings; all are optional and combined with AND"""
+    
+    query: Optional[str] = None  # matched against name, description and address
+    min_rent: Optional[float] = None
+    max_rent: Optional[float] = None
+    household_types: Optional[List[str]] = None  # any of 'private', 'shared', 'studio', 'apartment'
+    amenities: Optional[List[str]] = None  # listing must have all of these
@@ -1,9 +1,11 @@
 """Create household mutation resolver"""
 import strawberry
 from typing import Optional
+from postgrest.types import ReturnMethod
 from ....types import Household
 from ..inputs import CreateHouseholdInput
 from app.graphql.info import Info
+from app.graphql.utils.field_selectors import get_requested_db_fields
 from app.graphql.utils.parsers import parse_datetime_fields
 import random
 import string
@@ -34,7 +36,9 @@ async def create_household(
         "invite_code": code,
     }
 
-    result = await context.supabase.table("households").insert(household_data).execute()
+    # Only return the columns the selection set asks for (id is always included)
+    fields = get_requested_db_fields(Household, info)
+    result = await context.supabase.table("households").insert(household_data).select(fields).execute()
     if not result.data:
         return None
 
@@ -43,7 +47,7 @@ async def create_household(
         "household_id": result.data[0]["id"],
         "status": "accepted",
     }
-    await context.supabase.table("roommates").insert(roommate_data).execute()
+    await context.supabase.table("roommates").insert(roommate_data, returning=ReturnMethod.minimal).execute()
 
     household = parse_datetime_fields(result.data[0], "created_at", "updated_at")
     return Household(**household)
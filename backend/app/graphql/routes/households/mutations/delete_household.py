@@ -1,6 +1,8 @@
 """Delete household mutation resolver"""
 import strawberry
+from postgrest.types import CountMethod, ReturnMethod
 from app.graphql.info import Info
+from app.graphql.utils.conditional_writes import raise_for_missed_write
 
 
 @strawberry.mutation
@@ -14,13 +16,10 @@ async def delete_household(
     if not context.user_id:
         raise Exception("Not authenticated")
     
-    # Verify user is the creator
-    household_result = await context.supabase.table("households").select("created_by").eq("id", household_id).execute()
+    # Delete household, only if the user is the creator
+    result = await context.supabase.table("households").delete(count=CountMethod.exact, returning=ReturnMethod.minimal).eq("id", household_id).eq("created_by", context.user_id).execute()
     
-    if not household_result.data or household_result.data[0]["created_by"] != context.user_id:
-        raise Exception("Not authorized to delete this household")
-    
-    # Delete household
-    await context.supabase.table("households").delete().eq("id", household_id).execute()
+    if not result.count:
+        await raise_for_missed_write(context.supabase, "households", household_id, "Household", "delete this household")
     
     return True
@@ -1,6 +1,8 @@
 """Join household mutation resolver"""
 import strawberry
+from postgrest.types import ReturnMethod
 from app.graphql.info import Info
+from app.graphql.utils.field_selectors import get_requested_db_fields
 from app.graphql.utils.parsers import parse_datetime_fields
 from ....types import Household
 
@@ -16,7 +18,10 @@ async def join_household(
         raise Exception("Not authenticated")
     
     # Check if household exists and is available
-    household_result = await context.supabase.table("households").select("id, invite_code, is_available").eq("invite_code", invite_code).execute()
+    fields = get_requested_db_fields(Household, info)
+    if fields != "*":
+        fields = ",".join(sorted({*fields.split(","), "is_available"}))
+    household_result = await context.supabase.table("households").select(fields).eq("invite_code", invite_code).execute()
     
     if not household_result.data:
         raise Exception("Room not found")
@@ -25,7 +30,7 @@ async def join_household(
         raise Exception("Room is not available")
     
     # Check if already a roommate
-    existing = await context.supabase.table("roommates").select("*").eq("user_id", context.user_id).eq("household_id", household_result.data[0]["id"]).execute()
+    existing = await context.supabase.table("roommates").select("id").eq("user_id", context.user_id).eq("household_id", household_result.data[0]["id"]).execute()
     
     if existing.data:
         raise Exception("Already a member of this household")
@@ -36,7 +41,7 @@ async def join_household(
         "household_id": household_result.data[0]["id"],
         "status": "accepted",
     }
-    await context.supabase.table("roommates").insert(roommate_data).execute()
+    await context.supabase.table("roommates").insert(roommate_data, returning=ReturnMethod.minimal).execute()
     
     household_data = parse_datetime_fields(household_result.data[0], "created_at", "updated_at")
     return Household(**household_data)
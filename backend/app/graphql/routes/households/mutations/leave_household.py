@@ -1,8 +1,10 @@
 """Leave household mutation resolver"""
 import strawberry
+from postgrest.types import ReturnMethod
 from typing import List
 from app.graphql.info import Info
 from ....types import Household
+from app.graphql.utils.field_selectors import get_child_requested_db_fields
 from app.graphql.utils.parsers import parse_datetime_fields
 
 
@@ -26,11 +28,12 @@ async def leave_household(
     
     # Update roommate status
     update_data = {"status": "left"}
-    await context.supabase.table("roommates").update(update_data).eq("user_id", context.user_id).eq("household_id", household_id).execute()
+    await context.supabase.table("roommates").update(update_data, returning=ReturnMethod.minimal).eq("user_id", context.user_id).eq("household_id", household_id).execute()
     
     # Get remaining households where user is still a member
+    household_fields = ",".join(get_child_requested_db_fields(info, "remainingHouseholds", Household))
     result = await context.supabase.table('roommates') \
-        .select('households(*)') \
+        .select(f'households({household_fields})') \
         .eq('user_id', context.user_id) \
         .eq('status', 'accepted') \
         .execute()
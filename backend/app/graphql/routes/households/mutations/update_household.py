@@ -1,9 +1,11 @@
 """Update household mutation resolver"""
 import strawberry
 from ....types import Household
-from dateutil import parser
 from ..inputs import UpdateHouseholdInput
 from app.graphql.info import Info
+from app.graphql.utils.conditional_writes import raise_for_missed_write
+from app.graphql.utils.field_selectors import get_requested_db_fields
+from app.graphql.utils.parsers import parse_datetime_fields
 from typing import Optional
 
 @strawberry.mutation
@@ -18,12 +20,6 @@ async def update_household(
     if not context.user_id:
         raise Exception("Not authenticated")
     
-    # Verify user is the creator
-    household_result = await context.supabase.table("households").select("created_by").eq("id", household_id).execute()
-    
-    if not household_result.data or household_result.data[0]["created_by"] != context.user_id:
-        raise Exception("Not authorized to update this household")
-    
     # Build update dict
     update_data = {}
     if input.name is not None:
@@ -48,17 +44,12 @@ async def update_household(
     if not update_data:
         raise Exception("No fields to update")
     
-    # Update household
-    result = await context.supabase.table("households").update(update_data).eq("id", household_id).execute()
+    # Update household, only if the user is the creator, returning just the requested columns
+    fields = get_requested_db_fields(Household, info)
+    result = await context.supabase.table("households").update(update_data).eq("id", household_id).eq("created_by", context.user_id).select(fields).execute()
+    
+    if not result.data:
+        await raise_for_missed_write(context.supabase, "households", household_id, "Household", "update this household")
     
-    if result.data:
-        household_data = result.data[0].copy()
-        # Convert string timestamps to datetime objects if they exist
-        if 'created_at' in household_data and household_data['created_at']:
-            if isinstance(household_data['created_at'], str):
-                household_data['created_at'] = parser.isoparse(household_data['created_at'])
-        if 'updated_at' in household_data and household_data['updated_at']:
-            if isinstance(household_data['updated_at'], str):
-                household_data['updated_at'] = parser.isoparse(household_data['updated_at'])
-        return Household(**household_data)
-    return None
+    household_data = parse_datetime_fields(result.data[0], "created_at", "updated_at")
+    return Household(**household_data)
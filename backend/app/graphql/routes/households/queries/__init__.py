@@ -1,22 +1,34 @@
 """Room query resolvers"""
 import strawberry
+from .activity_feed import activity_feed
 from .household import household
+from .household_changes import household_changes
+from .household_dashboard import household_dashboard
 from .list import list as list_households
 from .my_households import my_households
+from .search_listings import search_listings
 
 
 @strawberry.type
 class HouseholdQueries:
     """Room related queries"""
     
+    activity_feed = activity_feed
     household = household
+    household_changes = household_changes
+    household_dashboard = household_dashboard
     list = list_households
     my_households = my_households
+    search_listings = search_listings
 
 
 __all__ = [
     "HouseholdQueries",
+    "activity_feed",
     "household",
+    "household_changes",
+    "household_dashboard",
     "list_households",
     "my_households",
+    "search_listings",
 ]
@@ -0,0 +1,122 @@
+"""Household activity feed query resolver"""
+import strawberry
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+from ....types import ActivityFeedPage, ActivityItem, Chore, ChoreAssignment, Expense, ExpenseSplit, Message
+from app.graphql.info import Info
+from app.graphql.utils.cursors import decode_cursor, encode_cursor
+from app.graphql.utils.keyset_merge import KeysetStream, Position, apply_position, merge_newest_first
+from app.graphql.utils.parsers import parse_datetime_fields
+
+
+MAX_FEED_LIMIT = 50
+
+
+@dataclass
+class FeedSource:
+    """A table whose rows are events of one kind"""
+
+    kind: str
+    table: str
+    columns: str
+    timestamp_column: str
+    actor_column: str
+    # Restricts a query on the table to one household's events
+    scope: Callable[[Any, str], Any]
+
+
+# In tie-break order: at equal timestamps, later sources come first
+FEED_SOURCES = [
+    FeedSource("message", "messages", "*", "created_at", "sender_id",
+               lambda query, household_id: query.eq("household_id", household_id)),
+    FeedSource("expense_created", "expenses", "*", "created_at", "paid_by",
+               lambda query, household_id: query.eq("household_id", household_id)),
+    FeedSource("payment", "expense_splits", "*, expenses!inner(*)", "paid_at", "user_id",
+               lambda query, household_id: query.eq("expenses.household_id", household_id).eq("is_paid", True)),
+    FeedSource("chore_completed", "chore_assignments", "*, chores!inner(*)", "completed_at", "user_id",
+               lambda query, household_id: query.eq("chores.household_id", household_id).eq("is_complete", True)),
+]
+
+
+def _stream(supabase: Any, household_id: str, rank: int, source: FeedSource) -> KeysetStream:
+    async def fetch(after: Optional[Position], size: int) -> List[Dict[str, Any]]:
+        query = source.scope(supabase.table(source.table).select(source.columns), household_id)
+        result = await apply_position(query, source.timestamp_column, after) \
+            .order(source.timestamp_column, desc=True) \
+            .order("id", desc=True) \
+            .limit(size) \
+            .execute()
+        return result.data
+
+    return KeysetStream(source.kind, rank, source.timestamp_column, fetch)
+
+
+def _item(source: FeedSource, row: Dict[str, Any]) -> ActivityItem:
+    item = ActivityItem(
+        kind=source.kind,
+        occurred_at=parse_datetime_fields(row, source.timestamp_column)[source.timestamp_column],
+        actor_id=row.get(source.actor_column),
+    )
+    if source.kind == "message":
+        item.message = Message(**parse_datetime_fields(row, "created_at"))
+    elif source.kind == "expense_created":
+        item.expense = Expense(**parse_datetime_fields(row, "created_at", "due_date"))
+    elif source.kind == "payment":
+        split = {key: value for key, value in row.items() if key != "expenses"}
+        item.split = ExpenseSplit(**parse_datetime_fields(split, "paid_at"))
+        item.expense = Expense(**parse_datetime_fields(row["expenses"], "created_at", "due_date"))
+    else:
+        assignment = parse_datetime_fields(row, "due_date", "completed_at", "created_at")
+        item.assignment = ChoreAssignment(
+            id=assignment["id"],
+            chore=Chore(**parse_datetime_fields(row["chores"], "created_at", "updated_at")),
+            due_date=assignment["due_date"],
+            is_complete=assignment["is_complete"],
+            completed_at=assignment.get("completed_at"),
+            proof_url=assignment.get("proof_url"),
+            created_at=assignment["created_at"],
+        )
+    return item
+
+
+@strawberry.field
+async def activity_feed(
+    info: Info,
+    household_id: str,
+    cursor: Optional[str] = None,
+    limit: int = 20
+) -> ActivityFeedPage:
+    """
+    Get a household's timeline of messages, new expenses, payments and
+    completed chores, newest first.
+
+    Each kind of event is read newest first after the cursor, a few rows at a
+    time, and the streams are merged, so a page reads O(limit) rows of each.
+    """
+    context = info.context
+
+    limit = max(1, min(limit, MAX_FEED_LIMIT))
+    after = decode_cursor(cursor, "at", "kind", "id")
+
+    sources = {source.kind: source for source in FEED_SOURCES}
+    streams = [_stream(context.supabase, household_id, rank, source) for rank, source in enumerate(FEED_SOURCES)]
+    if after is not None:
+        if after["kind"] not in sources:
+            raise Exception("Invalid cursor")
+        rank = FEED_SOURCES.index(sources[after["kind"]])
+        for stream in streams:
+            stream.start_after(after["at"], rank, after["id"])
+
+    # One extra event tells us whether there is another page
+    merged = await merge_newest_first(streams, limit + 1)
+    page, has_more = merged[:limit], len(merged) > limit
+
+    next_cursor = None
+    if has_more:
+        stream, row = page[-1]
+        next_cursor = encode_cursor({"at": row[stream.timestamp_column], "kind": stream.name, "id": row["id"]})
+
+    return ActivityFeedPage(
+        items=[_item(sources[stream.name], row) for stream, row in page],
+        next_cursor=next_cursor,
+    )
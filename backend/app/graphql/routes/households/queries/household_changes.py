@@ -0,0 +1,95 @@
+"""Household delta sync query resolver"""
+import dataclasses
+import json
+import strawberry
+from typing import Any, Dict
+from ....types import (
+    Chore,
+    ChoreAssignment,
+    DeletedRow,
+    Expense,
+    ExpenseSplit,
+    Household,
+    HouseholdChanges,
+    Message,
+    Profile,
+    Roommate,
+)
+from app.graphql.info import Info
+from app.graphql.utils.parsers import parse_datetime_fields
+
+
+MAX_SYNC_LIMIT = 1000
+
+# Changed rows by table: the type they become and their datetime columns
+ROW_TYPES = {
+    "roommates": (Roommate, ("joined_at", "left_at")),
+    "chores": (Chore, ("created_at", "updated_at")),
+    "expenses": (Expense, ("created_at", "due_date")),
+    "expense_splits": (ExpenseSplit, ("paid_at",)),
+    "messages": (Message, ("created_at",)),
+}
+
+
+def _to_type(cls, row: Dict[str, Any], *datetime_fields: str):
+    """Build cls from a row, ignoring columns it has no field for"""
+    names = {field.name for field in dataclasses.fields(cls)}
+    return cls(**parse_datetime_fields({key: value for key, value in row.items() if key in names}, *datetime_fields))
+
+
+@strawberry.field
+async def household_changes(
+    info: Info,
+    household_id: str,
+    since: int = 0,
+    limit: int = 500
+) -> HouseholdChanges:
+    """
+    Rows of a household inserted, updated or deleted after version `since`
+    (0 for everything), oldest change first
+    """
+    context = info.context
+
+    if not context.user_id:
+        raise Exception("Not authenticated")
+
+    limit = max(1, min(limit, MAX_SYNC_LIMIT))
+
+    # One extra change tells us whether there is another page
+    result = await context.supabase.rpc("household_changes_since", {
+        "p_household_id": household_id,
+        "p_since": since,
+        "p_limit": limit + 1,
+    }).execute()
+
+    data = result.data or {}
+    entries = data.get("changes") or []
+    page, has_more = entries[:limit], len(entries) > limit
+
+    changes = HouseholdChanges(
+        version=page[-1]["version"] if has_more else data.get("version", 0),
+        has_more=has_more,
+        full_resync=bool(data.get("full_resync")),
+    )
+    for entry in page:
+        row = entry.get("row")
+        if entry["deleted"] or row is None:
+            changes.deleted.append(DeletedRow(table=entry["table"], id=entry["id"]))
+        elif entry["table"] == "households":
+            changes.household = _to_type(Household, row, "created_at", "updated_at")
+        elif entry["table"] == "chore_assignments":
+            changes.chore_assignments.append(ChoreAssignment(
+                **parse_datetime_fields(
+                    {key: row.get(key) for key in ("id", "is_complete", "proof_url", "due_date", "completed_at", "created_at")},
+                    "due_date", "completed_at", "created_at",
+                ),
+                chore=Chore(id=row.get("chore_id")),
+                user=Profile(id=row.get("user_id")),
+            ))
+        else:
+            cls, datetime_fields = ROW_TYPES[entry["table"]]
+            if cls is Message and row.get("metadata") is not None and not isinstance(row["metadata"], str):
+                row = {**row, "metadata": json.dumps(row["metadata"])}
+            getattr(changes, entry["table"]).append(_to_type(cls, row, *datetime_fields))
+
+    return changes
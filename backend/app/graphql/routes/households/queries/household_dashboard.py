@@ -0,0 +1,146 @@
+"""Household dashboard query resolver"""
+import strawberry
+from typing import Any, Dict, List
+from ....types import (
+    Chore,
+    ChoreAssignment,
+    CurrencyBalance,
+    Expense,
+    Household,
+    HouseholdDashboard,
+    Message,
+    Profile,
+    Roommate,
+)
+from app.graphql.info import Info
+from app.graphql.utils.concurrency import fan_out
+from app.graphql.utils.parsers import parse_datetime_fields
+
+
+MAX_DASHBOARD_LIMIT = 20
+
+
+def _assignment(row: Dict[str, Any], profiles: Dict[str, Dict[str, Any]]) -> ChoreAssignment:
+    data = parse_datetime_fields(row, "due_date", "completed_at", "created_at")
+    profile = profiles.get(row["user_id"])
+    return ChoreAssignment(
+        id=data["id"],
+        chore=Chore(**parse_datetime_fields(row["chores"], "created_at", "updated_at")),
+        user=Profile(**parse_datetime_fields(profile, "created_at", "updated_at")) if profile else None,
+        due_date=data["due_date"],
+        is_complete=data["is_complete"],
+        completed_at=data.get("completed_at"),
+        proof_url=data.get("proof_url"),
+        created_at=data["created_at"],
+    )
+
+
+def _balances(balances: List[Dict[str, Any]], user_id: str) -> List[CurrencyBalance]:
+    """Totals per currency; amounts in different currencies are never added up"""
+    totals: Dict[str, Dict[str, float]] = {}
+    for balance in balances:
+        total = totals.setdefault(balance["currency"], {"owed_by_me": 0.0, "owed_to_me": 0.0})
+        total["owed_by_me" if balance["debtor_id"] == user_id else "owed_to_me"] += float(balance["amount"])
+    return [
+        CurrencyBalance(
+            currency=currency,
+            owed_by_me=round(total["owed_by_me"], 2),
+            owed_to_me=round(total["owed_to_me"], 2),
+            net=round(total["owed_to_me"] - total["owed_by_me"], 2),
+        )
+        for currency, total in sorted(totals.items())
+        if round(total["owed_by_me"], 2) or round(total["owed_to_me"], 2)
+    ]
+
+
+@strawberry.field
+async def household_dashboard(
+    info: Info,
+    household_id: str,
+    limit: int = 5
+) -> HouseholdDashboard:
+    """
+    Get a household's home screen: its members, the caller's and everyone's
+    upcoming chores, the caller's balances, and recent expenses and messages.
+    All of it is read in one round of concurrent calls.
+    """
+    context = info.context
+    supabase = context.supabase
+
+    if not context.user_id:
+        raise Exception("Not authenticated")
+
+    limit = max(1, min(limit, MAX_DASHBOARD_LIMIT))
+
+    def open_assignments():
+        return supabase.table("chore_assignments") \
+            .select("*, chores!inner(*)") \
+            .eq("chores.household_id", household_id) \
+            .eq("is_complete", False)
+
+    (
+        household_result,
+        members_result,
+        mine_result,
+        upcoming_result,
+        balances_result,
+        expenses_result,
+        messages_result,
+    ) = await fan_out(
+        supabase.table("households").select("*").eq("id", household_id).execute(),
+        supabase.table("roommates") \
+            .select("*, profiles:user_id(*)") \
+            .eq("household_id", household_id) \
+            .eq("status", "accepted") \
+            .execute(),
+        open_assignments().eq("user_id", context.user_id).order("due_date").limit(limit).execute(),
+        open_assignments().order("due_date").limit(limit).execute(),
+        supabase.table("household_balances") \
+            .select("debtor_id,currency,amount") \
+            .eq("household_id", household_id) \
+            .or_(f"debtor_id.eq.{context.user_id},creditor_id.eq.{context.user_id}") \
+            .execute(),
+        supabase.table("expenses") \
+            .select("*") \
+            .eq("household_id", household_id) \
+            .order("created_at", desc=True) \
+            .limit(limit) \
+            .execute(),
+        supabase.table("messages") \
+            .select("*") \
+            .eq("household_id", household_id) \
+            .order("created_at", desc=True) \
+            .limit(limit) \
+            .execute(),
+    )
+
+    if not any(member["user_id"] == context.user_id for member in members_result.data):
+        raise Exception("Not a member of this household")
+
+    # Members' profiles came embedded: hand them to the loader so Roommate.profile
+    # and the assignments below need no further calls
+    profiles = {}
+    members = []
+    for member in members_result.data:
+        profile = member.pop("profiles", None)
+        if profile:
+            profiles[member["user_id"]] = profile
+            context.dataloaders.profile_loader.prime(member["user_id"], profile)
+        members.append(Roommate(**parse_datetime_fields(member, "joined_at", "left_at")))
+
+    household = None
+    if household_result.data:
+        household = Household(**parse_datetime_fields(household_result.data[0], "created_at", "updated_at"))
+
+    messages = [Message(**parse_datetime_fields(message, "created_at")) for message in messages_result.data]
+    messages.reverse()
+
+    return HouseholdDashboard(
+        household=household,
+        members=members,
+        my_open_assignments=[_assignment(row, profiles) for row in mine_result.data],
+        upcoming_assignments=[_assignment(row, profiles) for row in upcoming_result.data],
+        balances=_balances(balances_result.data, context.user_id),
+        recent_expenses=[Expense(**parse_datetime_fields(expense, "created_at", "due_date")) for expense in expenses_result.data],
+        recent_messages=messages,
+    )
@@ -2,12 +2,13 @@
 import strawberry
 from typing import List
 from ....types import Household
+from app.graphql.cache import CacheControl
 from app.graphql.info import Info
 from app.graphql.utils.field_selectors import get_requested_db_fields
 from app.graphql.utils.parsers import parse_datetime_fields
 
 
-@strawberry.field
+@strawberry.field(directives=[CacheControl(max_age=300, scopes=["members"])])
 async def my_households(info: Info) -> List[Household]:
     """Get households created by or joined by current user"""
     context = info.context
@@ -0,0 +1,59 @@
+"""Search household listings query resolver"""
+import strawberry
+from typing import Optional
+from ....types import Household, HouseholdListingPage
+from ..inputs import HouseholdListingFilter
+from app.graphql.info import Info
+from app.graphql.utils.cursors import decode_cursor, encode_cursor
+from app.graphql.utils.field_selectors import get_child_requested_db_fields
+from app.graphql.utils.parsers import parse_datetime_fields
+
+
+MAX_LISTING_LIMIT = 50
+
+
+@strawberry.field
+async def search_listings(
+    info: Info,
+    filter: Optional[HouseholdListingFilter] = None,
+    cursor: Optional[str] = None,
+    limit: int = 20
+) -> HouseholdListingPage:
+    """Search available households, newest first"""
+    context = info.context
+    filter = filter or HouseholdListingFilter()
+
+    if filter.min_rent is not None and filter.max_rent is not None and filter.min_rent > filter.max_rent:
+        raise Exception("min_rent cannot be greater than max_rent")
+
+    limit = max(1, min(limit, MAX_LISTING_LIMIT))
+    after = decode_cursor(cursor, "created_at", "id") or {}
+
+    # Listings never expose invite codes; created_at is needed for the next cursor
+    fields = {*get_child_requested_db_fields(info, "results", Household), "created_at"} - {"invite_code"}
+
+    query = filter.query.strip() if filter.query else None
+
+    # One extra row tells us whether there is another page
+    result = await context.supabase.rpc("search_household_listings", {
+        "p_query": query or None,
+        "p_min_rent": filter.min_rent,
+        "p_max_rent": filter.max_rent,
+        "p_household_types": filter.household_types or None,
+        "p_amenities": filter.amenities or None,
+        "p_after_created_at": after.get("created_at"),
+        "p_after_id": after.get("id"),
+        "p_limit": limit + 1,
+    }).select(",".join(sorted(fields))).execute()
+
+    rows = result.data or []
+    page, has_more = rows[:limit], len(rows) > limit
+
+    next_cursor = None
+    if has_more:
+        next_cursor = encode_cursor({"created_at": page[-1]["created_at"], "id": page[-1]["id"]})
+
+    return HouseholdListingPage(
+        results=[Household(**parse_datetime_fields(row, "created_at", "updated_at")) for row in page],
+        next_cursor=next_cursor,
+    )
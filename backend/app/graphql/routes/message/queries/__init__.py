@@ -1,6 +1,7 @@
 """Message query resolvers"""
 import strawberry
 from .household_messages import household_messages
+from .search_messages import search_messages
 
 
 @strawberry.type
@@ -8,9 +9,11 @@ class MessageQueries:
     """Message related queries"""
     
     household_messages = household_messages
+    search_messages = search_messages
 
 
 __all__ = [
     "MessageQueries",
     "household_messages",
+    "search_messages",
 ]
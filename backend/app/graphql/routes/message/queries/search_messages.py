@@ -0,0 +1,61 @@
+"""Search household messages query resolver"""
+import strawberry
+from typing import Optional
+from ....types import Message, MessageSearchResult, MessageSearchPage
+from app.graphql.info import Info
+from app.graphql.utils.cursors import decode_cursor, encode_cursor
+from app.graphql.utils.parsers import parse_datetime_fields
+
+
+MAX_SEARCH_LIMIT = 50
+
+
+@strawberry.field
+async def search_messages(
+    info: Info,
+    household_id: str,
+    query: str,
+    cursor: Optional[str] = None,
+    limit: int = 20
+) -> MessageSearchPage:
+    """Search a household's messages, most relevant first"""
+    context = info.context
+
+    query = query.strip()
+    if not query:
+        raise Exception("Search query cannot be empty")
+
+    limit = max(1, min(limit, MAX_SEARCH_LIMIT))
+    after = decode_cursor(cursor, "rank", "created_at", "id") or {}
+
+    # One extra row tells us whether there is another page
+    result = await context.supabase.rpc("search_messages", {
+        "p_household_id": household_id,
+        "p_query": query,
+        "p_limit": limit + 1,
+        "p_after_rank": after.get("rank"),
+        "p_after_created_at": after.get("created_at"),
+        "p_after_id": after.get("id"),
+    }).execute()
+
+    rows = result.data or []
+    page, has_more = rows[:limit], len(rows) > limit
+
+    results = [
+        MessageSearchResult(
+            message=Message(**parse_datetime_fields(
+                {key: value for key, value in row.items() if key not in ("rank", "highlight")},
+                "created_at",
+            )),
+            rank=row["rank"],
+            highlight=row["highlight"],
+        )
+        for row in page
+    ]
+
+    next_cursor = None
+    if has_more:
+        last = page[-1]
+        next_cursor = encode_cursor({"rank": last["rank"], "created_at": last["created_at"], "id": last["id"]})
+
+    return MessageSearchPage(results=results, next_cursor=next_cursor)
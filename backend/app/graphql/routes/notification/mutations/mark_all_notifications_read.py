@@ -1,5 +1,6 @@
 """Mark all notifications read mutation resolver"""
 import strawberry
+from postgrest.types import ReturnMethod
 from app.graphql.info import Info
 
 
@@ -15,6 +16,6 @@ async def mark_all_notifications_read(
     
     # Update all notifications
     update_data = {"is_read": True}
-    await context.supabase.table("notifications").update(update_data).eq("user_id", context.user_id).eq("is_read", False).execute()
+    await context.supabase.table("notifications").update(update_data, returning=ReturnMethod.minimal).eq("user_id", context.user_id).eq("is_read", False).execute()
     
     return True
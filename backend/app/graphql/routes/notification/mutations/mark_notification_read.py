@@ -1,7 +1,9 @@
 """Mark notification read mutation resolver"""
 import strawberry
+from postgrest.types import CountMethod, ReturnMethod
 from ..inputs import MarkNotificationReadInput
 from app.graphql.info import Info
+from app.graphql.utils.conditional_writes import raise_for_missed_write
 
 
 @strawberry.mutation
@@ -15,14 +17,11 @@ async def mark_notification_read(
     if not context.user_id:
         raise Exception("Not authenticated")
     
-    # Verify user owns this notification
-    notif_result = await context.supabase.table("notifications").select("user_id").eq("id", input.notification_id).execute()
-    
-    if not notif_result.data or notif_result.data[0]["user_id"] != context.user_id:
-        raise Exception("Not authorized")
-    
-    # Update notification
+    # Update notification, only if the user owns it
     update_data = {"is_read": True}
-    await context.supabase.table("notifications").update(update_data).eq("id", input.notification_id).execute()
+    result = await context.supabase.table("notifications").update(update_data, count=CountMethod.exact, returning=ReturnMethod.minimal).eq("id", input.notification_id).eq("user_id", context.user_id).execute()
+    
+    if not result.count:
+        await raise_for_missed_write(context.supabase, "notifications", input.notification_id, "Notification", "mark this notification as read")
     
     return True
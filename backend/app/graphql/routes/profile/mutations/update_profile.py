@@ -4,6 +4,7 @@ from typing import Optional
 from ....types import Profile
 from ..inputs import UpdateProfileInput
 from app.graphql.info import Info
+from app.graphql.utils.field_selectors import get_requested_db_fields
 from app.graphql.utils.parsers import parse_datetime_fields
 
 
@@ -42,8 +43,9 @@ async def update_profile(
     if not update_data:
         raise Exception("No fields to update")
     
-    # Update profile
-    result = await context.supabase.table("profiles").update(update_data).eq("id", context.user_id).execute()
+    # Update profile, returning just the requested columns
+    fields = get_requested_db_fields(Profile, info)
+    result = await context.supabase.table("profiles").update(update_data).eq("id", context.user_id).select(fields).execute()
     
     if result.data:
         profile_data = parse_datetime_fields(result.data[0], "created_at", "updated_at")
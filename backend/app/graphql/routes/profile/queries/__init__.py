@@ -3,6 +3,7 @@ import strawberry
 from .profile import profile
 from .me import me
 from .list import list as list_profiles
+from .search_profiles import search_profiles
 
 
 @strawberry.type
@@ -12,6 +13,7 @@ class ProfileQueries:
     profile = profile
     me = me
     list = list_profiles
+    search_profiles = search_profiles
 
 
 __all__ = [
@@ -19,4 +21,5 @@ __all__ = [
     "profile",
     "me",
     "list_profiles",
+    "search_profiles",
 ]
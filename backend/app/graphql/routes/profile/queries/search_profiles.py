@@ -0,0 +1,43 @@
+"""Search profiles query resolver"""
+import strawberry
+from typing import List
+from ....types import Profile
+from app.graphql.info import Info
+from app.graphql.utils.rate_limit import RateLimiter
+
+
+MAX_SEARCH_RESULTS = 20
+
+# Typeahead fires on every keystroke; allow short bursts, not scraping
+search_rate_limiter = RateLimiter(rate=5, burst=20)
+
+
+@strawberry.field
+async def search_profiles(
+    info: Info,
+    prefix: str,
+    limit: int = 10
+) -> List[Profile]:
+    """
+    Find users by the start of their name or by their full email address, e.g. to
+    invite them as roommates.
+
+    Only id, full_name and avatar_url are returned; every other field is null.
+    """
+    context = info.context
+
+    if not context.user_id:
+        raise Exception("Not authenticated")
+
+    search_rate_limiter.check(context.user_id)
+
+    prefix = prefix.strip()
+    if len(prefix) < 2:
+        return []
+
+    result = await context.supabase.rpc("search_profiles", {
+        "p_prefix": prefix,
+        "p_limit": max(1, min(limit, MAX_SEARCH_RESULTS)),
+    }).execute()
+
+    return [Profile(**profile) for profile in result.data or []]
@@ -6,6 +6,12 @@ from .routes.expense import ExpenseQueries, ExpenseMutations
 from .routes.message import MessageQueries, MessageMutations
 from .routes.notification import NotificationQueries, NotificationMutations
 from .routes.chore import ChoreQueries, ChoreMutations
+from .extensions import (
+    CallAccountingExtension,
+    metrics_extensions,
+    response_cache_extensions,
+    tracing_extensions,
+)
 
 
 @strawberry.type
@@ -77,4 +83,13 @@ class Mutation:
         return ChoreMutations()
 
 # Create the GraphQL schema
-schema = strawberry.Schema(query=Query, mutation=Mutation)
+schema = strawberry.Schema(
+    query=Query,
+    mutation=Mutation,
+    extensions=[
+        *tracing_extensions(),
+        *metrics_extensions(),
+        *response_cache_extensions(),
+        CallAccountingExtension,
+    ],
+)
@@ -1,20 +1,53 @@
 """GraphQL type definitions"""
-from .household import Household
-from .expense import Expense, ExpenseSplit
+from .household import Household, HouseholdListingPage
+from .expense import Expense, ExpenseSplit, ExpenseTemplate
 from .profile import Profile
-from .message import Message
+from .message import Message, MessageSearchResult, MessageSearchPage
 from .notification import Notification
 from .roommate import Roommate
 from .chore import Chore, ChoreAssignment
+from .leaderboard import LeaderboardEntry
+from .household_changes import DeletedRow, HouseholdChanges
+from .household_dashboard import HouseholdDashboard
+from .activity import ActivityItem, ActivityFeedPage
+from .balance import (
+    BalanceSummary,
+    CounterpartyBalance,
+    CurrencyBalance,
+    HouseholdBalanceSummary,
+    SettlementTotal,
+    SettleUpResult,
+)
+from .spending import CategorySpending, HouseholdSpending, MemberSpending, SpendingPeriod
 
 __all__ = [
     "Household",
+    "HouseholdListingPage",
     "Expense",
     "ExpenseSplit",
+    "ExpenseTemplate",
     "Profile",
     "Message",
+    "MessageSearchResult",
+    "MessageSearchPage",
     "Notification",
     "Roommate",
     "Chore",
     "ChoreAssignment",
+    "LeaderboardEntry",
+    "DeletedRow",
+    "HouseholdChanges",
+    "HouseholdDashboard",
+    "ActivityItem",
+    "ActivityFeedPage",
+    "BalanceSummary",
+    "CounterpartyBalance",
+    "CurrencyBalance",
+    "HouseholdBalanceSummary",
+    "SettlementTotal",
+    "SettleUpResult",
+    "CategorySpending",
+    "HouseholdSpending",
+    "MemberSpending",
+    "SpendingPeriod",
 ]
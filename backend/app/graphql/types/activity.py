@@ -0,0 +1,45 @@
+"""Activity feed GraphQL types"""
+import strawberry
+from typing import List, Optional
+from datetime import datetime
+from .profile import Profile
+from .message import Message
+from .expense import Expense, ExpenseSplit
+from .chore import ChoreAssignment
+from app.graphql.info import Info
+
+
+@strawberry.type
+class ActivityItem:
+    """
+    One event in a household's timeline. kind says which of the optional
+    fields is set: message, expense_created (expense), payment (split and its
+    expense) or chore_completed (assignment).
+    """
+
+    kind: str
+    occurred_at: datetime
+    actor_id: Optional[strawberry.ID] = None
+    message: Optional[Message] = None
+    expense: Optional[Expense] = None
+    split: Optional[ExpenseSplit] = None
+    assignment: Optional[ChoreAssignment] = None
+
+    @strawberry.field
+    async def actor(self, info: Info) -> Optional[Profile]:
+        """Who sent, added, paid or completed it"""
+        if not self.actor_id:
+            return None
+        context = info.context
+        result = await context.dataloaders.profile_loader.load(self.actor_id)
+        if result:
+            return Profile(**result)
+        return None
+
+
+@strawberry.type
+class ActivityFeedPage:
+    """A page of a household's activity, newest first"""
+
+    items: List[ActivityItem]
+    next_cursor: Optional[str] = None  # pass back as `cursor` to get the next page
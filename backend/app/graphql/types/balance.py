@@ -0,0 +1,92 @@
+"""Balance summary GraphQL types"""
+import strawberry
+from typing import List, Optional
+from .household import Household
+from .profile import Profile
+from app.graphql.info import Info
+from app.graphql.utils.parsers import parse_datetime_fields
+
+
+@strawberry.type
+class CounterpartyBalance:
+    """What the caller and one roommate owe each other in unpaid splits"""
+
+    user_id: strawberry.ID
+    currency: str
+    owed_by_me: float
+    owed_to_me: float
+    net: float  # positive when the roommate owes the caller
+
+    @strawberry.field
+    async def profile(self, info: Info) -> Optional[Profile]:
+        context = info.context
+        result = await context.dataloaders.profile_loader.load(self.user_id)
+        if result:
+            return Profile(**result)
+        return None
+
+
+@strawberry.type
+class HouseholdBalanceSummary:
+    """The caller's outstanding balances in one household and currency"""
+
+    household_id: strawberry.ID
+    currency: str
+    owed_by_me: float
+    owed_to_me: float
+    net: float
+    counterparties: List[CounterpartyBalance]
+
+    @strawberry.field
+    async def household(self, info: Info) -> Optional[Household]:
+        context = info.context
+        result = await context.dataloaders.household_loader.load(self.household_id)
+        if result:
+            return Household(**parse_datetime_fields(result, "created_at", "updated_at"))
+        return None
+
+
+@strawberry.type
+class CurrencyBalance:
+    """The caller's outstanding balances in one currency, across households"""
+
+    currency: str
+    owed_by_me: float
+    owed_to_me: float
+    net: float
+
+
+@strawberry.type
+class BalanceSummary:
+    """Everything the caller owes and is owed"""
+
+    households: List[HouseholdBalanceSummary]
+    totals: List[CurrencyBalance]
+
+
+@strawberry.type
+class SettlementTotal:
+    """What one settle-up paid to, and received from, one roommate in one currency"""
+
+    counterparty_id: strawberry.ID
+    currency: str
+    splits: int
+    paid: float  # the caller's splits of the roommate's expenses
+    received: float  # the roommate's splits of the caller's expenses
+    net: float
+
+    @strawberry.field
+    async def counterparty(self, info: Info) -> Optional[Profile]:
+        context = info.context
+        result = await context.dataloaders.profile_loader.load(self.counterparty_id)
+        if result:
+            return Profile(**result)
+        return None
+
+
+@strawberry.type
+class SettleUpResult:
+    """The splits a settle-up marked paid, and their totals"""
+
+    split_ids: List[strawberry.ID]
+    totals: List[SettlementTotal]
@@ -1,6 +1,6 @@
 """Expense GraphQL types"""
 import strawberry
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -34,3 +34,24 @@ class ExpenseSplit:
     paid_at: Optional[datetime] = None
     payment_url: Optional[str] = None
     payment_method: Optional[str] = None
+
+
+@strawberry.type
+class ExpenseTemplate:
+    """A bill generated as an expense every month: rent or a recurring bill"""
+    
+    id: Optional[strawberry.ID] = None
+    household_id: Optional[str] = None
+    kind: Optional[str] = None  # 'rent' or 'bill'
+    title: Optional[str] = None
+    description: Optional[str] = None
+    amount: Optional[float] = None  # None for rent that follows the household's rent_amount
+    currency: Optional[str] = None
+    category: Optional[str] = None
+    paid_by: Optional[str] = None
+    split_with: Optional[List[str]] = None  # None splits it between all roommates
+    day_of_month: Optional[int] = None
+    is_active: Optional[bool] = None
+    created_by: Optional[str] = None
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
@@ -39,3 +39,11 @@ class Household:
             return []
         
         return [Roommate(**roommate) for roommate in roommates_result.data]
+
+
+@strawberry.type
+class HouseholdListingPage:
+    """A page of household listing search results"""
+    
+    results: List[Household]
+    next_cursor: Optional[str] = None  # pass back as `cursor` to get the next page
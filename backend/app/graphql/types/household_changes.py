@@ -0,0 +1,36 @@
+"""Household change-set GraphQL types, for delta sync"""
+import strawberry
+from typing import List, Optional
+from .household import Household
+from .roommate import Roommate
+from .chore import Chore, ChoreAssignment
+from .expense import Expense, ExpenseSplit
+from .message import Message
+
+
+@strawberry.type
+class DeletedRow:
+    """A row deleted from a household since the client's version"""
+
+    table: str  # roommates, chores, chore_assignments, expenses, expense_splits or messages
+    id: strawberry.ID
+
+
+@strawberry.type
+class HouseholdChanges:
+    """
+    A household's rows inserted, updated or deleted since a version, each as it
+    is now. Chore assignments reference their chore and user by id only.
+    """
+
+    version: int  # pass back as `since` for the next sync
+    has_more: bool  # sync again from `version` for the rest
+    full_resync: bool  # replace everything held for the household with these rows
+    household: Optional[Household] = None
+    roommates: List[Roommate] = strawberry.field(default_factory=list)
+    chores: List[Chore] = strawberry.field(default_factory=list)
+    chore_assignments: List[ChoreAssignment] = strawberry.field(default_factory=list)
+    expenses: List[Expense] = strawberry.field(default_factory=list)
+    expense_splits: List[ExpenseSplit] = strawberry.field(default_factory=list)
+    messages: List[Message] = strawberry.field(default_factory=list)
+    deleted: List[DeletedRow] = strawberry.field(default_factory=list)
@@ -0,0 +1,22 @@
+"""Household dashboard GraphQL types"""
+import strawberry
+from typing import List, Optional
+from .balance import CurrencyBalance
+from .household import Household
+from .roommate import Roommate
+from .chore import ChoreAssignment
+from .expense import Expense
+from .message import Message
+
+
+@strawberry.type
+class HouseholdDashboard:
+    """Everything the household home screen shows"""
+
+    household: Optional[Household]
+    members: List[Roommate]
+    my_open_assignments: List[ChoreAssignment]  # soonest due first
+    upcoming_assignments: List[ChoreAssignment]  # every member's, soonest due first
+    balances: List[CurrencyBalance]  # the caller's unpaid splits in the household, one per currency
+    recent_expenses: List[Expense]  # newest first
+    recent_messages: List[Message]  # oldest first, as in householdMessages
@@ -0,0 +1,22 @@
+"""Leaderboard GraphQL type"""
+import strawberry
+from typing import Optional
+from .profile import Profile
+from app.graphql.info import Info
+
+
+@strawberry.type
+class LeaderboardEntry:
+    """A roommate's standing in their household's points leaderboard"""
+
+    rank: int
+    user_id: strawberry.ID
+    points: int
+
+    @strawberry.field
+    async def profile(self, info: Info) -> Optional[Profile]:
+        context = info.context
+        result = await context.dataloaders.profile_loader.load(self.user_id)
+        if result:
+            return Profile(**result)
+        return None
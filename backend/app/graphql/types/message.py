@@ -1,6 +1,6 @@
 """Message GraphQL type"""
 import strawberry
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 import json
 
@@ -26,3 +26,20 @@ class Message:
             except:
                 return self.metadata
         return None
+
+
+@strawberry.type
+class MessageSearchResult:
+    """A message matching a search, with its relevance and highlighted content"""
+
+    message: Message
+    rank: float
+    highlight: str  # HTML-escaped content with matches wrapped in <mark></mark>
+
+
+@strawberry.type
+class MessageSearchPage:
+    """A page of message search results"""
+
+    results: List[MessageSearchResult]
+    next_cursor: Optional[str] = None  # pass back as `cursor` to get the next page
@@ -0,0 +1,53 @@
+"""Household spending GraphQL types"""
+import strawberry
+from datetime import date
+from typing import List, Optional
+from .profile import Profile
+from app.graphql.info import Info
+
+
+@strawberry.type
+class MemberSpending:
+    """A roommate's part of a category's spending"""
+
+    user_id: strawberry.ID
+    paid: float  # what they paid for the household's expenses
+    share: float  # the sum of their splits
+
+    @strawberry.field
+    async def profile(self, info: Info) -> Optional[Profile]:
+        context = info.context
+        result = await context.dataloaders.profile_loader.load(self.user_id)
+        if result:
+            return Profile(**result)
+        return None
+
+
+@strawberry.type
+class CategorySpending:
+    """Spending in one category in a period"""
+
+    category: str
+    total: float
+    expense_count: int
+    members: List[MemberSpending]
+
+
+@strawberry.type
+class SpendingPeriod:
+    """A household's spending in one currency in one month, quarter or year"""
+
+    period_start: date
+    currency: str
+    total: float
+    expense_count: int
+    categories: List[CategorySpending]
+
+
+@strawberry.type
+class HouseholdSpending:
+    """A household's spending between two months, per period"""
+
+    household_id: strawberry.ID
+    granularity: str
+    periods: List[SpendingPeriod]
@@ -0,0 +1,50 @@
+"""Structured concurrency helpers for issuing independent backend calls together"""
+import asyncio
+from typing import Any, Awaitable, List, Optional
+
+
+# Upper bound for a single PostgREST/RPC call issued through fan_out
+DEFAULT_CALL_TIMEOUT = 10.0
+
+
+async def _bounded(call: Awaitable[Any], timeout: Optional[float]) -> Any:
+    """Await a single call, failing with a descriptive error if it exceeds the timeout."""
+    if timeout is None:
+        return await call
+
+    try:
+        async with asyncio.timeout(timeout):
+            return await call
+    except TimeoutError:
+        raise TimeoutError(f"Backend call timed out after {timeout:g}s") from None
+
+
+async def fan_out(
+    *calls: Awaitable[Any],
+    timeout: Optional[float] = DEFAULT_CALL_TIMEOUT,
+) -> List[Any]:
+    """
+    Run independent awaitables concurrently and return their results in order.
+
+    The calls run inside a task group: each one is bounded by ``timeout`` seconds,
+    and as soon as one of them fails (or times out) the others are cancelled and
+    the first error is re-raised as-is, so resolvers keep their usual
+    ``raise Exception(...)`` behaviour and never leave requests running behind them.
+
+    Args:
+        calls: Awaitables to run, typically ``query.execute()`` coroutines
+        timeout: Per-call timeout in seconds, or None to wait indefinitely
+
+    Returns:
+        List of results, in the same order as the calls
+    """
+    if not calls:
+        return []
+
+    try:
+        async with asyncio.TaskGroup() as group:
+            tasks = [group.create_task(_bounded(call, timeout)) for call in calls]
+    except BaseExceptionGroup as errors:
+        raise errors.exceptions[0] from None
+
+    return [task.result() for task in tasks]
@@ -0,0 +1,35 @@
+"""Helpers for ownership-checked mutations written as single conditional statements"""
+from typing import NoReturn
+from supabase import AsyncClient
+
+
+async def raise_for_missed_write(
+    supabase: AsyncClient,
+    table: str,
+    row_id: str,
+    entity: str,
+    action: str,
+) -> NoReturn:
+    """
+    Explain why a conditional UPDATE/DELETE matched no rows.
+
+    Ownership-checked mutations filter the write itself on both the row id and the
+    owner column, so the happy path is one round trip with no check-then-act race.
+    Only when nothing matched do we probe for the row, to tell the two failures apart.
+
+    Args:
+        supabase: Supabase client for the current request
+        table: Table the write targeted
+        row_id: ID of the row the write targeted
+        entity: Human readable name of the row (e.g., "Expense")
+        action: What the user tried to do (e.g., "update this expense")
+
+    Raises:
+        Exception: "<entity> not found" if the row does not exist,
+            otherwise "Not authorized to <action>"
+    """
+    result = await supabase.table(table).select("id").eq("id", row_id).execute()
+
+    if not result.data:
+        raise Exception(f"{entity} not found")
+    raise Exception(f"Not authorized to {action}")
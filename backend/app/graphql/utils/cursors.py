@@ -0,0 +1,44 @@
+"""Opaque cursors for keyset pagination"""
+import base64
+import json
+from typing import Any, Dict, Optional
+
+
+def encode_cursor(values: Dict[str, Any]) -> str:
+    """
+    Encode the sort key of the last row of a page as an opaque cursor.
+
+    Args:
+        values: JSON-serializable sort key values
+
+    Returns:
+        URL-safe cursor string
+    """
+    payload = json.dumps(values, separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], *keys: str) -> Optional[Dict[str, Any]]:
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: Cursor string from the client, or None for the first page
+        keys: Keys the cursor must contain
+
+    Returns:
+        The sort key values, or None if no cursor was given
+    """
+    if not cursor:
+        return None
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise Exception("Invalid cursor")
+
+    if not isinstance(values, dict) or any(key not in values for key in keys):
+        raise Exception("Invalid cursor")
+
+    return values
@@ -203,6 +203,53 @@ def get_nested_requested_db_fields(
     return "*"
 
 
+def get_child_requested_db_fields(
+    info: Info, child_field_name: str, model_class: Type
+) -> list[str]:
+    """
+    Extract requested DB fields for an object-typed child of the current field.
+
+    Example: For a mutation like `completeChoreAssignment { id chore { title } }`,
+    this extracts the fields requested for `chore`. Unlike the helpers above it
+    returns a list, which is what RPC functions taking a projection expect.
+
+    Args:
+        info: Strawberry Info object containing the GraphQL query selection set
+        child_field_name: The child field name (e.g., "chore")
+        model_class: The model class for the child field (e.g., Chore)
+
+    Returns:
+        Sorted list of DB field names to select; all DB fields of the model if the
+        child was not found or has no DB fields selected
+    """
+    all_db_fields = get_db_fields_from_class(model_class)
+    camel_to_snake_map = {
+        **{snake_to_camel(field): field for field in all_db_fields},
+        **{field: field for field in all_db_fields},
+    }
+
+    requested_db_fields: set[str] = set()
+    for selected_field in info.selected_fields or []:
+        if not isinstance(selected_field, SelectedField):
+            continue
+
+        for selection in selected_field.selections:
+            if isinstance(selection, SelectedField) and selection.name == child_field_name:
+                for field_selection in selection.selections:
+                    if isinstance(field_selection, SelectedField):
+                        if db_field := camel_to_snake_map.get(field_selection.name):
+                            requested_db_fields.add(db_field)
+
+    if not requested_db_fields:
+        return sorted(all_db_fields)
+
+    # Always include 'id' if it exists
+    if "id" in all_db_fields:
+        requested_db_fields.add("id")
+
+    return sorted(requested_db_fields)
+
+
 def is_page_info_requested(info: Info) -> bool:
     """
     Check if the client has requested the page_info field in the GraphQL query.
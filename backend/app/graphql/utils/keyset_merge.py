@@ -0,0 +1,129 @@
+"""Lazy k-way merge of keyset-paginated, newest-first row streams"""
+import heapq
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from .concurrency import fan_out
+
+
+# Sorting below every uuid and above every uuid: a position at (ts, MIN_ID) is
+# before every row at ts, one at (ts, MAX_ID) after all of them
+MIN_ID = "00000000-0000-0000-0000-000000000000"
+MAX_ID = "ffffffff-ffff-ffff-ffff-ffffffffffff"
+
+
+@dataclass
+class Position:
+    """A point in a newest-first stream: rows come after it if (timestamp, id) is smaller"""
+
+    timestamp: str
+    id: str
+
+
+def _parse_timestamp(value: str) -> datetime:
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
+
+def apply_position(query: Any, column: str, after: Optional[Position]) -> Any:
+    """Restrict a PostgREST query to the rows after a position, in (column desc, id desc) order"""
+    query = query.not_.is_(column, "null")
+    if after is None:
+        return query
+    return query.or_(f'{column}.lt."{after.timestamp}",and({column}.eq."{after.timestamp}",id.lt.{after.id})')
+
+
+class KeysetStream:
+    """
+    One source's rows, newest first, read a chunk at a time.
+
+    ``fetch(after, size)`` returns up to ``size`` rows after the position, in
+    (timestamp desc, id desc) order. The stream's rank breaks ties between
+    streams with rows at the same timestamp.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        rank: int,
+        timestamp_column: str,
+        fetch: Callable[[Optional[Position], int], Awaitable[List[Dict[str, Any]]]],
+        after: Optional[Position] = None,
+    ):
+        self.name = name
+        self.rank = rank
+        self.timestamp_column = timestamp_column
+        self.fetch = fetch
+        self.after = after
+        self.rows: Deque[Dict[str, Any]] = deque()
+        self.exhausted = False
+
+    async def fill(self, size: int) -> None:
+        rows = await self.fetch(self.after, size)
+        self.rows.extend(rows)
+        self.exhausted = len(rows) < size
+        if rows:
+            self.after = Position(rows[-1][self.timestamp_column], rows[-1]["id"])
+
+    def key(self, row: Dict[str, Any]) -> Tuple[datetime, int, str]:
+        """Merge order of a row, largest first"""
+        return _parse_timestamp(row[self.timestamp_column]), self.rank, row["id"]
+
+    def start_after(self, timestamp: str, rank: int, row_id: str) -> None:
+        """Start after the merged row at (timestamp, rank, row_id)."""
+        if rank == self.rank:
+            self.after = Position(timestamp, row_id)
+        else:
+            # Rows at the same timestamp come first from higher-ranked streams
+            self.after = Position(timestamp, MAX_ID if self.rank < rank else MIN_ID)
+
+
+class _Newest:
+    """Heap entry ordering the largest key first"""
+
+    __slots__ = ("key", "index")
+
+    def __init__(self, key: tuple, index: int):
+        self.key = key
+        self.index = index
+
+    def __lt__(self, other: "_Newest") -> bool:
+        return self.key > other.key
+
+
+async def merge_newest_first(streams: List[KeysetStream], count: int) -> List[Tuple[KeysetStream, Dict[str, Any]]]:
+    """
+    The newest ``count`` rows across the streams, with the stream of each.
+
+    Every stream first reads an even share of ``count``, concurrently. A
+    stream is read again only when the merge has taken all its rows and still
+    needs more, and then for no more rows than are still needed, so no stream
+    reads more than ``count`` rows.
+    """
+    if not streams or count <= 0:
+        return []
+
+    share = count // len(streams) + 1
+    await fan_out(*(stream.fill(min(share, count)) for stream in streams))
+
+    heap: List[_Newest] = []
+
+    def push(index: int) -> None:
+        stream = streams[index]
+        if stream.rows:
+            heapq.heappush(heap, _Newest(stream.key(stream.rows[0]), index))
+
+    for index in range(len(streams)):
+        push(index)
+
+    merged: List[Tuple[KeysetStream, Dict[str, Any]]] = []
+    while heap and len(merged) < count:
+        index = heapq.heappop(heap).index
+        stream = streams[index]
+        merged.append((stream, stream.rows.popleft()))
+        if not stream.rows and not stream.exhausted and len(merged) < count:
+            await stream.fill(count - len(merged))
+        push(index)
+
+    return merged
@@ -0,0 +1,75 @@
+"""In-process per-key rate limiting"""
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict
+
+
+@dataclass
+class _Bucket:
+    tokens: float
+    updated_at: float
+
+
+class RateLimiter:
+    """
+    Token bucket rate limiter keyed by an arbitrary string (e.g. a user id).
+
+    Each key may make ``burst`` calls at once and then ``rate`` calls per second.
+    State lives in this process only, so with several API workers every worker
+    enforces the limit on its own share of the traffic.
+
+    Args:
+        rate: Tokens added per second
+        burst: Bucket capacity
+        max_keys: Number of keys tracked before idle buckets are dropped
+        clock: Monotonic clock, replaceable for tests
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int,
+        max_keys: int = 10_000,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.max_keys = max_keys
+        self.clock = clock
+        self._buckets: Dict[str, _Bucket] = {}
+
+    def allow(self, key: str) -> bool:
+        """Take a token for key if one is available."""
+        now = self.clock()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= self.max_keys:
+                self._prune(now)
+            bucket = self._buckets[key] = _Bucket(float(self.burst), now)
+        else:
+            bucket.tokens = min(self.burst, bucket.tokens + (now - bucket.updated_at) * self.rate)
+            bucket.updated_at = now
+
+        if bucket.tokens < 1:
+            return False
+        bucket.tokens -= 1
+        return True
+
+    def check(self, key: str) -> None:
+        """
+        Take a token for key.
+
+        Raises:
+            Exception: If the key is over its limit
+        """
+        if not self.allow(key):
+            raise Exception("Too many requests, please slow down")
+
+    def _prune(self, now: float) -> None:
+        """Drop buckets that have refilled completely; they behave like new ones."""
+        refill_time = self.burst / self.rate
+        self._buckets = {
+            key: bucket
+            for key, bucket in self._buckets.items()
+            if now - bucket.updated_at < refill_time
+        }
@@ -0,0 +1 @@
+"""Background jobs for Cohab API"""
@@ -0,0 +1,55 @@
+"""
+Household change log compaction.
+
+The change log behind the householdChanges query keeps one entry per row, so
+it only grows with the rows of deleted data: their tombstones. This job removes
+tombstones older than the retention period (database/migrations/
+household_change_log.sql). Clients that last synced before a removed tombstone
+get a full resync instead of a delta. Run it daily, e.g. from cron:
+
+    python -m app.jobs.change_log_compaction --retention-days 30
+"""
+import argparse
+import asyncio
+from datetime import timedelta
+from typing import List, Optional
+
+from supabase import AsyncClient
+
+from app.supabase.utils.client import get_supabase
+
+
+# Clients offline for longer than this resync their households from scratch
+DEFAULT_RETENTION = timedelta(days=30)
+
+
+async def compact_change_log(supabase: AsyncClient, retention: timedelta = DEFAULT_RETENTION) -> int:
+    """
+    Remove change log tombstones older than retention.
+
+    Args:
+        supabase: Service-role Supabase client
+        retention: How long deletes stay visible to delta syncs
+
+    Returns:
+        Number of tombstones removed
+    """
+    result = await supabase.rpc("compact_household_changes", {
+        "p_retention": f"{retention.days} days",
+    }).execute()
+    return result.data or 0
+
+
+async def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Remove old tombstones from the household change log")
+    parser.add_argument("--retention-days", type=int, default=DEFAULT_RETENTION.days)
+    args = parser.parse_args(argv)
+
+    supabase = await get_supabase()
+    removed = await compact_change_log(supabase, timedelta(days=args.retention_days))
+    print(f"Removed {removed} tombstones")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,291 @@
+"""
+Recurring chore scheduler.
+
+Materializes upcoming chore_assignments for every chore whose recurrence is
+'daily', 'weekly' or 'monthly', rotating assignees across each household's
+accepted roommates. Run it periodically, e.g. hourly from cron:
+
+    python -m app.jobs.chore_recurrence --horizon-days 14
+
+Due dates sit on a fixed grid anchored at the chore's creation time, and every
+generated due date is claimed in chore_recurrence_slots as it is inserted, so the
+job is idempotent and safe to re-run. Generation resumes after the latest claimed
+due date; assignments made by hand do not move it.
+"""
+import argparse
+import asyncio
+import calendar
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from supabase import AsyncClient
+
+from app.graphql.utils.concurrency import fan_out
+from app.graphql.utils.parsers import datetime_to_iso, parse_datetime_fields
+from app.supabase.utils.client import get_supabase
+
+
+RECURRENCE_INTERVALS = {
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+}
+RECURRENCES = ("daily", "weekly", "monthly")
+
+DEFAULT_HORIZON = timedelta(days=14)
+DEFAULT_PAGE_SIZE = 200
+INSERT_BATCH_SIZE = 1000
+
+# Rows read per request; PostgREST truncates larger responses to its max-rows
+READ_PAGE_SIZE = 1000
+
+
+def add_months(dt: datetime, months: int) -> datetime:
+    """Add calendar months, clamping the day to the length of the target month."""
+    month_index = dt.month - 1 + months
+    year = dt.year + month_index // 12
+    month = month_index % 12 + 1
+    day = min(dt.day, calendar.monthrange(year, month)[1])
+    return dt.replace(year=year, month=month, day=day)
+
+
+def due_dates(
+    anchor: datetime,
+    recurrence: str,
+    after: datetime,
+    until: datetime,
+) -> Iterator[datetime]:
+    """
+    Yield the due dates of a recurring chore that fall in (after, until].
+
+    Due dates are anchor + k periods, so every run computes the same grid.
+
+    Args:
+        anchor: Start of the grid (the chore's creation time)
+        recurrence: 'daily', 'weekly' or 'monthly'
+        after: Exclusive lower bound
+        until: Inclusive upper bound
+    """
+    if recurrence == "monthly":
+        k = max(0, (after.year - anchor.year) * 12 + after.month - anchor.month - 1)
+        while (due := add_months(anchor, k)) <= until:
+            if due > after:
+                yield due
+            k += 1
+        return
+
+    interval = RECURRENCE_INTERVALS[recurrence]
+    k = max(0, (after - anchor) // interval + 1)
+    while (due := anchor + k * interval) <= until:
+        yield due
+        k += 1
+
+
+@dataclass
+class HouseholdRotation:
+    """
+    Assignee rotation for one household.
+
+    Each roommate's load starts at the points they have accumulated plus the points
+    of their open assignments; the next chore goes to the least loaded roommate,
+    and its points are added to their load.
+    """
+
+    load: Dict[str, int]
+    last_assigned: Dict[str, int] = field(default_factory=dict)
+    sequence: int = 0
+
+    def next_assignee(self, points: int) -> str:
+        """Pick the roommate for the next assignment and account for its points."""
+        user_id = min(
+            self.load,
+            key=lambda user: (self.load[user], self.last_assigned.get(user, -1), user),
+        )
+        self.load[user_id] += points
+        self.last_assigned[user_id] = self.sequence
+        self.sequence += 1
+        return user_id
+
+
+@dataclass
+class RecurrenceRunStats:
+    """Summary of a scheduler run"""
+
+    chores_scanned: int = 0
+    households_scanned: int = 0
+    assignments_planned: int = 0
+    insert_batches: int = 0
+
+
+async def _fetch_all(request: Callable[[], Any]) -> List[Dict[str, Any]]:
+    """Read every row of an ordered request, READ_PAGE_SIZE rows at a time."""
+    rows: List[Dict[str, Any]] = []
+    while True:
+        page = await request().range(len(rows), len(rows) + READ_PAGE_SIZE - 1).execute()
+        rows.extend(page.data)
+        if len(page.data) < READ_PAGE_SIZE:
+            return rows
+
+
+async def _load_rotations(
+    supabase: AsyncClient,
+    household_ids: List[str],
+) -> Dict[str, HouseholdRotation]:
+    """Build the rotation state for households seen for the first time in this run."""
+    # Each roommate's points plus their open assignments' points, summed in the
+    # database: one row per roommate whatever the number of open assignments
+    loads_rows = await _fetch_all(
+        lambda: supabase.rpc("household_rotation_loads", {"p_household_ids": household_ids})
+    )
+
+    loads: Dict[str, Dict[str, int]] = {}
+    for row in loads_rows:
+        loads.setdefault(row["household_id"], {})[row["user_id"]] = row["load"] or 0
+
+    return {household_id: HouseholdRotation(load) for household_id, load in loads.items() if load}
+
+
+async def _plan_page(
+    supabase: AsyncClient,
+    chores: List[Dict[str, Any]],
+    rotations: Dict[str, HouseholdRotation],
+    now: datetime,
+    until: datetime,
+) -> List[Dict[str, Any]]:
+    """Plan the assignment rows for one page of recurring chores."""
+    new_households = sorted({chore["household_id"] for chore in chores} - rotations.keys())
+    chore_ids = [chore["id"] for chore in chores]
+
+    # One row per chore: its latest generated due date
+    latest_query = _fetch_all(
+        lambda: supabase.rpc("recurring_chore_latest_due", {"p_chore_ids": chore_ids})
+    )
+
+    if new_households:
+        latest_rows, new_rotations = await fan_out(
+            latest_query,
+            _load_rotations(supabase, new_households),
+        )
+        rotations.update(new_rotations)
+    else:
+        latest_rows = await latest_query
+
+    latest_due: Dict[str, datetime] = {
+        row["chore_id"]: parse_datetime_fields(row, "due_date")["due_date"]
+        for row in latest_rows
+    }
+
+    rows: List[Dict[str, Any]] = []
+    for chore in chores:
+        rotation = rotations.get(chore["household_id"])
+        if not rotation:
+            # Nobody to assign it to
+            continue
+
+        anchor = parse_datetime_fields(chore, "created_at")["created_at"]
+        after = max(now, latest_due.get(chore["id"], now))
+        points = chore.get("points") or 0
+
+        for due in due_dates(anchor, chore["recurrence"], after, until):
+            rows.append({
+                "chore_id": chore["id"],
+                "user_id": rotation.next_assignee(points),
+                "due_date": datetime_to_iso(due),
+            })
+
+    return rows
+
+
+async def materialize_recurring_chores(
+    supabase: AsyncClient,
+    now: Optional[datetime] = None,
+    horizon: timedelta = DEFAULT_HORIZON,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> RecurrenceRunStats:
+    """
+    Create the assignments of all recurring chores that fall due within the horizon.
+
+    Chores are read in (household_id, id) keyset pages, so memory stays bounded by
+    the page size and only the household spanning a page boundary carries its
+    rotation state over. Each page costs a fixed number of round trips: one read of
+    the page, one fan-out for history and roommates, and one bulk insert per
+    INSERT_BATCH_SIZE rows.
+
+    Args:
+        supabase: Service-role Supabase client
+        now: Current time (defaults to the current UTC time)
+        horizon: How far ahead to materialize assignments
+        page_size: Number of chores read per page
+
+    Returns:
+        RecurrenceRunStats describing the run
+    """
+    now = now or datetime.now(timezone.utc)
+    until = now + horizon
+    stats = RecurrenceRunStats()
+    rotations: Dict[str, HouseholdRotation] = {}
+    cursor: Optional[tuple[str, str]] = None
+
+    while True:
+        query = supabase.table("chores") \
+            .select("id,household_id,recurrence,points,created_at") \
+            .in_("recurrence", list(RECURRENCES))
+
+        if cursor:
+            household_id, chore_id = cursor
+            query = query.or_(
+                f"household_id.gt.{household_id},and(household_id.eq.{household_id},id.gt.{chore_id})"
+            )
+
+        page = await query.order("household_id").order("id").limit(page_size).execute()
+        chores = page.data
+        if not chores:
+            break
+
+        # Pages are ordered by household, so only the household at the page
+        # boundary can reappear; drop the state of every other one
+        rotations = {
+            household_id: rotation
+            for household_id, rotation in rotations.items()
+            if household_id == chores[0]["household_id"]
+        }
+        stats.households_scanned += len({chore["household_id"] for chore in chores} - rotations.keys())
+        stats.chores_scanned += len(chores)
+
+        rows = await _plan_page(supabase, chores, rotations, now, until)
+
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            await supabase.rpc("materialize_chore_assignments", {
+                "p_assignments": rows[start:start + INSERT_BATCH_SIZE],
+            }).execute()
+            stats.insert_batches += 1
+        stats.assignments_planned += len(rows)
+
+        if len(chores) < page_size:
+            break
+        cursor = (chores[-1]["household_id"], chores[-1]["id"])
+
+    return stats
+
+
+async def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Materialize upcoming assignments for recurring chores")
+    parser.add_argument("--horizon-days", type=int, default=DEFAULT_HORIZON.days)
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    args = parser.parse_args(argv)
+
+    supabase = await get_supabase()
+    stats = await materialize_recurring_chores(
+        supabase,
+        horizon=timedelta(days=args.horizon_days),
+        page_size=args.page_size,
+    )
+    print(
+        f"Scanned {stats.chores_scanned} chores in {stats.households_scanned} households, "
+        f"planned {stats.assignments_planned} assignments in {stats.insert_batches} batches"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
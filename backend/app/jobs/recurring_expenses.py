@@ -0,0 +1,109 @@
+"""
+Recurring expense generator.
+
+Creates the month's expense, and its splits, for every active expense template:
+each household's rent, at its current rent_amount, and its recurring bills
+(database/migrations/recurring_expenses.sql). Run it daily, e.g. from cron:
+
+    python -m app.jobs.recurring_expenses
+
+Templates are read in id pages and each page is generated by one database call
+with a bulk insert of the expenses and one of the splits. A template's month is
+claimed in generated_expenses in the same transaction, so the job is idempotent
+and safe to re-run, or to run for a past month with --period.
+"""
+import argparse
+import asyncio
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from typing import List, Optional
+
+from supabase import AsyncClient
+
+from app.supabase.utils.client import get_supabase
+
+
+DEFAULT_PAGE_SIZE = 500
+
+
+def period_start(at: datetime) -> date:
+    """First day of the month containing at (UTC)."""
+    return at.astimezone(timezone.utc).date().replace(day=1)
+
+
+@dataclass
+class RecurringExpenseRunStats:
+    """Summary of a generator run"""
+
+    templates_scanned: int = 0
+    expenses_created: int = 0
+    splits_created: int = 0
+    pages: int = 0
+
+
+async def generate_recurring_expenses(
+    supabase: AsyncClient,
+    period: Optional[date] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> RecurringExpenseRunStats:
+    """
+    Generate one month's expenses for all active templates.
+
+    Args:
+        supabase: Service-role Supabase client
+        period: First day of the month to generate (defaults to the current month)
+        page_size: Number of templates generated per database call
+
+    Returns:
+        RecurringExpenseRunStats describing the run
+    """
+    period = period or period_start(datetime.now(timezone.utc))
+    stats = RecurringExpenseRunStats()
+    cursor: Optional[str] = None
+
+    while True:
+        query = supabase.table("expense_templates").select("id").eq("is_active", True)
+        if cursor:
+            query = query.gt("id", cursor)
+
+        page = await query.order("id").limit(page_size).execute()
+        template_ids = [template["id"] for template in page.data]
+        if not template_ids:
+            break
+
+        result = await supabase.rpc("generate_recurring_expenses", {
+            "p_period_start": period.isoformat(),
+            "p_template_ids": template_ids,
+        }).execute()
+
+        stats.pages += 1
+        stats.templates_scanned += len(template_ids)
+        stats.expenses_created += result.data["expenses"]
+        stats.splits_created += result.data["splits"]
+
+        if len(template_ids) < page_size:
+            break
+        cursor = template_ids[-1]
+
+    return stats
+
+
+async def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Generate the month's rent and recurring bills")
+    parser.add_argument("--period", help="Month to generate, as YYYY-MM (defaults to the current month)")
+    parser.add_argument("--page-size", type=int, default=DEFAULT_PAGE_SIZE)
+    args = parser.parse_args(argv)
+
+    period = datetime.strptime(args.period, "%Y-%m").date() if args.period else None
+
+    supabase = await get_supabase()
+    stats = await generate_recurring_expenses(supabase, period=period, page_size=args.page_size)
+    print(
+        f"Scanned {stats.templates_scanned} templates in {stats.pages} pages, "
+        f"created {stats.expenses_created} expenses with {stats.splits_created} splits"
+    )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,372 @@
+"""
+Due-date reminder scheduler.
+
+Sends a notification to roommates shortly before a chore assignment or an unpaid
+expense split falls due. Run it as a single long-lived process:
+
+    python -m app.jobs.reminders
+
+Reminders are loaded incrementally: only those firing within the next ``window``
+are read (with keyset-paginated, index-backed due-date range queries) and held in
+a timing wheel, so memory is bounded by the reminders due in that window rather
+than by everything pending in the database. Progress is persisted as a per-source
+watermark in job_watermarks, and notification ids are derived from a per-reminder
+key, so a restart resumes where the previous process stopped without sending
+duplicates. Reminders that fired more than ``grace`` ago, e.g. while the process
+was down, are dropped rather than sent late.
+
+Assignments or expenses created with a due date that is already inside the lead
+time are not reminded about; their fire time has passed before they existed.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from postgrest.types import ReturnMethod
+from supabase import AsyncClient
+
+from app.graphql.utils.parsers import datetime_to_iso, parse_datetime_fields
+from app.jobs.timing_wheel import TimingWheel
+from app.observability import configure_logging
+from app.supabase.utils.client import get_supabase
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = timedelta(minutes=10)
+DEFAULT_TICK = timedelta(seconds=1)
+DEFAULT_GRACE = timedelta(minutes=10)
+DEFAULT_PAGE_SIZE = 500
+DEFAULT_MAX_PENDING = 100_000
+INSERT_BATCH_SIZE = 1000
+
+# Range queries are issued in chunks of this width, so loading can stop early
+# once max_pending reminders are held in memory
+LOAD_CHUNK = timedelta(minutes=1)
+
+# Reminder notifications get ids derived from their dedupe key, so re-sending a
+# reminder after a crash conflicts on the primary key instead of duplicating it
+REMINDER_NAMESPACE = uuid.UUID("5b0f6c1e-2f43-4a55-9d6e-7f1c3b2a9e10")
+
+
+@dataclass
+class Reminder:
+    """A notification to send at fire_at"""
+
+    fire_at: datetime
+    user_id: str
+    title: str
+    message: str
+    type: str
+    dedupe_key: str
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def to_notification(self) -> Dict[str, Any]:
+        """Row for the notifications table"""
+        return {
+            "id": str(uuid.uuid5(REMINDER_NAMESPACE, self.dedupe_key)),
+            "user_id": self.user_id,
+            "title": self.title,
+            "message": self.message,
+            "type": self.type,
+            "metadata": json.dumps(self.metadata),
+        }
+
+
+class ReminderSource(ABC):
+    """A table whose rows produce reminders some lead time before their due date"""
+
+    name: str
+    lead: timedelta
+
+    @abstractmethod
+    def load(
+        self,
+        supabase: AsyncClient,
+        due_after: datetime,
+        due_until: datetime,
+        page_size: int,
+    ) -> AsyncIterator[List[Reminder]]:
+        """Yield pages of reminders for rows due in (due_after, due_until]."""
+
+
+def _keyset_after(column: str, cursor: Optional[Dict[str, Any]]) -> Optional[str]:
+    """PostgREST `or` filter selecting rows after the cursor in (column, id) order."""
+    if not cursor:
+        return None
+    value = cursor[column]
+    return f"{column}.gt.{value},and({column}.eq.{value},id.gt.{cursor['id']})"
+
+
+class ChoreReminderSource(ReminderSource):
+    """Reminds the assignee of an open chore assignment"""
+
+    name = "chore_reminders"
+
+    def __init__(self, lead: timedelta = timedelta(hours=1)):
+        self.lead = lead
+
+    async def load(self, supabase, due_after, due_until, page_size):
+        cursor = None
+        while True:
+            query = supabase.table("chore_assignments") \
+                .select("id,user_id,due_date,chores:chore_id(title,household_id)") \
+                .eq("is_complete", False) \
+                .gt("due_date", datetime_to_iso(due_after)) \
+                .lte("due_date", datetime_to_iso(due_until))
+            if keyset := _keyset_after("due_date", cursor):
+                query = query.or_(keyset)
+
+            result = await query.order("due_date").order("id").limit(page_size).execute()
+            if not result.data:
+                return
+
+            reminders = []
+            for assignment in result.data:
+                chore = assignment.get("chores") or {}
+                due = parse_datetime_fields(assignment, "due_date")["due_date"]
+                reminders.append(Reminder(
+                    fire_at=due - self.lead,
+                    user_id=assignment["user_id"],
+                    title="Chore due soon",
+                    message=f"{chore.get('title', 'A chore')} is due at {due:%H:%M} UTC",
+                    type="chore",
+                    dedupe_key=f"chore_reminder:{assignment['id']}:{assignment['due_date']}",
+                    metadata={
+                        "assignment_id": assignment["id"],
+                        "household_id": chore.get("household_id"),
+                    },
+                ))
+            yield reminders
+
+            if len(result.data) < page_size:
+                return
+            cursor = result.data[-1]
+
+
+class ExpenseReminderSource(ReminderSource):
+    """Reminds every roommate with an unpaid split of an expense"""
+
+    name = "expense_reminders"
+
+    def __init__(self, lead: timedelta = timedelta(days=1)):
+        self.lead = lead
+
+    async def load(self, supabase, due_after, due_until, page_size):
+        cursor = None
+        while True:
+            query = supabase.table("expenses") \
+                .select("id,title,amount,currency,household_id,due_date,expense_splits(id,user_id,amount)") \
+                .eq("expense_splits.is_paid", False) \
+                .gt("due_date", datetime_to_iso(due_after)) \
+                .lte("due_date", datetime_to_iso(due_until))
+            if keyset := _keyset_after("due_date", cursor):
+                query = query.or_(keyset)
+
+            result = await query.order("due_date").order("id").limit(page_size).execute()
+            if not result.data:
+                return
+
+            reminders = []
+            for expense in result.data:
+                due = parse_datetime_fields(expense, "due_date")["due_date"]
+                for split in expense.get("expense_splits") or []:
+                    reminders.append(Reminder(
+                        fire_at=due - self.lead,
+                        user_id=split["user_id"],
+                        title="Payment due soon",
+                        message=f"You owe {float(split['amount']):.2f} {expense.get('currency') or 'USD'} for {expense['title']}",
+                        type="expense",
+                        dedupe_key=f"expense_reminder:{split['id']}:{expense['due_date']}",
+                        metadata={
+                            "expense_id": expense["id"],
+                            "expense_split_id": split["id"],
+                            "household_id": expense.get("household_id"),
+                        },
+                    ))
+            yield reminders
+
+            if len(result.data) < page_size:
+                return
+            cursor = result.data[-1]
+
+
+@dataclass
+class _SourceState:
+    """Progress of one source, in fire time"""
+
+    source: ReminderSource
+    watermark: datetime      # every reminder firing at or before this has been sent
+    loaded_until: datetime   # every reminder firing at or before this is in the wheel
+
+
+class ReminderScheduler:
+    """
+    Loads reminders ahead of time into a timing wheel and sends them when they fire.
+
+    Args:
+        supabase: Service-role Supabase client
+        sources: Reminder sources to schedule
+        window: How far ahead of now reminders are loaded
+        tick: Resolution of the timing wheel
+        page_size: Rows per range query page
+        max_pending: Stop loading ahead once this many reminders are held
+        grace: How late a reminder may still be sent; older ones are dropped
+    """
+
+    def __init__(
+        self,
+        supabase: AsyncClient,
+        sources: List[ReminderSource],
+        window: timedelta = DEFAULT_WINDOW,
+        tick: timedelta = DEFAULT_TICK,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        max_pending: int = DEFAULT_MAX_PENDING,
+        grace: timedelta = DEFAULT_GRACE,
+    ):
+        self.supabase = supabase
+        self.sources = sources
+        self.window = window
+        self.tick = tick
+        self.page_size = page_size
+        self.max_pending = max_pending
+        self.grace = grace
+        self.wheel: Optional[TimingWheel] = None
+        self.states: List[_SourceState] = []
+
+    async def start(self, now: datetime) -> None:
+        """
+        Resume every source from its persisted watermark (or from now).
+
+        Watermarks older than the grace period are moved up to it, so a process
+        restarted after a long outage neither replays the reminders it missed nor
+        sizes its wheel by the length of the outage.
+        """
+        names = [source.name for source in self.sources]
+        result = await self.supabase.table("job_watermarks") \
+            .select("job_name,watermark") \
+            .in_("job_name", names) \
+            .execute()
+        watermarks = {
+            row["job_name"]: parse_datetime_fields(row, "watermark")["watermark"]
+            for row in result.data
+        }
+
+        oldest = now - self.grace
+        self.states = []
+        for source in self.sources:
+            watermark = watermarks.get(source.name, now)
+            if watermark < oldest:
+                logger.warning("Skipping %s reminders due before %s", source.name, datetime_to_iso(oldest))
+                watermark = oldest
+            self.states.append(_SourceState(source, watermark, watermark))
+
+        # Reminders loaded from before now expire on the first advance()
+        slots = int((self.window + LOAD_CHUNK) / self.tick) + 1
+        self.wheel = TimingWheel(self.tick, slots, now)
+
+    async def _load_ahead(self, now: datetime) -> None:
+        """Fill the wheel with reminders firing up to now + window."""
+        # The wheel has not moved since the last run; after a stall now + window
+        # can be past what it holds, and the rest is loaded once it catches up
+        horizon = min(now + self.window, self.wheel.limit)
+        for state in self.states:
+            while state.loaded_until < horizon and len(self.wheel) < self.max_pending:
+                until = min(state.loaded_until + LOAD_CHUNK, horizon)
+                lead = state.source.lead
+                async for reminders in state.source.load(
+                    self.supabase, state.loaded_until + lead, until + lead, self.page_size
+                ):
+                    for reminder in reminders:
+                        self.wheel.schedule(reminder.fire_at, reminder)
+                state.loaded_until = until
+
+    async def _send(self, reminders: List[Reminder]) -> None:
+        """Insert notifications in bulk; reminders already sent are skipped by id."""
+        rows = [reminder.to_notification() for reminder in reminders]
+        for start in range(0, len(rows), INSERT_BATCH_SIZE):
+            await self.supabase.table("notifications").upsert(
+                rows[start:start + INSERT_BATCH_SIZE],
+                on_conflict="id",
+                ignore_duplicates=True,
+                returning=ReturnMethod.minimal,
+            ).execute()
+
+    async def _save_watermarks(self, now: datetime) -> None:
+        rows = []
+        for state in self.states:
+            state.watermark = max(state.watermark, min(now, state.loaded_until))
+            rows.append({
+                "job_name": state.source.name,
+                "watermark": datetime_to_iso(state.watermark),
+                "updated_at": datetime_to_iso(now),
+            })
+        await self.supabase.table("job_watermarks").upsert(
+            rows, on_conflict="job_name", returning=ReturnMethod.minimal
+        ).execute()
+
+    async def run_once(self, now: Optional[datetime] = None) -> int:
+        """
+        Load ahead, send every reminder that has fired and advance the watermarks.
+
+        Returns:
+            Number of reminders sent
+        """
+        now = now or datetime.now(timezone.utc)
+        if self.wheel is None:
+            await self.start(now)
+
+        await self._load_ahead(now)
+        oldest = now - self.grace
+        fired = [reminder for reminder in self.wheel.advance(now) if reminder.fire_at >= oldest]
+        if fired:
+            await self._send(fired)
+            logger.info("Sent %d reminders", len(fired))
+        await self._save_watermarks(now)
+        return len(fired)
+
+    async def run_forever(self, poll_interval: float = 1.0) -> None:
+        """
+        Run until cancelled.
+
+        A failed run is logged and the scheduler restarts from the persisted
+        watermarks, so reminders it had loaded or fired but not sent are loaded
+        again (sending is idempotent).
+        """
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Reminder run failed")
+                self.wheel = None
+            await asyncio.sleep(poll_interval)
+
+
+async def main(argv: Optional[List[str]] = None) -> None:
+    """Command line entry point"""
+    parser = argparse.ArgumentParser(description="Send reminders before chores and expenses fall due")
+    parser.add_argument("--chore-lead-minutes", type=int, default=60)
+    parser.add_argument("--expense-lead-hours", type=int, default=24)
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    supabase = await get_supabase()
+    scheduler = ReminderScheduler(
+        supabase,
+        [
+            ChoreReminderSource(lead=timedelta(minutes=args.chore_lead_minutes)),
+            ExpenseReminderSource(lead=timedelta(hours=args.expense_lead_hours)),
+        ],
+    )
+    await scheduler.run_forever(poll_interval=args.poll_interval)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
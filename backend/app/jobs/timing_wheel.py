@@ -0,0 +1,77 @@
+"""Hashed timing wheel for scheduling large numbers of timers"""
+from datetime import datetime, timedelta, timezone
+from typing import Any, List, Tuple
+
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+class TimingWheel:
+    """
+    Single-level hashed timing wheel.
+
+    Timers are hashed into ``slots`` buckets of ``tick`` width, so scheduling is O(1)
+    and expiring costs one bucket per elapsed tick, independent of how many timers are
+    pending. Timers must fall within one revolution of the wheel (``tick * slots``)
+    from its current position; callers are expected to load timers incrementally
+    as time advances rather than all at once.
+    """
+
+    def __init__(self, tick: timedelta, slots: int, start: datetime):
+        self.tick = tick
+        self.slots: List[List[Tuple[int, Any]]] = [[] for _ in range(slots)]
+        self.cursor = self._tick_index(start)
+        self.size = 0
+
+    @property
+    def span(self) -> timedelta:
+        """How far ahead of the current position timers can be scheduled"""
+        return self.tick * len(self.slots)
+
+    @property
+    def limit(self) -> datetime:
+        """Latest moment a timer can be scheduled for from the current position"""
+        return EPOCH + (self.cursor + len(self.slots) - 1) * self.tick
+
+    def _tick_index(self, moment: datetime) -> int:
+        return (moment - EPOCH) // self.tick
+
+    def schedule(self, fire_at: datetime, item: Any) -> None:
+        """
+        Schedule an item to expire at ``fire_at``.
+
+        Items scheduled in the past expire on the next call to advance().
+
+        Raises:
+            ValueError: If fire_at is beyond the span of the wheel
+        """
+        index = max(self._tick_index(fire_at), self.cursor)
+        if index - self.cursor >= len(self.slots):
+            raise ValueError(f"Cannot schedule more than {self.span} ahead")
+
+        self.slots[index % len(self.slots)].append((index, item))
+        self.size += 1
+
+    def advance(self, now: datetime) -> List[Any]:
+        """
+        Move the wheel to ``now`` and return the items that expired, in tick order.
+        """
+        target = self._tick_index(now)
+        expired: List[Any] = []
+
+        # Never walk more than one revolution: after that every slot has been visited
+        last = min(target, self.cursor + len(self.slots) - 1)
+        while self.cursor <= last:
+            slot_index = self.cursor % len(self.slots)
+            slot = self.slots[slot_index]
+            if slot:
+                expired.extend(item for index, item in slot if index <= target)
+                self.slots[slot_index] = [(index, item) for index, item in slot if index > target]
+            self.cursor += 1
+
+        self.cursor = max(self.cursor, target + 1)
+        self.size -= len(expired)
+        return expired
+
+    def __len__(self) -> int:
+        return self.size
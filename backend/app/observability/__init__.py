@@ -0,0 +1,37 @@
+"""Metrics, tracing, logging and instrumentation for Cohab API"""
+from .capture import (
+    CapturedRequest,
+    CaptureWriter,
+    TrafficCaptureMiddleware,
+    create_capture_writer,
+    read_capture,
+)
+from .config import ObservabilityConfig, observability_config
+from .histogram import LatencyHistogram
+from .metrics import HistogramFamily, MetricsRegistry, metrics_registry, sampled_operation
+from .logs import configure_logging, request_id, shutdown_logging
+from .middleware import RequestIdMiddleware, TracingMiddleware
+from .tracing import Tracer, create_tracer, tracer
+
+__all__ = [
+    "CapturedRequest",
+    "CaptureWriter",
+    "TrafficCaptureMiddleware",
+    "create_capture_writer",
+    "read_capture",
+    "ObservabilityConfig",
+    "observability_config",
+    "LatencyHistogram",
+    "HistogramFamily",
+    "MetricsRegistry",
+    "metrics_registry",
+    "sampled_operation",
+    "configure_logging",
+    "request_id",
+    "shutdown_logging",
+    "RequestIdMiddleware",
+    "TracingMiddleware",
+    "Tracer",
+    "create_tracer",
+    "tracer",
+]
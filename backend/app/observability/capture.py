@@ -0,0 +1,264 @@
+"""
+Capture of GraphQL traffic for replay.
+
+TrafficCaptureMiddleware records each sampled POST to /graphql as one JSON line
+in an append-only file: when it arrived, the operation name, a hash of the
+document, the shape of its variables, a pseudonym for the caller, the status
+code and how long it took. The document itself is written once per process,
+the first time its hash is seen. Nothing that identifies a user or their data is
+kept:
+
+- string literals in documents are blanked
+- string and float variables are reduced to their type; ints, booleans and
+  list lengths are kept, as they decide how much work a request does
+- callers are an HMAC of the token's `sub` claim with a per-process key
+
+Request bodies are handed to a background thread, which parses and writes
+them, so capturing adds little to a request; past ``queue_size`` waiting
+requests, new ones are dropped.
+
+    python -m benchmarks.replay capture.jsonl --speed 10
+
+re-issues a capture against the app; see benchmarks/replay.py.
+"""
+import hashlib
+import hmac
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from graphql import GraphQLError, OperationDefinitionNode, StringValueNode, Visitor, parse, print_ast, visit
+from graphql.utilities import strip_ignored_characters
+from jose import jwt, JWTError
+
+from .config import ObservabilityConfig, observability_config
+from .middleware import Receive, Scope, Send
+
+
+logger = logging.getLogger(__name__)
+
+
+class _BlankStrings(Visitor):
+    def enter_string_value(self, node, *_):
+        return StringValueNode(value="")
+
+
+@lru_cache(maxsize=256)
+def anonymize_document(document: str) -> Optional[Tuple[str, str, Optional[str]]]:
+    """
+    The document with string literals blanked and whitespace stripped, a hash of
+    the result, and the name of its first operation.
+
+    Returns None for documents that don't parse.
+    """
+    try:
+        parsed = visit(parse(document, no_location=True), _BlankStrings())
+    except GraphQLError:
+        return None
+    anonymized = strip_ignored_characters(print_ast(parsed))
+    operation = next(
+        (definition.name.value for definition in parsed.definitions
+         if isinstance(definition, OperationDefinitionNode) and definition.name),
+        None,
+    )
+    return anonymized, hashlib.sha256(anonymized.encode()).hexdigest()[:16], operation
+
+
+def variables_shape(value: Any) -> Any:
+    """Variables with strings and floats replaced by their type name"""
+    if isinstance(value, dict):
+        return {key: variables_shape(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [variables_shape(item) for item in value]
+    if isinstance(value, str):
+        return "str"
+    if isinstance(value, float):
+        return "float"
+    return value  # int, bool or None
+
+
+@dataclass
+class CapturedRequest:
+    """One request read back from a capture file"""
+
+    ts: float  # unix time it arrived
+    operation: Optional[str]
+    document: str
+    document_hash: str
+    variables: Any  # shape, see variables_shape
+    user: Optional[str]  # pseudonym; None for unauthenticated requests
+    duration_ms: float
+    status: int
+
+
+def read_capture(path: str) -> Iterator[CapturedRequest]:
+    """Requests in a capture file, in the order they were recorded"""
+    documents: Dict[str, str] = {}
+    with open(path, encoding="utf-8") as capture:
+        for line in capture:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if "document" in record:
+                documents.setdefault(record["doc"], record["document"])
+                continue
+            document = documents.get(record["doc"])
+            if document is None:
+                continue  # its document record was lost, e.g. to a truncated file
+            yield CapturedRequest(
+                ts=record["ts"],
+                operation=record.get("op"),
+                document=document,
+                document_hash=record["doc"],
+                variables=record.get("vars") or {},
+                user=record.get("user"),
+                duration_ms=record["ms"],
+                status=record["status"],
+            )
+
+
+class CaptureWriter:
+    """Appends capture records to a file from a background thread"""
+
+    _STOP = object()
+
+    def __init__(self, path: str, queue_size: int = 10_000):
+        self.path = path
+        self.dropped = 0
+        self._key = os.urandom(16)
+        self._documents: set = set()
+        self._queue: queue.Queue = queue.Queue(queue_size)
+        self._thread = threading.Thread(target=self._run, name="traffic-capture", daemon=True)
+        self._thread.start()
+
+    def pseudonym(self, subject: str) -> str:
+        return hmac.new(self._key, subject.encode(), hashlib.sha256).hexdigest()[:16]
+
+    def record(self, body: bytes, user: Optional[str], started: float, duration: float, status: int) -> None:
+        """Queue one request for writing; it is parsed and anonymized on the writer thread."""
+        try:
+            self._queue.put_nowait((body, user, started, duration, status))
+        except queue.Full:
+            self.dropped += 1
+
+    def _lines(self, body: bytes, user: Optional[str], started: float, duration: float, status: int) -> List[Dict[str, Any]]:
+        """Records for one request body; bodies that aren't a GraphQL request give none."""
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            return []
+        if not isinstance(payload, dict) or not isinstance(payload.get("query"), str):
+            return []
+        anonymized = anonymize_document(payload["query"])
+        if anonymized is None:
+            return []
+
+        document, document_hash, operation = anonymized
+        lines = []
+        if document_hash not in self._documents:
+            self._documents.add(document_hash)
+            lines.append({"doc": document_hash, "document": document})
+        lines.append({
+            "ts": round(started, 3),
+            "op": payload.get("operationName") or operation,
+            "doc": document_hash,
+            "vars": variables_shape(payload.get("variables") or {}),
+            "user": self.pseudonym(user) if user else None,
+            "ms": round(duration * 1000, 3),
+            "status": status,
+        })
+        return lines
+
+    def _run(self) -> None:
+        with open(self.path, "a", encoding="utf-8") as capture:
+            while True:
+                batch = [self._queue.get()]
+                while not self._queue.empty() and len(batch) < 1000:
+                    batch.append(self._queue.get_nowait())
+                for request in batch:
+                    if request is self._STOP:
+                        capture.flush()
+                        return
+                    for line in self._lines(*request):
+                        capture.write(json.dumps(line, separators=(",", ":")) + "\n")
+                capture.flush()
+
+    def close(self) -> None:
+        """Write out queued records and stop the writer thread."""
+        self._queue.put(self._STOP)
+        self._thread.join()
+        if self.dropped:
+            logger.warning("Traffic capture dropped %d records", self.dropped)
+
+
+class TrafficCaptureMiddleware:
+    """
+    Records a sample of the GraphQL requests under `path` through a CaptureWriter.
+
+    Only POST requests are captured; the request body is passed through to the
+    app unchanged.
+    """
+
+    def __init__(self, app: Callable, writer: CaptureWriter, path: str = "/graphql", sample_rate: float = 1.0):
+        self.app = app
+        self.writer = writer
+        self.path = path
+        self.sample_rate = sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] != "POST"
+            or scope["path"].rstrip("/") != self.path
+            or random.random() >= self.sample_rate
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        body = []
+        status = 500
+
+        async def receive_wrapper() -> Dict[str, Any]:
+            message = await receive()
+            if message["type"] == "http.request":
+                body.append(message.get("body", b""))
+            return message
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        started, clock = time.time(), time.perf_counter()
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        finally:
+            duration = time.perf_counter() - clock
+            self.writer.record(b"".join(body), self._subject(scope), started, duration, status)
+
+    @staticmethod
+    def _subject(scope: Scope) -> Optional[str]:
+        auth_header = dict(scope.get("headers") or []).get(b"authorization", b"").decode("latin-1")
+        if not auth_header.startswith("Bearer "):
+            return None
+        try:
+            # Only used to tell callers apart; the app verifies the token itself
+            return jwt.get_unverified_claims(auth_header[len("Bearer "):]).get("sub")
+        except JWTError:
+            return None
+
+
+def create_capture_writer(config: ObservabilityConfig = observability_config) -> Optional[CaptureWriter]:
+    """A writer for TRAFFIC_CAPTURE_PATH, or None when capture is off"""
+    if not config.traffic_capture_path:
+        return None
+    return CaptureWriter(config.traffic_capture_path, config.traffic_capture_queue_size)
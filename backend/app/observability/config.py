@@ -0,0 +1,109 @@
+import os
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+
+@dataclass
+class ObservabilityConfig:
+    """Configuration for metrics, tracing, logging and Supabase call accounting."""
+
+    # Fraction of GraphQL operations whose resolvers and Supabase calls are timed.
+    # Operation latency is always recorded; 0 turns the detailed timing off entirely.
+    metrics_sample_rate: float = 0.0
+
+    # Record every Supabase call per request, warn about probable N+1 patterns and
+    # report the calls in the response's `extensions`. Meant for development.
+    call_accounting: bool = False
+
+    # Fail any operation that makes more Supabase calls than this
+    call_budget: Optional[int] = None
+
+    # Repetitions of one call shape within a request that count as an N+1
+    n_plus_one_threshold: int = 3
+
+    # Where finished trace spans go: 'none', 'memory' (kept in process, for tests)
+    # or 'otlp' (batched to an OpenTelemetry collector over OTLP/HTTP); either
+    # needs the OpenTelemetry SDK, from the backend's 'tracing' extra
+    tracing_exporter: str = "none"
+    otlp_traces_endpoint: str = "http://localhost:4318/v1/traces"
+    service_name: str = "cohab-api"
+
+    # Fraction of new traces recorded; requests arriving with a traceparent
+    # header keep the caller's sampling decision
+    trace_sample_rate: float = 1.0
+
+    log_level: str = "INFO"
+    log_format: str = "json"  # 'json' or 'text'
+
+    # Fraction of records below WARNING kept per logger name prefix,
+    # e.g. {"app.graphql.routes": 0.1}
+    log_sample_rates: Dict[str, float] = field(default_factory=dict)
+
+    # Records per second (and burst) allowed for each log statement
+    log_rate_limit: float = 10.0
+    log_rate_burst: int = 50
+
+    # Records waiting to be written; past this they are dropped
+    log_queue_size: int = 10_000
+
+    # Append a sample of /graphql requests, anonymized, to this file for replay
+    # with `python -m benchmarks.replay`; unset turns capture off
+    traffic_capture_path: Optional[str] = None
+    traffic_capture_sample_rate: float = 1.0
+    traffic_capture_queue_size: int = 10_000
+
+    @classmethod
+    def from_env(cls) -> "ObservabilityConfig":
+        """Create ObservabilityConfig from environment variables."""
+        sample_rate = float(os.getenv("METRICS_SAMPLE_RATE", "0"))
+        call_accounting = os.getenv("SUPABASE_CALL_ACCOUNTING", "false").lower() in ("1", "true", "yes")
+        call_budget = os.getenv("SUPABASE_CALL_BUDGET")
+        n_plus_one_threshold = int(os.getenv("N_PLUS_ONE_THRESHOLD", "3"))
+        tracing_exporter = os.getenv("TRACING_EXPORTER", "none").lower()
+        trace_sample_rate = float(os.getenv("TRACE_SAMPLE_RATE", "1"))
+        log_format = os.getenv("LOG_FORMAT", "json").lower()
+        capture_sample_rate = float(os.getenv("TRAFFIC_CAPTURE_SAMPLE_RATE", "1"))
+        # LOG_SAMPLE_RATES="app.graphql.routes=0.1,app.jobs=0.5"
+        log_sample_rates = {
+            name.strip(): float(rate)
+            for name, rate in (
+                entry.split("=", 1)
+                for entry in os.getenv("LOG_SAMPLE_RATES", "").split(",")
+                if entry.strip()
+            )
+        }
+
+        if not 0 <= sample_rate <= 1:
+            raise ValueError("METRICS_SAMPLE_RATE must be between 0 and 1.")
+        if tracing_exporter not in ("none", "memory", "otlp"):
+            raise ValueError("TRACING_EXPORTER must be one of: none, memory, otlp.")
+        if not 0 <= trace_sample_rate <= 1:
+            raise ValueError("TRACE_SAMPLE_RATE must be between 0 and 1.")
+        if log_format not in ("json", "text"):
+            raise ValueError("LOG_FORMAT must be 'json' or 'text'.")
+        if not 0 <= capture_sample_rate <= 1:
+            raise ValueError("TRAFFIC_CAPTURE_SAMPLE_RATE must be between 0 and 1.")
+
+        return cls(
+            metrics_sample_rate=sample_rate,
+            call_accounting=call_accounting,
+            call_budget=int(call_budget) if call_budget else None,
+            n_plus_one_threshold=n_plus_one_threshold,
+            tracing_exporter=tracing_exporter,
+            otlp_traces_endpoint=os.getenv("OTLP_TRACES_ENDPOINT", cls.otlp_traces_endpoint),
+            service_name=os.getenv("OTEL_SERVICE_NAME", cls.service_name),
+            trace_sample_rate=trace_sample_rate,
+            log_level=os.getenv("LOG_LEVEL", "INFO").upper(),
+            log_format=log_format,
+            log_sample_rates=log_sample_rates,
+            log_rate_limit=float(os.getenv("LOG_RATE_LIMIT", "10")),
+            log_rate_burst=int(os.getenv("LOG_RATE_BURST", "50")),
+            log_queue_size=int(os.getenv("LOG_QUEUE_SIZE", "10000")),
+            traffic_capture_path=os.getenv("TRAFFIC_CAPTURE_PATH") or None,
+            traffic_capture_sample_rate=capture_sample_rate,
+            traffic_capture_queue_size=int(os.getenv("TRAFFIC_CAPTURE_QUEUE_SIZE", "10000")),
+        )
+
+
+# Global instance
+observability_config = ObservabilityConfig.from_env()
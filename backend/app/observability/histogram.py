@@ -0,0 +1,75 @@
+"""HDR-style latency histogram"""
+from typing import Dict, Iterable, List, Tuple
+
+
+class LatencyHistogram:
+    """
+    Log-linear histogram of durations, in the style of HdrHistogram.
+
+    Values are recorded in microseconds into buckets that are linear within each
+    power of two, with ``2 ** sub_bucket_bits`` buckets per power. Every recorded
+    value is therefore kept to within ``1 / 2 ** sub_bucket_bits`` of its true value
+    (under 1% by default), whatever its magnitude, and recording is O(1). Buckets
+    are stored sparsely, so a histogram only costs memory for the ranges it has seen.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 7):
+        self.sub_bucket_bits = sub_bucket_bits
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.sum_us = 0.0
+        self.max_us = 0
+
+    def _index(self, value_us: int) -> int:
+        magnitude = max(0, value_us.bit_length() - self.sub_bucket_bits - 1)
+        return (magnitude << self.sub_bucket_bits) + (value_us >> magnitude)
+
+    def _bounds(self, index: int) -> Tuple[int, int]:
+        """[lower, upper) range of values in microseconds held by a bucket"""
+        sub_buckets = 1 << self.sub_bucket_bits
+        if index < 2 * sub_buckets:
+            return index, index + 1
+        magnitude = (index >> self.sub_bucket_bits) - 1
+        sub_bucket = index - (magnitude << self.sub_bucket_bits)
+        return sub_bucket << magnitude, (sub_bucket + 1) << magnitude
+
+    def record(self, seconds: float) -> None:
+        """Record one duration."""
+        value_us = max(0, int(seconds * 1_000_000))
+        index = self._index(value_us)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.sum_us += value_us
+        if value_us > self.max_us:
+            self.max_us = value_us
+
+    def percentile(self, percent: float) -> float:
+        """Duration in seconds at or below which ``percent`` of recorded values fall."""
+        if not self.count:
+            return 0.0
+
+        threshold = max(1, round(self.count * percent / 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= threshold:
+                return min(self._bounds(index)[1] - 1, self.max_us) / 1_000_000
+        return self.max_us / 1_000_000
+
+    def cumulative_counts(self, bounds: Iterable[float]) -> List[int]:
+        """Number of recorded values at or below each bound (seconds, ascending)."""
+        indexes = sorted(self.counts)
+        result = []
+        position = seen = 0
+        for bound in bounds:
+            bound_us = bound * 1_000_000
+            while position < len(indexes) and self._bounds(indexes[position])[0] <= bound_us:
+                seen += self.counts[indexes[position]]
+                position += 1
+            result.append(seen)
+        return result
+
+    @property
+    def sum(self) -> float:
+        """Total of recorded durations in seconds"""
+        return self.sum_us / 1_000_000
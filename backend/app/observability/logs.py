@@ -0,0 +1,169 @@
+"""
+Structured, non-blocking logging.
+
+Records are filtered (sampling, rate limiting) and tagged with the request id
+on the calling thread, then handed to a bounded queue; a background thread
+formats and writes them. A full queue drops records instead of blocking the
+event loop.
+"""
+import json
+import logging
+import queue
+import random
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+from app.graphql.utils.rate_limit import RateLimiter
+
+from .config import ObservabilityConfig, observability_config
+from .tracing import tracer
+
+
+# Id of the HTTP request being served, set by RequestIdMiddleware
+request_id: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+# Attributes every LogRecord has; anything else was passed with `extra=`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class RequestContextFilter(logging.Filter):
+    """Tags records with the current request id and trace id."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id.get()
+        record.trace_id = tracer.current_trace_id()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a fraction of the records below WARNING from selected loggers.
+
+    Args:
+        sample_rates: Logger name prefix -> fraction kept; the longest matching
+            prefix wins and unmatched loggers keep everything
+    """
+
+    def __init__(self, sample_rates: Dict[str, float]):
+        super().__init__()
+        self.sample_rates = sample_rates
+        self._rates: Dict[str, float] = {}
+
+    def _rate(self, name: str) -> float:
+        rate = self._rates.get(name)
+        if rate is None:
+            prefixes = [p for p in self.sample_rates if name == p or name.startswith(f"{p}.")]
+            rate = self.sample_rates[max(prefixes, key=len)] if prefixes else 1.0
+            self._rates[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self._rate(record.name)
+        return rate >= 1 or random.random() < rate
+
+
+class RateLimitFilter(logging.Filter):
+    """
+    Limits how often each log statement may fire.
+
+    Records are keyed by logger and message template, so a warning logged once
+    per row of a large result counts as one statement. The number of records
+    dropped is reported on the next one let through as `suppressed`.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        super().__init__()
+        self.limiter = RateLimiter(rate=rate, burst=burst)
+        self.suppressed: Dict[str, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        key = f"{record.name}:{record.msg}"
+        if not self.limiter.allow(key):
+            self.suppressed[key] = self.suppressed.get(key, 0) + 1
+            return False
+
+        dropped = self.suppressed.pop(key, 0)
+        if dropped:
+            record.suppressed = dropped
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and value is not None:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class DroppingQueueHandler(QueueHandler):
+    """Queue handler that drops records when the queue is full"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging(config: ObservabilityConfig = observability_config) -> None:
+    """
+    Route the root logger through a queue to a stdout writer thread.
+
+    Safe to call more than once; later calls replace the earlier setup.
+    """
+    global _listener
+    shutdown_logging()
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    if config.log_format == "json":
+        stream_handler.setFormatter(JsonFormatter())
+    else:
+        stream_handler.setFormatter(logging.Formatter(
+            "%(asctime)s %(levelname)s %(name)s [%(request_id)s] %(message)s"
+        ))
+
+    queue_handler = DroppingQueueHandler(queue.Queue(config.log_queue_size))
+    queue_handler.addFilter(SamplingFilter(config.log_sample_rates))
+    queue_handler.addFilter(RateLimitFilter(config.log_rate_limit, config.log_rate_burst))
+    queue_handler.addFilter(RequestContextFilter())
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        if isinstance(handler, DroppingQueueHandler):
+            root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(config.log_level)
+
+    _listener = QueueListener(queue_handler.queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the writer thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
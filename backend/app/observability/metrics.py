@@ -0,0 +1,113 @@
+"""In-process metrics registry rendered in the Prometheus text format"""
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .histogram import LatencyHistogram
+
+
+# Upper bounds (seconds) of the cumulative buckets exported for every histogram
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Quantiles exported alongside the buckets, computed from the full HDR histogram
+DEFAULT_QUANTILES = (0.5, 0.95, 0.99)
+
+# Label values past this many series per metric are folded into one "other" series
+DEFAULT_MAX_SERIES = 1000
+
+OVERFLOW_LABEL = "other"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class HistogramFamily:
+    """A latency histogram per combination of label values"""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        label_names: Sequence[str],
+        max_series: int = DEFAULT_MAX_SERIES,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.max_series = max_series
+        self.series: Dict[Tuple[str, ...], LatencyHistogram] = {}
+
+    def observe(self, seconds: float, *label_values: str) -> None:
+        """Record a duration for the given label values (in label_names order)."""
+        histogram = self.series.get(label_values)
+        if histogram is None:
+            if len(self.series) >= self.max_series:
+                label_values = (OVERFLOW_LABEL,) * len(self.label_names)
+                histogram = self.series.get(label_values)
+            if histogram is None:
+                histogram = self.series[label_values] = LatencyHistogram()
+        histogram.record(seconds)
+
+    def render(self) -> Iterator[str]:
+        """Prometheus text lines: a histogram plus a gauge of HDR quantiles."""
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        for label_values, histogram in sorted(self.series.items()):
+            cumulative = histogram.cumulative_counts(DEFAULT_BUCKETS)
+            for bound, count in zip(DEFAULT_BUCKETS, cumulative):
+                labels = _format_labels(self.label_names, label_values, f'le="{bound:g}"')
+                yield f"{self.name}_bucket{labels} {count}"
+            labels = _format_labels(self.label_names, label_values, 'le="+Inf"')
+            yield f"{self.name}_bucket{labels} {histogram.count}"
+            labels = _format_labels(self.label_names, label_values)
+            yield f"{self.name}_sum{labels} {histogram.sum:.6f}"
+            yield f"{self.name}_count{labels} {histogram.count}"
+
+        quantile_name = f"{self.name}_quantile"
+        yield f"# HELP {quantile_name} {self.documentation} (quantiles since process start)"
+        yield f"# TYPE {quantile_name} gauge"
+        for label_values, histogram in sorted(self.series.items()):
+            for quantile in DEFAULT_QUANTILES:
+                labels = _format_labels(self.label_names, label_values, f'quantile="{quantile:g}"')
+                yield f"{quantile_name}{labels} {histogram.percentile(quantile * 100):.6f}"
+
+
+class MetricsRegistry:
+    """
+    Holds every metric family of the process.
+
+    Metrics are per process: with several uvicorn workers, each worker serves its
+    own numbers from /metrics.
+    """
+
+    def __init__(self):
+        self.families: Dict[str, HistogramFamily] = {}
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str]) -> HistogramFamily:
+        """Get or create a histogram family."""
+        if name not in self.families:
+            self.families[name] = HistogramFamily(name, documentation, label_names)
+        return self.families[name]
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        for family in self.families.values():
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global instance
+metrics_registry = MetricsRegistry()
+
+
+# Name of the GraphQL operation being executed when it was sampled for detailed
+# (per-resolver and per-call) timing, None otherwise
+sampled_operation: ContextVar[Optional[str]] = ContextVar("sampled_operation", default=None)
@@ -0,0 +1,78 @@
+"""ASGI middleware for request tracing and log correlation"""
+import re
+import uuid
+from typing import Any, Awaitable, Callable, Dict
+
+from .logs import request_id
+from .tracing import Tracer
+
+
+Scope = Dict[str, Any]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+
+REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._-]{1,128}$")
+
+
+class TracingMiddleware:
+    """
+    Wraps each HTTP request in a server span, continuing the caller's trace when
+    the request carries a W3C traceparent header.
+
+    Everything the request does (context creation, the GraphQL operation, its
+    resolvers and Supabase calls) becomes a child of this span.
+    """
+
+    def __init__(self, app: Callable, tracer: Tracer):
+        self.app = app
+        self.tracer = tracer
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self.tracer.enabled:
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope.get("headers") or [])
+        carrier = {"traceparent": headers.get(b"traceparent", b"").decode("latin-1")}
+        attributes = {"http.method": scope["method"], "http.target": scope["path"]}
+
+        with self.tracer.start_span(f"{scope['method']} {scope['path']}", "server", attributes, carrier) as span:
+            async def send_wrapper(message: Dict[str, Any]) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        self.tracer.set_error(span, f"HTTP {message['status']}")
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+
+class RequestIdMiddleware:
+    """
+    Gives every HTTP request an id, available to log records while it is served
+    and returned in the X-Request-ID response header.
+
+    A well-formed X-Request-ID from the caller (e.g. a load balancer) is kept.
+    """
+
+    def __init__(self, app: Callable):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        incoming = dict(scope.get("headers") or []).get(b"x-request-id", b"").decode("latin-1")
+        current = incoming if REQUEST_ID_RE.match(incoming) else uuid.uuid4().hex
+
+        async def send_wrapper(message: Dict[str, Any]) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-request-id", current.encode())]
+            await send(message)
+
+        token = request_id.set(current)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id.reset(token)
@@ -0,0 +1,143 @@
+"""
+Tracing on the OpenTelemetry SDK.
+
+The SDK is an optional dependency, installed with the ``tracing`` extra
+(``uv sync --extra tracing``). Spans nest through the OpenTelemetry context,
+carry W3C trace context (``traceparent``) in and out of the process, and are
+exported either to memory (for tests) or in batches to a collector's OTLP/HTTP
+endpoint (e.g. a local OpenTelemetry Collector or Jaeger on port 4318).
+
+Instrumented code goes through Tracer rather than the SDK, so the app imports
+and runs without it while tracing is off.
+"""
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Mapping, MutableMapping, Optional
+
+from .config import ObservabilityConfig, observability_config
+
+try:
+    from opentelemetry import trace
+    from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor, SpanExporter
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+    from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+    from opentelemetry.trace.propagation.tracecontext import TraceContextTextMapPropagator
+except ImportError:  # the tracing extra is not installed
+    trace = None
+
+
+class Tracer:
+    """
+    Creates spans on an OpenTelemetry tracer provider and passes trace context
+    through headers.
+
+    Without a provider tracing is disabled and start_span() yields None, so
+    instrumented code can skip attribute work with a single check.
+    """
+
+    def __init__(self, provider: Optional["TracerProvider"] = None, exporter: Optional["SpanExporter"] = None):
+        self.provider = provider
+        # The exporter spans end up in; an InMemorySpanExporter in tests
+        self.exporter = exporter
+        self._tracer = provider.get_tracer(__name__) if provider is not None else None
+        self._propagator = TraceContextTextMapPropagator() if provider is not None else None
+
+    @property
+    def enabled(self) -> bool:
+        return self._tracer is not None
+
+    def current_trace_id(self) -> Optional[str]:
+        """Hex id of the trace being recorded, if any"""
+        if not self.enabled:
+            return None
+        context = trace.get_current_span().get_span_context()
+        return trace.format_trace_id(context.trace_id) if context.is_valid else None
+
+    def start(
+        self,
+        name: str,
+        kind: str = "internal",  # 'internal', 'server' or 'client'
+        attributes: Optional[Dict[str, Any]] = None,
+        carrier: Optional[Mapping[str, str]] = None,
+    ) -> "trace.Span":
+        """
+        Start a span without making it current; end it with end().
+
+        The parent is the current span, or the remote span named by the
+        traceparent in ``carrier`` (e.g. incoming request headers).
+        """
+        parent = self._propagator.extract(carrier) if carrier is not None else None
+        return self._tracer.start_span(
+            name,
+            context=parent,
+            kind=trace.SpanKind[kind.upper()],
+            attributes={key: value for key, value in (attributes or {}).items() if value is not None},
+        )
+
+    def end(self, span: "trace.Span") -> None:
+        span.end()
+
+    def inject(self, span: "trace.Span", headers: MutableMapping[str, str]) -> None:
+        """Set the traceparent header for a call made on behalf of span."""
+        self._propagator.inject(headers, context=trace.set_span_in_context(span))
+
+    @staticmethod
+    def set_error(span: "trace.Span", error: Any) -> None:
+        """Mark span as failed, with an exception or a message."""
+        if isinstance(error, BaseException):
+            span.record_exception(error)
+            error = f"{type(error).__name__}: {error}"
+        span.set_status(trace.Status(trace.StatusCode.ERROR, str(error)))
+
+    @contextmanager
+    def start_span(
+        self,
+        name: str,
+        kind: str = "internal",
+        attributes: Optional[Dict[str, Any]] = None,
+        carrier: Optional[Mapping[str, str]] = None,
+    ) -> Iterator[Optional["trace.Span"]]:
+        """Run the block inside a new current span (or yield None if tracing is off)."""
+        if not self.enabled:
+            yield None
+            return
+
+        span = self.start(name, kind, attributes, carrier)
+        # The SDK's own exception handling records the error and the status
+        with trace.use_span(span, end_on_exit=True):
+            yield span
+
+    def shutdown(self) -> None:
+        """Export the spans still buffered."""
+        if self.provider is not None:
+            self.provider.shutdown()
+
+
+def create_tracer(config: ObservabilityConfig) -> Tracer:
+    """Tracer for the configured exporter; disabled when there is none"""
+    if config.tracing_exporter == "none":
+        return Tracer()
+    if trace is None:
+        raise RuntimeError(
+            f"TRACING_EXPORTER={config.tracing_exporter} needs the OpenTelemetry SDK: "
+            "install the backend with its 'tracing' extra"
+        )
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": config.service_name}),
+        # Requests arriving with a traceparent keep the caller's decision
+        sampler=ParentBased(TraceIdRatioBased(config.trace_sample_rate)),
+    )
+    if config.tracing_exporter == "memory":
+        exporter = InMemorySpanExporter()
+        provider.add_span_processor(SimpleSpanProcessor(exporter))
+    else:
+        exporter = OTLPSpanExporter(endpoint=config.otlp_traces_endpoint)
+        provider.add_span_processor(BatchSpanProcessor(exporter))
+    return Tracer(provider, exporter)
+
+
+# Global instance
+tracer = create_tracer(observability_config)
@@ -0,0 +1,25 @@
+"""
+In-memory stand-in for Supabase, for load tests and benchmarks without a network.
+
+Implements the part of the PostgREST query builder the resolvers and jobs use
+(select with embedded resources, insert/upsert/update/delete, the common
+filters, order, limit, single) over indexed in-memory tables, and the RPC
+functions in app.supabase.fake.functions. Responses are postgrest-py
+APIResponse objects and errors are APIError, as from the real client.
+
+    database = create_fake_database()
+    database.seed("profiles", [{"id": user_id, "email": "a@example.com"}])
+    client = FakeAsyncClient(database, latency=0.002).as_user(user_id)
+"""
+from .client import FakeAsyncClient, create_fake_database, fake_client_factory
+from .database import COHAB_SCHEMA, FakeDatabase, FakeTable, TableSchema
+
+__all__ = [
+    "FakeAsyncClient",
+    "create_fake_database",
+    "fake_client_factory",
+    "COHAB_SCHEMA",
+    "FakeDatabase",
+    "FakeTable",
+    "TableSchema",
+]
@@ -0,0 +1,92 @@
+"""Drop-in stand-in for the Supabase AsyncClient"""
+import asyncio
+import random
+from typing import Awaitable, Callable, Dict, Optional
+
+from jose import jwt, JWTError
+
+from .database import FakeDatabase
+from .functions import COHAB_FUNCTIONS, COHAB_TRIGGERS
+from .query import FakeQueryBuilder, FakeRPCBuilder
+
+
+def create_fake_database() -> FakeDatabase:
+    """An empty database with Cohab's tables, triggers and RPC functions"""
+    database = FakeDatabase()
+    for name, function in COHAB_FUNCTIONS.items():
+        database.register_function(name, function)
+    for table, triggers in COHAB_TRIGGERS.items():
+        for trigger in triggers:
+            database.register_trigger(table, trigger)
+    return database
+
+
+class FakeAsyncClient:
+    """
+    Serves table() and rpc() requests from a FakeDatabase.
+
+    Every execute() waits ``latency`` seconds plus up to ``jitter`` more before
+    it runs, standing in for the PostgREST round trip; with no latency it still
+    yields to the event loop once, as real I/O would.
+
+    Row level security is not emulated: every client sees every row, as with the
+    service role key. ``user_id`` is what SQL functions see as auth.uid().
+    """
+
+    def __init__(
+        self,
+        database: Optional[FakeDatabase] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        user_id: Optional[str] = None,
+    ):
+        self.database = database if database is not None else create_fake_database()
+        self.latency = latency
+        self.jitter = jitter
+        self.user_id = user_id
+
+    async def simulate_latency(self) -> None:
+        delay = self.latency + (random.uniform(0, self.jitter) if self.jitter else 0)
+        await asyncio.sleep(delay)
+
+    def table(self, table_name: str) -> FakeQueryBuilder:
+        return FakeQueryBuilder(self, table_name)
+
+    def from_(self, table_name: str) -> FakeQueryBuilder:
+        return self.table(table_name)
+
+    def rpc(
+        self,
+        fn: str,
+        params: Optional[Dict] = None,
+        count: Optional[str] = None,
+        head: bool = False,
+        get: bool = False,
+    ) -> FakeRPCBuilder:
+        return FakeRPCBuilder(self, fn, params or {}, count)
+
+    def as_user(self, user_id: Optional[str]) -> "FakeAsyncClient":
+        """A client on the same database and latency, authenticated as user_id"""
+        return FakeAsyncClient(self.database, self.latency, self.jitter, user_id)
+
+
+def fake_client_factory(
+    database: FakeDatabase,
+    latency: float = 0.0,
+    jitter: float = 0.0,
+) -> Callable[[str], Awaitable[FakeAsyncClient]]:
+    """
+    Replacement for create_authenticated_client: clients share one database and
+    take their user id from the token's `sub` claim (the signature is not checked).
+    """
+
+    async def create_client(token: str) -> FakeAsyncClient:
+        user_id = None
+        if token:
+            try:
+                user_id = jwt.get_unverified_claims(token).get("sub")
+            except JWTError:
+                pass
+        return FakeAsyncClient(database, latency, jitter, user_id)
+
+    return create_client
@@ -0,0 +1,328 @@
+"""In-memory tables with unique constraints, hash indexes and foreign keys"""
+import copy
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from postgrest.exceptions import APIError
+
+
+def now_iso() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def new_uuid() -> str:
+    return str(uuid.uuid4())
+
+
+def index_key(value: Any) -> Any:
+    """Hashable key under which a value is indexed; matches filter values passed as strings."""
+    if isinstance(value, bool):
+        return str(value).lower()
+    return None if value is None else str(value)
+
+
+@dataclass
+class TableSchema:
+    """
+    Columns and constraints of one table.
+
+    Columns map to their default: a value, a zero-argument callable, or None.
+    """
+
+    name: str
+    columns: Dict[str, Any]
+    primary_key: Tuple[str, ...] = ("id",)
+    unique: List[Tuple[str, ...]] = field(default_factory=list)
+    foreign_keys: Dict[str, str] = field(default_factory=dict)  # column -> referenced table (by its id)
+    indexes: List[str] = field(default_factory=list)  # extra columns with hash indexes
+    nulls_not_distinct: bool = False  # NULLs conflict in the key constraints, as in UNIQUE NULLS NOT DISTINCT
+
+    def defaults(self) -> Dict[str, Any]:
+        return {
+            column: default() if callable(default) else copy.copy(default)
+            for column, default in self.columns.items()
+        }
+
+
+# Tables the API reads and writes, as created by database/schema.sql and the migrations
+COHAB_SCHEMA: List[TableSchema] = [
+    TableSchema("profiles", {
+        "id": new_uuid, "email": None, "full_name": None, "avatar_url": None, "bio": None,
+        "venmo_handle": None, "paypal_email": None, "cashapp_handle": None, "zelle_email": None,
+        "preferred_payment_method": None, "points": 0, "created_at": now_iso, "updated_at": now_iso,
+    }, indexes=["email"]),
+    TableSchema("households", {
+        "id": new_uuid, "name": None, "description": None, "address": None, "rent_amount": None,
+        "currency": "USD", "household_type": None, "amenities": None, "images": None,
+        "is_available": True, "created_by": None, "created_at": now_iso, "updated_at": now_iso,
+        "invite_code": None,
+    }, unique=[("invite_code",)], foreign_keys={"created_by": "profiles"}),
+    TableSchema("roommates", {
+        "id": new_uuid, "user_id": None, "household_id": None, "status": "pending",
+        "joined_at": now_iso, "left_at": None, "points": 0,
+    }, unique=[("user_id", "household_id")], foreign_keys={"user_id": "profiles", "household_id": "households"}),
+    TableSchema("expenses", {
+        "id": new_uuid, "household_id": None, "title": None, "description": None, "amount": None,
+        "currency": "USD", "category": None, "paid_by": None, "created_at": now_iso, "due_date": None,
+    }, foreign_keys={"household_id": "households", "paid_by": "profiles"}),
+    TableSchema("expense_splits", {
+        "id": new_uuid, "expense_id": None, "user_id": None, "amount": None, "is_paid": False,
+        "paid_at": None, "payment_url": None, "payment_method": None,
+    }, unique=[("expense_id", "user_id")], foreign_keys={"expense_id": "expenses", "user_id": "profiles"}),
+    TableSchema("messages", {
+        "id": new_uuid, "household_id": None, "sender_id": None, "content": None,
+        "message_type": "text", "metadata": None, "created_at": now_iso,
+    }, foreign_keys={"household_id": "households", "sender_id": "profiles"}),
+    TableSchema("notifications", {
+        "id": new_uuid, "user_id": None, "title": None, "message": None, "type": None,
+        "is_read": False, "metadata": None, "created_at": now_iso,
+    }, foreign_keys={"user_id": "profiles"}),
+    TableSchema("chores", {
+        "id": new_uuid, "household_id": None, "title": None, "description": None,
+        "recurrence": "none", "points": 0, "requires_proof": False, "created_by": None,
+        "created_at": now_iso, "updated_at": now_iso,
+    }, foreign_keys={"household_id": "households", "created_by": "profiles"}),
+    TableSchema("chore_assignments", {
+        "id": new_uuid, "chore_id": None, "user_id": None, "due_date": None, "is_complete": False,
+        "completed_at": None, "proof_url": None, "created_at": now_iso,
+    }, foreign_keys={"chore_id": "chores", "user_id": "profiles"}),
+    TableSchema("chore_recurrence_slots", {
+        "chore_id": None, "due_date": None,
+    }, primary_key=("chore_id", "due_date"), foreign_keys={"chore_id": "chores"}),
+    TableSchema("household_points_periods", {
+        "household_id": None, "user_id": None, "period": None, "period_start": None, "points": 0,
+    }, primary_key=("household_id", "period", "period_start", "user_id"),
+        foreign_keys={"household_id": "households", "user_id": "profiles"}),
+    TableSchema("household_versions", {
+        "household_id": None, "scope": None, "version": 0, "updated_at": now_iso,
+    }, primary_key=("household_id", "scope"), foreign_keys={"household_id": "households"}),
+    TableSchema("household_sync_state", {
+        "household_id": None, "version": 0, "compacted_through": 0, "updated_at": now_iso,
+    }, primary_key=("household_id",), foreign_keys={"household_id": "households"}),
+    TableSchema("household_changes", {
+        "household_id": None, "table_name": None, "row_id": None, "version": None, "deleted": False,
+        "changed_at": now_iso,
+    }, primary_key=("household_id", "table_name", "row_id"), foreign_keys={"household_id": "households"},
+        indexes=["row_id"]),
+    TableSchema("household_balances", {
+        "household_id": None, "debtor_id": None, "creditor_id": None, "currency": "USD", "amount": 0,
+    }, primary_key=("household_id", "debtor_id", "creditor_id", "currency"),
+        foreign_keys={"household_id": "households", "debtor_id": "profiles", "creditor_id": "profiles"}),
+    TableSchema("household_spending_months", {
+        "household_id": None, "month": None, "category": None, "currency": "USD", "user_id": None,
+        "paid": 0, "share": 0, "expense_count": 0,
+    }, primary_key=("household_id", "month", "category", "currency", "user_id"), nulls_not_distinct=True,
+        foreign_keys={"household_id": "households", "user_id": "profiles"}),
+    TableSchema("expense_templates", {
+        "id": new_uuid, "household_id": None, "kind": "bill", "title": None, "description": None,
+        "amount": None, "currency": None, "category": None, "paid_by": None, "split_with": None,
+        "day_of_month": 1, "is_active": True, "created_by": None, "created_at": now_iso, "updated_at": now_iso,
+    }, foreign_keys={"household_id": "households", "paid_by": "profiles", "created_by": "profiles"}),
+    # expense_id is ON DELETE SET NULL, not a cascade: indexed, but not a foreign key here
+    TableSchema("generated_expenses", {
+        "template_id": None, "period_start": None, "expense_id": new_uuid, "generated_at": now_iso,
+    }, primary_key=("template_id", "period_start"), foreign_keys={"template_id": "expense_templates"},
+        indexes=["expense_id"]),
+    TableSchema("job_watermarks", {
+        "job_name": None, "watermark": None, "updated_at": now_iso,
+    }, primary_key=("job_name",)),
+]
+
+
+# An AFTER ... FOR EACH ROW trigger: called with the old and new row (None on
+# insert and delete respectively) once the change is applied
+Trigger = Callable[[Optional[Dict[str, Any]], Optional[Dict[str, Any]]], None]
+
+
+class FakeTable:
+    """
+    Rows of one table.
+
+    Primary key and unique constraints are enforced through hash maps, and the
+    primary key, unique, foreign key and extra indexed columns have hash indexes
+    that eq/in filters use instead of scanning.
+    """
+
+    def __init__(self, schema: TableSchema):
+        self.schema = schema
+        self.rows: Dict[int, Dict[str, Any]] = {}
+        self._next_rowid = 0
+
+        self.constraints: Dict[Tuple[str, ...], Dict[tuple, int]] = {
+            columns: {} for columns in [schema.primary_key, *schema.unique]
+        }
+        indexed = {*schema.foreign_keys, *schema.indexes}
+        indexed.update(columns[0] for columns in self.constraints if len(columns) == 1)
+        self.indexes: Dict[str, Dict[Any, Set[int]]] = {column: {} for column in indexed}
+        self.triggers: List[Trigger] = []
+
+    @property
+    def name(self) -> str:
+        return self.schema.name
+
+    def _constraint_key(self, columns: Tuple[str, ...], row: Dict[str, Any]) -> Optional[tuple]:
+        # NULLs never conflict, as in Postgres, unless the table says otherwise
+        values = tuple(index_key(row.get(column)) for column in columns)
+        if self.schema.nulls_not_distinct:
+            return values
+        return None if any(value is None for value in values) else values
+
+    def find_conflict(self, row: Dict[str, Any], columns: Optional[Tuple[str, ...]] = None) -> Optional[int]:
+        """Rowid of an existing row with the same key (on `columns`, or any constraint)."""
+        for constraint in [columns] if columns else self.constraints:
+            key = self._constraint_key(constraint, row)
+            if key is not None and key in self.constraints.get(constraint, {}):
+                return self.constraints[constraint][key]
+        return None
+
+    def _check_unique(self, row: Dict[str, Any], rowid: Optional[int] = None) -> None:
+        for columns, entries in self.constraints.items():
+            key = self._constraint_key(columns, row)
+            if key is not None and entries.get(key, rowid) != rowid:
+                raise APIError({
+                    "message": f'duplicate key value violates unique constraint on {self.name}({", ".join(columns)})',
+                    "code": "23505",
+                    "details": f"Key ({', '.join(columns)})=({', '.join(value or 'null' for value in key)}) already exists.",
+                    "hint": None,
+                })
+
+    def _index(self, rowid: int, row: Dict[str, Any]) -> None:
+        for columns, entries in self.constraints.items():
+            key = self._constraint_key(columns, row)
+            if key is not None:
+                entries[key] = rowid
+        for column, index in self.indexes.items():
+            index.setdefault(index_key(row.get(column)), set()).add(rowid)
+
+    def _unindex(self, rowid: int, row: Dict[str, Any]) -> None:
+        for columns, entries in self.constraints.items():
+            key = self._constraint_key(columns, row)
+            if key is not None and entries.get(key) == rowid:
+                del entries[key]
+        for column, index in self.indexes.items():
+            rowids = index.get(index_key(row.get(column)))
+            if rowids is not None:
+                rowids.discard(rowid)
+
+    def _check_columns(self, values: Dict[str, Any]) -> None:
+        unknown = set(values) - set(self.schema.columns)
+        if unknown:
+            raise APIError({
+                "message": f"Could not find the '{sorted(unknown)[0]}' column of '{self.name}' in the schema cache",
+                "code": "PGRST204",
+                "details": None,
+                "hint": None,
+            })
+
+    def insert(self, values: Dict[str, Any]) -> int:
+        self._check_columns(values)
+        row = self.schema.defaults()
+        row.update(copy.deepcopy(values))
+        self._check_unique(row)
+
+        rowid = self._next_rowid
+        self._next_rowid += 1
+        self.rows[rowid] = row
+        self._index(rowid, row)
+        self._fire(None, row)
+        return rowid
+
+    def update(self, rowid: int, changes: Dict[str, Any]) -> None:
+        self._check_columns(changes)
+        row = self.rows[rowid]
+        updated = {**row, **copy.deepcopy(changes)}
+        # Stands in for the tables' updated_at triggers
+        if "updated_at" in row and "updated_at" not in changes:
+            updated["updated_at"] = now_iso()
+        self._check_unique(updated, rowid)
+        self._unindex(rowid, row)
+        self.rows[rowid] = updated
+        self._index(rowid, updated)
+        self._fire(row, updated)
+
+    def delete(self, rowid: int) -> Dict[str, Any]:
+        row = self.rows.pop(rowid)
+        self._unindex(rowid, row)
+        self._fire(row, None)
+        return row
+
+    def _fire(self, old: Optional[Dict[str, Any]], new: Optional[Dict[str, Any]]) -> None:
+        for trigger in self.triggers:
+            trigger(old, new)
+
+    def lookup(self, column: str, values: Iterable[Any]) -> Optional[Set[int]]:
+        """Rowids whose column equals one of values, or None if the column is not indexed."""
+        index = self.indexes.get(column)
+        if index is None:
+            return None
+        found: Set[int] = set()
+        for value in values:
+            found |= index.get(index_key(value), set())
+        return found
+
+    def find(self, column: str, value: Any) -> List[int]:
+        """Rowids whose column equals value, in insertion order, by index or by scan."""
+        found = self.lookup(column, [value])
+        if found is None:
+            key = index_key(value)
+            return [rowid for rowid, row in self.rows.items() if index_key(row.get(column)) == key]
+        return sorted(found)
+
+
+class FakeDatabase:
+    """
+    A set of in-memory tables, their triggers and the SQL functions callable
+    through rpc().
+
+    Functions are plain callables ``fn(db, params, user_id)`` returning the JSON
+    the real function would; see app.supabase.fake.functions.
+    """
+
+    def __init__(self, schema: Iterable[TableSchema] = COHAB_SCHEMA):
+        self.tables: Dict[str, FakeTable] = {table.name: FakeTable(table) for table in schema}
+        self.functions: Dict[str, Callable[["FakeDatabase", Dict[str, Any], Optional[str]], Any]] = {}
+
+    def table(self, name: str) -> FakeTable:
+        table = self.tables.get(name)
+        if table is None:
+            raise APIError({
+                "message": f"Could not find the table 'public.{name}' in the schema cache",
+                "code": "PGRST205",
+                "details": None,
+                "hint": None,
+            })
+        return table
+
+    def register_function(self, name: str, fn: Callable[["FakeDatabase", Dict[str, Any], Optional[str]], Any]) -> None:
+        self.functions[name] = fn
+
+    def register_trigger(self, table: str, fn: Callable[["FakeDatabase", Optional[Dict[str, Any]], Optional[Dict[str, Any]]], None]) -> None:
+        """Run ``fn(db, old, new)`` after every row change in table, as an AFTER ROW trigger would."""
+        self.table(table).triggers.append(lambda old, new: fn(self, old, new))
+
+    def seed(self, table: str, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Insert rows directly, returning them with defaults filled in."""
+        target = self.table(table)
+        return [copy.deepcopy(target.rows[target.insert(row)]) for row in rows]
+
+    def references_to(self, table: str) -> List[Tuple[str, str]]:
+        """(table, column) pairs whose foreign key points at table"""
+        return [
+            (name, column)
+            for name, other in self.tables.items()
+            for column, referenced in other.schema.foreign_keys.items()
+            if referenced == table
+        ]
+
+    def delete_cascade(self, table: str, rowid: int) -> None:
+        """Delete a row and, as ON DELETE CASCADE does, the rows referencing it."""
+        row = self.tables[table].delete(rowid)
+        if "id" not in row:
+            return
+        for referencing, column in self.references_to(table):
+            target = self.tables[referencing]
+            for child in target.find(column, row["id"]):
+                if child in target.rows:
+                    self.delete_cascade(referencing, child)
@@ -0,0 +1,859 @@
+"""
+Python versions of the SQL functions the API calls through rpc().
+
+Each takes the database, the call's parameters and the caller's user id
+(auth.uid(), None for the service role) and returns what the SQL function
+returns. Raising APIError stands in for RAISE EXCEPTION.
+
+The search functions filter, order and page as their SQL does, but Postgres'
+text search is approximated: words are matched without stemming or stop words,
+and ranks are plain match counts rather than ts_rank_cd or similarity() scores.
+"""
+import json
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Optional
+
+from postgrest.exceptions import APIError
+
+from .database import FakeDatabase, FakeTable, now_iso
+
+
+def _raise(message: str) -> APIError:
+    return APIError({"message": message, "code": "P0001", "details": None, "hint": None})
+
+
+def _first(table: FakeTable, column: str, value: Any) -> Optional[int]:
+    rowids = table.find(column, value)
+    return rowids[0] if rowids else None
+
+
+def project_jsonb(row: Optional[Dict[str, Any]], fields: Optional[List[str]]) -> Optional[Dict[str, Any]]:
+    """public.project_jsonb: keep only the requested keys (None keeps everything)"""
+    if row is None:
+        return None
+    return dict(row) if fields is None else {key: value for key, value in row.items() if key in fields}
+
+
+def points_period_start(period: str, at: str) -> str:
+    """public.points_period_start: the Monday or the 1st the period containing `at` starts on"""
+    day = datetime.fromisoformat(at).date()
+    if period == "weekly":
+        return (day - timedelta(days=day.weekday())).isoformat()
+    return day.replace(day=1).isoformat()
+
+
+def complete_chore_and_award_points(db: FakeDatabase, params: Dict[str, Any], user_id: Optional[str]) -> Dict[str, Any]:
+    p_user_id = params["p_user_id"]
+    if user_id != p_user_id:
+        raise _raise("Not authorized to complete this chore assignment")
+
+    assignments = db.table("chore_assignments")
+    rowid = _first(assignments, "id", params["p_assignment_id"])
+    if rowid is None:
+        raise _raise("Chore assignment not found")
+
+    assignment = assignments.rows[rowid]
+    if assignment["user_id"] != p_user_id:
+        raise _raise("Not authorized to complete this chore assignment")
+    if assignment["is_complete"]:
+        raise _raise("Chore assignment is already complete")
+
+    chores = db.table("chores")
+    chore_rowid = _first(chores, "id", assignment["chore_id"])
+    chore = chores.rows[chore_rowid] if chore_rowid is not None else {}
+    if chore.get("requires_proof") and params.get("p_proof_url") is None:
+        raise _raise("This chore requires proof of completion")
+
+    completed_at = now_iso()
+    assignments.update(rowid, {
+        "is_complete": True,
+        "completed_at": completed_at,
+        "proof_url": params.get("p_proof_url") or assignment["proof_url"],
+    })
+    points = chore.get("points") or 0
+
+    profiles = db.table("profiles")
+    profile = None
+    profile_rowid = _first(profiles, "id", p_user_id)
+    if profile_rowid is not None:
+        profiles.update(profile_rowid, {"points": (profiles.rows[profile_rowid]["points"] or 0) + points})
+        profile = profiles.rows[profile_rowid]
+
+    roommates = db.table("roommates")
+    for roommate_rowid in roommates.find("user_id", p_user_id):
+        roommate = roommates.rows[roommate_rowid]
+        if roommate["household_id"] == chore.get("household_id"):
+            roommates.update(roommate_rowid, {"points": (roommate["points"] or 0) + points})
+
+    return {
+        **assignments.rows[rowid],
+        "chore": project_jsonb(chore or None, params.get("p_chore_fields")),
+        "user": project_jsonb(profile, params.get("p_user_fields")),
+    }
+
+
+def update_household_chore(db: FakeDatabase, params: Dict[str, Any], user_id: Optional[str]) -> Dict[str, Any]:
+    p_user_id = params["p_user_id"]
+    if user_id != p_user_id:
+        return {"status": "forbidden"}
+
+    chores = db.table("chores")
+    rowid = _first(chores, "id", params["p_chore_id"])
+    if rowid is None:
+        return {"status": "not_found"}
+
+    chore = chores.rows[rowid]
+    roommates = db.table("roommates")
+    is_member = any(
+        roommates.rows[member]["household_id"] == chore["household_id"]
+        and roommates.rows[member]["status"] == "accepted"
+        for member in roommates.find("user_id", p_user_id)
+    )
+    if not is_member:
+        return {"status": "forbidden"}
+
+    changes = params.get("p_changes") or {}
+    chores.update(rowid, {
+        column: changes[column]
+        for column in ("title", "description", "recurrence", "points", "requires_proof")
+        if changes.get(column) is not None
+    })
+    return {"status": "updated", "chore": project_jsonb(chores.rows[rowid], params.get("p_fields"))}
+
+
+def cache_versions(db: FakeDatabase, params: Dict[str, Any], user_id: Optional[str]) -> List[Dict[str, Any]]:
+    requested = set(params.get("p_household_ids") or [])
+    roommates = db.table("roommates")
+    household_ids = {
+        roommates.rows[rowid]["household_id"]
+        for rowid in roommates.find("user_id", user_id)
+        if roommates.rows[rowid]["status"] == "accepted"
+        and (params.get("p_include_memberships") or roommates.rows[rowid]["household_id"] in requested)
+    }
+
+    versions = db.table("household_versions")
+    result = []
+    for household_id in sorted(household_ids):
+        for scope in sorted(params.get("p_scopes") or []):
+            rowid = versions.find_conflict({"household_id": household_id, "scope": scope})
+            version = versions.rows[rowid]["version"] if rowid is not None else 0
+            result.append({"household_id": household_id, "scope": scope, "version": version})
+    return result
+
+
+def household_changes_since(db: FakeDatabase, params: Dict[str, Any], user_id: Optional[str]) -> Dict[str, Any]:
+    household_id = params["p_household_id"]
+    roommates = db.table("roommates")
+    is_member = any(
+        roommates.rows[rowid]["household_id"] == household_id and roommates.rows[rowid]["status"] == "accepted"
+        for rowid in roommates.find("user_id", user_id)
+    )
+    if not is_member:
+        raise _raise("Not a member of this household")
+
+    states = db.table("household_sync_state")
+    state_rowid = _first(states, "household_id", household_id)
+    state = states.rows[state_rowid] if state_rowid is not None else {"version": 0, "compacted_through": 0}
+
+    since = max(params.get("p_since") or 0, 0)
+    full_resync = since == 0 or since < state["compacted_through"]
+    if full_resync:
+        since = 0
+
+    log = db.table("household_changes")
+    entries = sorted(
+        (
+            log.rows[rowid] for rowid in log.find("household_id", household_id)
+            if log.rows[rowid]["version"] > since and not (full_resync and log.rows[rowid]["deleted"])
+        ),
+        key=lambda entry: entry["version"],
+    )[:params.get("p_limit", 500)]
+
+    changes = []
+    for entry in entries:
+        row = None
+        if not entry["deleted"]:
+            table = db.table(entry["table_name"])
+            rowid = _first(table, "id", entry["row_id"])
+            row = dict(table.rows[rowid]) if rowid is not None else None
+        changes.append({
+            "table": entry["table_name"],
+            "id": entry["row_id"],
+            "version": entry["version"],
+            "deleted": entry["deleted"],
+            "row": row,
+        })
+    return {"version": state["version"], "full_resync": full_resync, "changes": changes}
+
+
+def compact_household_changes(db: FakeDatabase, params: Dict[str, Any], user_id: Optional[str]) -> int:
+    if user_id is not None:
+        raise _raise("permission denied for function compact_household_changes")
+    # Intervals arrive as "<n> days", as the compaction job sends them
+    days = float((params.get("p_retention") or "30 days").split()[0])
+    cutoff = datetime.now(timezone.utc) - timedelta(days=days)
+
+    log = db.table("household_changes")
+    horizons: Dict[str, int] = {}
+    removed = 0
+    for rowid, entry in list(log.rows.items()):
+        if entry["deleted"] and datetime.fromisoformat(entry["changed_at"]) < cutoff:
+            log.delete(rowid)
+            horizons[entry["household_id"]] = max(horizons.get(entry["household_id"], 0), entry["version"])
+            removed += 1
+
+    states = db.table("household_sync_state")
+    for household_id, version in horizons.items():
+        rowid = _first(states, "household_id", household_id)
+        if rowid is not None:
+            states.update(rowid, {"compacted_through": max(states.rows[rowid]["compacted_through"], version)})
+    return removed
+
+
+def my_balance_summary(db: FakeDatabase, params: Dict[str, Any], user_id: Optional[str]) -> List[Dict[str, Any]]:
+    balances = db.table("household_balances")
+    totals: Dict[tuple, Dict[str, Any]] = {}
+    for column, counterparty_column, side in (("debtor_id", "creditor_id", "owed_by_me"), ("creditor_id", "debtor_id", "owed_to_me")):
+        for rowid in balances.find(column, user_id):
+            balance = balances.rows[rowid]
+            if not balance["amount"]:
+                continue
+            key = (balance["household_id"], balance[counterparty_column], balance["currency"])
+            row = totals.setdefault(key, {
+                "household_id": key[0], "counterparty_id": key[1], "currency": key[2], "owed_by_me": 0, "owed_to_me": 0,
+            })
+            row[side] = round(row[side] + balance["amount"], 2)
+    return [totals[key] for key in sorted(totals)]
+
+
+def settle_up(db: FakeDatabase, params: Dict[str, Any], user_id: Optional[str]) -> Dict[str, Any]:
+    household_id = params["p_household_id"]
+    counterparty_id = params.get("p_counterparty_id")
+    split_ids = params.get("p_split_ids")
+    if (counterparty_id is None) == (split_ids is None):
+        raise _raise("Pass either a counterparty or split ids to settle")
+
+    roommates = db.table("roommates")
+    if not any(
+        roommates.rows[rowid]["household_id"] == household_id and roommates.rows[rowid]["status"] == "accepted"
+        for rowid in roommates.find("user_id", user_id)
+    ):
+        raise _raise("Not a member of this household")
+
+    profiles = db.table("profiles")
+    profile_rowid = _first(profiles, "id", user_id)
+    profile = profiles.rows[profile_rowid] if profile_rowid is not None else {}
+    name = profile.get("full_name") or profile.get("email") or "A roommate"
+
+    expenses, splits = db.table("expenses"), db.table("expense_splits")
+    settled_ids: List[str] = []
+    totals: Dict[tuple, Dict[str, Any]] = {}
+    for expense_rowid in expenses.find("household_id", household_id):
+        expense = expenses.rows[expense_rowid]
+        for rowid in splits.find("expense_id", expense["id"]):
+            split = splits.rows[rowid]
+            if split["is_paid"] or split["user_id"] == expense["paid_by"]:
+                continue
+            if user_id not in (split["user_id"], expense["paid_by"]):
+                continue
+            if split_ids is not None and split["id"] not in split_ids:
+                continue
+            if counterparty_id is not None and counterparty_id not in (split["user_id"], expense["paid_by"]):
+                continue
+
+            splits.update(rowid, {"is_paid": True, "paid_at": now_iso()})
+            settled_ids.append(split["id"])
+            counterparty = expense["paid_by"] if split["user_id"] == user_id else split["user_id"]
+            currency = expense["currency"] or "USD"
+            total = totals.setdefault((counterparty, currency), {
+                "counterparty_id": counterparty, "currency": currency, "splits": 0, "paid": 0, "received": 0,
+            })
+            total["splits"] += 1
+            total["paid" if split["user_id"] == user_id else "received"] = round(
+                total["paid" if split["user_id"] == user_id else "received"] + (split["amount"] or 0), 2
+            )
+
+    ordered = [totals[key] for key in sorted(totals)]
+    notifications = db.table("notifications")
+    for counterparty in dict.fromkeys(total["counterparty_id"] for total in ordered):
+        mine = [total for total in ordered if total["counterparty_id"] == counterparty]
+        count = sum(total["splits"] for total in mine)
+        notifications.insert({
+            "user_id": counterparty,
+            "title": "Settled up",
+            "message": f"{name} settled {count} expense split{'' if count == 1 else 's'} with you",
+            "type": "expense",
+            "metadata": json.dumps({
+                "household_id": household_id,
+                "settled_by": user_id,
+                "totals": [
+                    {
+                        "currency": total["currency"], "splits": total["splits"],
+                        "paid_to_you": total["paid"], "received_from_you": total["received"],
+                    }
+                    for total in mine
+                ],
+            }),
+        })
+    return {"split_ids": settled_ids, "totals": ordered}
+
+
+def generate_recurring_expenses(db: FakeDatabase, params: Dict[str, Any], user_id: Optional[str]) -> Dict[str, int]:
+    if user_id is not None:
+        raise _raise("permission denied for function generate_recurring_expenses")
+    period_start = params["p_period_start"]
+    if not period_start.endswith("-01"):
+        raise _raise("A period starts on the first of a month")
+
+    templates, households = db.table("expense_templates"), db.table("households")
+    roommates, generated = db.table("roommates"), db.table("generated_expenses")
+    expenses, splits = db.table("expenses"), db.table("expense_splits")
+    created = {"expenses": 0, "splits": 0}
+    for template_id in params["p_template_ids"]:
+        template_rowid = _first(templates, "id", template_id)
+        if template_rowid is None:
+            continue
+        template = templates.rows[template_rowid]
+        household = households.rows[_first(households, "id", template["household_id"])]
+        amount = template["amount"] if template["amount"] is not None else household["rent_amount"]
+        sharers = [
+            roommates.rows[rowid]["user_id"]
+            for rowid in roommates.find("household_id", template["household_id"])
+            if roommates.rows[rowid]["status"] == "accepted"
+            and (template["split_with"] is None or roommates.rows[rowid]["user_id"] in template["split_with"])
+        ]
+        if not template["is_active"] or not amount or amount <= 0 or not sharers:
+            continue
+        if generated.find_conflict({"template_id": template_id, "period_start": period_start}) is not None:
+            continue
+
+        claim = generated.rows[generated.insert({"template_id": template_id, "period_start": period_start})]
+        expenses.insert({
+            "id": claim["expense_id"],
+            "household_id": template["household_id"],
+            "title": template["title"],
+            "description": template["description"],
+            "amount": amount,
+            "currency": template["currency"] or household["currency"] or "USD",
+            "category": template["category"],
+            "paid_by": template["paid_by"],
+            "due_date": f"{period_start[:8]}{template['day_of_month']:02d}T00:00:00+00:00",
+        })
+        # The rounding remainder goes on the payer's split, or the first sharer's
+        share = round(amount / len(sharers), 2)
+        remainder = round(amount - share * len(sharers), 2)
+        sharers.sort(key=lambda sharer: (sharer != template["paid_by"], sharer))
+        for position, sharer in enumerate(sharers):
+            is_payer = sharer == template["paid_by"]
+            splits.insert({
+                "expense_id": claim["expense_id"],
+                "user_id": sharer,
+                "amount": round(share + remainder, 2) if position == 0 else share,
+                "is_paid": is_payer,
+                "paid_at": now_iso() if is_payer else None,
+            })
+        created["expenses"] += 1
+        created["splits"] += len(sharers)
+    return created
+
+
+def recurring_chore_latest_due(db: FakeDatabase, params: Dict[str, Any], user_id: Optional[str]) -> List[Dict[str, Any]]:
+    if user_id is not None:
+        raise _raise("permission denied for function recurring_chore_latest_due")
+    slots = db.table("chore_recurrence_slots")
+    latest: Dict[str, datetime] = {}
+    for chore_id in params["p_chore_ids"]:
+        for rowid in slots.find("chore_id", chore_id):
+            due = datetime.fromisoformat(slots.rows[rowid]["due_date"])
+            latest[chore_id] = max(latest.get(chore_id, due), due)
+    return [{"chore_id": chore_id, "due_date": latest[chore_id].isoformat()} for chore_id in sorted(latest)]
+
+
+def household_rotation_loads(db: FakeDatabase, params: Dict[str, Any], user_id: Optional[str]) -> List[Dict[str, Any]]:
+    if user_id is not None:
+        raise _raise("permission denied for function household_rotation_loads")
+    roommates, chores, assignments = db.table("roommates"), db.table("chores"), db.table("chore_assignments")
+    loads: List[Dict[str, Any]] = []
+    for household_id in params["p_household_ids"]:
+        points = {chores.rows[rowid]["id"]: chores.rows[rowid]["points"] or 0 for rowid in chores.find("household_id", household_id)}
+        for rowid in roommates.find("household_id", household_id):
+            roommate = roommates.rows[rowid]
+            if roommate["status"] != "accepted":
+                continue
+            open_points = sum(
+                points[assignments.rows[assignment]["chore_id"]]
+                for assignment in assignments.find("user_id", roommate["user_id"])
+                if not assignments.rows[assignment]["is_complete"] and assignments.rows[assignment]["chore_id"] in points
+            )
+            loads.append({"household_id": household_id, "user_id": roommate["user_id"], "load": (roommate["points"] or 0) + open_points})
+    return sorted(loads, key=lambda load: (load["household_id"], load["user_id"]))
+
+
+def materialize_chore_assignments(db: FakeDatabase, params: Dict[str, Any], user_id: Optional[str]) -> int:
+    if user_id is not None:
+        raise _raise("permission denied for function materialize_chore_assignments")
+    slots, assignments = db.table("chore_recurrence_slots"), db.table("chore_assignments")
+    inserted = 0
+    for planned in params["p_assignments"]:
+        slot = {"chore_id": planned["chore_id"], "due_date": planned["due_date"]}
+        if slots.find_conflict(slot) is not None:
+            continue
+        slots.insert(slot)
+        assignments.insert({**slot, "user_id": planned["user_id"]})
+        inserted += 1
+    return inserted
+
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+_HTML_ESCAPES = {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"}
+
+
+def html_escape(text: str) -> str:
+    """public.html_escape"""
+    return "".join(_HTML_ESCAPES.get(char, char) for char in text)
+
+
+def _accepted_member(db: FakeDatabase, household_id: str, user_id: Optional[str]) -> bool:
+    roommates = db.table("roommates")
+    return any(
+        roommates.rows[rowid]["household_id"] == household_id and roommates.rows[rowid]["status"] == "accepted"
+        for rowid in roommates.find("user_id", user_id)
+    )
+
+
+def _keyset_page(rows: List[Dict[str, Any]], key: Callable[[Dict[str, Any]], tuple], after: Optional[tuple], limit: int) -> List[Dict[str, Any]]:
+    """Rows in descending key order after the cursor, as (key) < (after) ORDER BY key DESC LIMIT limit"""
+    rows = sorted(rows, key=key, reverse=True)
+    if after is not None:
+        rows = [row for row in rows if key(row) < after]
+    return rows[:limit]
+
+
+def search_messages(db: FakeDatabase, params: Dict[str, Any], user_id: Optional[str]) -> List[Dict[str, Any]]:
+    household_id, query = params["p_household_id"], params["p_query"]
+    # Message RLS: the function runs with the caller's privileges
+    if user_id is not None and not _accepted_member(db, household_id, user_id):
+        return []
+
+    words = set(_WORD_RE.findall(query.lower()))
+    escaped_query = re.escape(html_escape(query))
+    messages = db.table("messages")
+    matches = []
+    for rowid in messages.find("household_id", household_id):
+        message = messages.rows[rowid]
+        content = message["content"] or ""
+        if words:
+            # Every query word matches as a prefix, as 'word':* does
+            content_words = _WORD_RE.findall(content.lower())
+            if not all(any(content_word.startswith(word) for content_word in content_words) for word in words):
+                continue
+            rank = float(sum(content_word.startswith(tuple(words)) for content_word in content_words))
+            pattern = r"\b((?:" + "|".join(map(re.escape, sorted(words))) + r")[a-z0-9]*)"
+        else:
+            if query.lower() not in content.lower():
+                continue
+            rank = 1.0
+            pattern = f"({escaped_query})"
+        matches.append({
+            **{column: message[column] for column in ("id", "household_id", "sender_id", "content", "message_type", "metadata", "created_at")},
+            "rank": rank,
+            "highlight": re.sub(pattern, r"<mark>\1</mark>", html_escape(content), flags=re.IGNORECASE),
+        })
+
+    after = None
+    if params.get("p_after_id") is not None:
+        after = (params["p_after_rank"], datetime.fromisoformat(params["p_after_created_at"]), params["p_after_id"])
+    return _keyset_page(
+        matches,
+        lambda row: (row["rank"], datetime.fromisoformat(row["created_at"]), row["id"]),
+        after,
+        params.get("p_limit", 20),
+    )
+
+
+def search_household_listings(db: FakeDatabase, params: Dict[str, Any], user_id: Optional[str]) -> List[Dict[str, Any]]:
+    query = params.get("p_query")
+    min_rent, max_rent = params.get("p_min_rent"), params.get("p_max_rent")
+    household_types, amenities = params.get("p_household_types"), params.get("p_amenities")
+
+    households = db.table("households")
+    listings = []
+    for household in households.rows.values():
+        rent = household["rent_amount"]
+        if not household["is_available"]:
+            continue
+        if min_rent is not None and (rent is None or rent < min_rent):
+            continue
+        if max_rent is not None and (rent is None or rent > max_rent):
+            continue
+        if household_types is not None and household["household_type"] not in household_types:
+            continue
+        if amenities is not None and not set(amenities).issubset(household["amenities"] or []):
+            continue
+        text = " ".join(household[column] or "" for column in ("name", "description", "address"))
+        if query is not None and query.lower() not in text.lower():
+            continue
+        listings.append({column: value for column, value in household.items() if column != "invite_code"})
+
+    after = None
+    if params.get("p_after_id") is not None:
+        after = (datetime.fromisoformat(params["p_after_created_at"]), params["p_after_id"])
+    return _keyset_page(
+        listings,
+        lambda row: (datetime.fromisoformat(row["created_at"]), row["id"]),
+        after,
+        params.get("p_limit", 20),
+    )
+
+
+def _trigrams(text: str) -> set:
+    """pg_trgm's trigrams: each word padded with two spaces before and one after"""
+    return {
+        padded[i:i + 3]
+        for word in _WORD_RE.findall(text.lower())
+        for padded in [f"  {word} "]
+        for i in range(len(padded) - 2)
+    }
+
+
+def _similarity(left: str, right: str) -> float:
+    """pg_trgm similarity()"""
+    left_trigrams, right_trigrams = _trigrams(left), _trigrams(right)
+    if not left_trigrams or not right_trigrams:
+        return 0.0
+    return len(left_trigrams & right_trigrams) / len(left_trigrams | right_trigrams)
+
+
+def search_profiles(db: FakeDatabase, params: Dict[str, Any], user_id: Optional[str]) -> List[Dict[str, Any]]:
+    if user_id is None:
+        raise _raise("Not authenticated")
+
+    prefix = (params["p_prefix"] or "").strip().lower()
+    limit = min(max(params.get("p_limit") or 10, 1), 20)
+    if len(prefix) < 2:
+        return []
+
+    # id -> (tier, score, profile), keeping the best tier and score of each profile
+    matches: Dict[str, tuple] = {}
+    for profile in db.table("profiles").rows.values():
+        name = (profile["full_name"] or "").lower()
+        if name.startswith(prefix) or (profile["email"] or "").lower() == prefix:
+            tier, score = 0, 1.0
+        elif len(prefix) >= 3 and _similarity(name, prefix) >= 0.3:
+            tier, score = 1, _similarity(name, prefix)
+        else:
+            continue
+        if profile["id"] != user_id:
+            matches[profile["id"]] = (tier, score, profile)
+
+    ranked = sorted(matches.values(), key=lambda match: (match[0], -match[1], match[2]["full_name"] or ""))
+    return [
+        {"id": profile["id"], "full_name": profile["full_name"], "avatar_url": profile["avatar_url"]}
+        for _, _, profile in ranked[:limit]
+    ]
+
+
+COHAB_FUNCTIONS: Dict[str, Callable[[FakeDatabase, Dict[str, Any], Optional[str]], Any]] = {
+    "complete_chore_and_award_points": complete_chore_and_award_points,
+    "update_household_chore": update_household_chore,
+    "cache_versions": cache_versions,
+    "household_changes_since": household_changes_since,
+    "compact_household_changes": compact_household_changes,
+    "my_balance_summary": my_balance_summary,
+    "settle_up": settle_up,
+    "generate_recurring_expenses": generate_recurring_expenses,
+    "recurring_chore_latest_due": recurring_chore_latest_due,
+    "household_rotation_loads": household_rotation_loads,
+    "materialize_chore_assignments": materialize_chore_assignments,
+    "search_messages": search_messages,
+    "search_household_listings": search_household_listings,
+    "search_profiles": search_profiles,
+}
+
+
+# Triggers from database/migrations/household_versions.sql
+
+Row = Optional[Dict[str, Any]]
+
+
+def bump_household_version(db: FakeDatabase, household_id: Optional[str], scope: str) -> None:
+    if household_id is None or _first(db.table("households"), "id", household_id) is None:
+        return
+    versions = db.table("household_versions")
+    key = {"household_id": household_id, "scope": scope}
+    existing = versions.find_conflict(key)
+    if existing is None:
+        versions.insert({**key, "version": 1})
+    else:
+        versions.update(existing, {"version": versions.rows[existing]["version"] + 1})
+
+
+def _bump_by_column(scope: str, column: str = "household_id") -> Callable[[FakeDatabase, Row, Row], None]:
+    def trigger(db: FakeDatabase, old: Row, new: Row) -> None:
+        if old is not None:
+            bump_household_version(db, old[column], scope)
+        if new is not None and (old is None or new[column] != old[column]):
+            bump_household_version(db, new[column], scope)
+    return trigger
+
+
+def _bump_through(parent: str, column: str, scope: str) -> Callable[[FakeDatabase, Row, Row], None]:
+    """Bump the household of the parent row (a chore, an expense) the changed row belongs to."""
+    def trigger(db: FakeDatabase, old: Row, new: Row) -> None:
+        parents = db.table(parent)
+        for parent_id in {row[column] for row in (old, new) if row is not None}:
+            rowid = _first(parents, "id", parent_id)
+            if rowid is not None:
+                bump_household_version(db, parents.rows[rowid]["household_id"], scope)
+    return trigger
+
+
+def _bump_profile_households(db: FakeDatabase, old: Row, new: Row) -> None:
+    if old is None or new is None:
+        return
+    roommates = db.table("roommates")
+    for rowid in roommates.find("user_id", new["id"]):
+        bump_household_version(db, roommates.rows[rowid]["household_id"], "members")
+
+
+def _on_update_or_insert(trigger: Callable[[FakeDatabase, Row, Row], None]) -> Callable[[FakeDatabase, Row, Row], None]:
+    def filtered(db: FakeDatabase, old: Row, new: Row) -> None:
+        if new is not None:
+            trigger(db, old, new)
+    return filtered
+
+
+# Triggers from database/migrations/household_change_log.sql
+
+def record_household_change(db: FakeDatabase, household_id: Optional[str], table: str, row_id: str, deleted: bool) -> None:
+    if household_id is None or _first(db.table("households"), "id", household_id) is None:
+        return
+    states = db.table("household_sync_state")
+    rowid = _first(states, "household_id", household_id)
+    if rowid is None:
+        version = 1
+        states.insert({"household_id": household_id, "version": version})
+    else:
+        version = states.rows[rowid]["version"] + 1
+        states.update(rowid, {"version": version})
+
+    log = db.table("household_changes")
+    key = {"household_id": household_id, "table_name": table, "row_id": row_id}
+    existing = log.find_conflict(key)
+    if existing is None:
+        log.insert({**key, "version": version, "deleted": deleted})
+    else:
+        log.update(existing, {"version": version, "deleted": deleted, "changed_at": now_iso()})
+
+
+def _log_changes(table: str, household_of: Callable[[FakeDatabase, Dict[str, Any]], Optional[str]]) -> Callable[[FakeDatabase, Row, Row], None]:
+    def trigger(db: FakeDatabase, old: Row, new: Row) -> None:
+        old_household = household_of(db, old) if old is not None else None
+        new_household = household_of(db, new) if new is not None else None
+        if new is None and old_household is None:
+            # Deleted along with its parent, whose tombstone covers it
+            log = db.table("household_changes")
+            for rowid in log.find("row_id", old["id"]):
+                if log.rows[rowid]["table_name"] == table:
+                    log.delete(rowid)
+        elif old is not None and old_household != new_household:
+            record_household_change(db, old_household, table, old["id"], True)
+        if new is not None:
+            record_household_change(db, new_household, table, new["id"], False)
+    return trigger
+
+
+def _column(column: str = "household_id") -> Callable[[FakeDatabase, Dict[str, Any]], Optional[str]]:
+    return lambda db, row: row[column]
+
+
+def _parent_household(parent: str, column: str) -> Callable[[FakeDatabase, Dict[str, Any]], Optional[str]]:
+    def household_of(db: FakeDatabase, row: Dict[str, Any]) -> Optional[str]:
+        parents = db.table(parent)
+        rowid = _first(parents, "id", row[column])
+        return parents.rows[rowid]["household_id"] if rowid is not None else None
+    return household_of
+
+
+# Trigger from database/migrations/household_leaderboard.sql
+
+def _credit_points_periods(db: FakeDatabase, old: Row, new: Row) -> None:
+    """Credit the week and month an assignment is completed in."""
+    if not (old and new and new["is_complete"] and not old["is_complete"] and new["completed_at"]):
+        return
+    chores = db.table("chores")
+    chore_rowid = _first(chores, "id", new["chore_id"])
+    if chore_rowid is None:
+        return
+    chore = chores.rows[chore_rowid]
+
+    periods = db.table("household_points_periods")
+    for period in ("weekly", "monthly"):
+        key = {
+            "household_id": chore["household_id"],
+            "user_id": new["user_id"],
+            "period": period,
+            "period_start": points_period_start(period, new["completed_at"]),
+        }
+        existing = periods.find_conflict(key)
+        if existing is None:
+            periods.insert({**key, "points": chore["points"] or 0})
+        else:
+            periods.update(existing, {"points": periods.rows[existing]["points"] + (chore["points"] or 0)})
+
+
+# Triggers from database/migrations/expense_balances.sql
+
+def adjust_household_balance(
+    db: FakeDatabase,
+    household_id: Optional[str],
+    debtor_id: Optional[str],
+    creditor_id: Optional[str],
+    currency: Optional[str],
+    amount: Optional[float],
+) -> None:
+    if None in (household_id, debtor_id, creditor_id) or debtor_id == creditor_id or not amount:
+        return
+    balances = db.table("household_balances")
+    key = {"household_id": household_id, "debtor_id": debtor_id, "creditor_id": creditor_id, "currency": currency or "USD"}
+    existing = balances.find_conflict(key)
+    if existing is None:
+        balances.insert({**key, "amount": round(amount, 2)})
+    else:
+        balances.update(existing, {"amount": round(balances.rows[existing]["amount"] + amount, 2)})
+
+
+def _track_split_balance(db: FakeDatabase, old: Row, new: Row) -> None:
+    expenses = db.table("expenses")
+    for split, sign in ((old, -1), (new, 1)):
+        if split is None or split["is_paid"]:
+            continue
+        # Missing when the split goes with its expense, whose trigger already took it off
+        rowid = _first(expenses, "id", split["expense_id"])
+        if rowid is not None:
+            expense = expenses.rows[rowid]
+            adjust_household_balance(
+                db, expense["household_id"], split["user_id"], expense["paid_by"], expense["currency"],
+                sign * (split["amount"] or 0),
+            )
+
+
+def _track_expense_balance(db: FakeDatabase, old: Row, new: Row) -> None:
+    if old is None:
+        return
+    if new is not None and all(old[column] == new[column] for column in ("paid_by", "household_id", "currency")):
+        return
+    splits = db.table("expense_splits")
+    unpaid = [splits.rows[rowid] for rowid in splits.find("expense_id", old["id"]) if not splits.rows[rowid]["is_paid"]]
+    for expense, sign in ((old, -1), (new, 1)):
+        if expense is None:
+            continue
+        for split in unpaid:
+            adjust_household_balance(
+                db, expense["household_id"], split["user_id"], expense["paid_by"], expense["currency"],
+                sign * (split["amount"] or 0),
+            )
+
+
+# Triggers from database/migrations/household_spending.sql
+
+def spending_month(expense: Dict[str, Any]) -> str:
+    """date_trunc('month', COALESCE(due_date, created_at) AT TIME ZONE 'UTC')::date"""
+    at = datetime.fromisoformat(expense["due_date"] or expense["created_at"])
+    if at.tzinfo is not None:
+        at = at.astimezone(timezone.utc)
+    return at.date().replace(day=1).isoformat()
+
+
+def adjust_household_spending(
+    db: FakeDatabase,
+    expense: Dict[str, Any],
+    user_id: Optional[str],
+    paid: float,
+    share: float,
+    expense_count: int,
+) -> None:
+    if expense["household_id"] is None:
+        return
+    months = db.table("household_spending_months")
+    key = {
+        "household_id": expense["household_id"],
+        "month": spending_month(expense),
+        "category": expense["category"] or "uncategorized",
+        "currency": expense["currency"] or "USD",
+        "user_id": user_id,
+    }
+    existing = months.find_conflict(key)
+    if existing is None:
+        months.insert({**key, "paid": round(paid, 2), "share": round(share, 2), "expense_count": expense_count})
+    else:
+        row = months.rows[existing]
+        months.update(existing, {
+            "paid": round(row["paid"] + paid, 2),
+            "share": round(row["share"] + share, 2),
+            "expense_count": row["expense_count"] + expense_count,
+        })
+
+
+def _track_split_spending(db: FakeDatabase, old: Row, new: Row) -> None:
+    if old is not None and new is not None and all(old[column] == new[column] for column in ("expense_id", "user_id", "amount")):
+        return
+    expenses = db.table("expenses")
+    for split, sign in ((old, -1), (new, 1)):
+        if split is None:
+            continue
+        # Missing when the split goes with its expense, whose trigger already took it off
+        rowid = _first(expenses, "id", split["expense_id"])
+        if rowid is not None:
+            adjust_household_spending(db, expenses.rows[rowid], split["user_id"], 0, sign * (split["amount"] or 0), 0)
+
+
+def _spending_key(expense: Dict[str, Any]) -> tuple:
+    return expense["household_id"], expense["category"], expense["currency"], spending_month(expense)
+
+
+def _track_expense_spending(db: FakeDatabase, old: Row, new: Row) -> None:
+    moved = new is None or (old is not None and _spending_key(old) != _spending_key(new))
+    if old is not None and new is not None and not moved \
+            and (old["paid_by"], old["amount"]) == (new["paid_by"], new["amount"]):
+        return
+    splits = db.table("expense_splits")
+    shares = [splits.rows[rowid] for rowid in splits.find("expense_id", (old or new)["id"])] if moved else []
+    for expense, sign in ((old, -1), (new, 1)):
+        if expense is None:
+            continue
+        adjust_household_spending(db, expense, expense["paid_by"], sign * (expense["amount"] or 0), 0, sign)
+        for split in shares:
+            adjust_household_spending(db, expense, split["user_id"], 0, sign * (split["amount"] or 0), 0)
+
+
+COHAB_TRIGGERS: Dict[str, List[Callable[[FakeDatabase, Row, Row], None]]] = {
+    "households": [
+        _on_update_or_insert(_bump_by_column("members", "id")),
+        _on_update_or_insert(_log_changes("households", _column("id"))),
+    ],
+    "roommates": [_bump_by_column("members"), _log_changes("roommates", _column())],
+    "profiles": [_bump_profile_households],
+    "chores": [_bump_by_column("chores"), _log_changes("chores", _column())],
+    "chore_assignments": [
+        _bump_through("chores", "chore_id", "chores"),
+        _log_changes("chore_assignments", _parent_household("chores", "chore_id")),
+        _credit_points_periods,
+    ],
+    "expenses": [
+        _bump_by_column("expenses"),
+        _log_changes("expenses", _column()),
+        _track_expense_balance,
+        _track_expense_spending,
+    ],
+    "expense_splits": [
+        _bump_through("expenses", "expense_id", "expenses"),
+        _log_changes("expense_splits", _parent_household("expenses", "expense_id")),
+        _track_split_balance,
+        _track_split_spending,
+    ],
+    "messages": [_log_changes("messages", _column())],
+    "expense_templates": [_bump_by_column("expenses")],
+}
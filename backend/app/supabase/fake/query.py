@@ -0,0 +1,673 @@
+"""Request builders mirroring the postgrest-py API, evaluated against a FakeDatabase"""
+import copy
+import operator
+import re
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import cmp_to_key, lru_cache
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple, Union
+
+import httpx
+from postgrest import APIResponse
+from postgrest.base_request_builder import SingleAPIResponse
+from postgrest.exceptions import APIError
+
+from .database import FakeDatabase, FakeTable
+
+if TYPE_CHECKING:
+    from .client import FakeAsyncClient
+
+
+ORDERINGS = {"gt": operator.gt, "gte": operator.ge, "lt": operator.lt, "lte": operator.le}
+
+TIMESTAMP_RE = re.compile(r"^\d{4}-\d{2}-\d{2}([T ]\d{2}:\d{2}(:\d{2}(\.\d+)?)?(Z|[+-]\d{2}(:?\d{2})?)?)?$")
+
+
+def _error(message: str, code: str, details: Optional[str] = None) -> APIError:
+    return APIError({"message": message, "code": code, "details": details, "hint": None})
+
+
+def split_top_level(text: str) -> List[str]:
+    """Split on commas outside parentheses and double quotes."""
+    parts, depth, quoted, start = [], 0, False, 0
+    for i, char in enumerate(text):
+        if char == '"':
+            quoted = not quoted
+        elif quoted:
+            continue
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return [part.strip() for part in parts if part.strip()]
+
+
+# --- select lists ----------------------------------------------------------------
+
+@dataclass
+class Embed:
+    """An embedded resource such as `chores:chore_id(*)` or `expenses!inner(title)`"""
+
+    key: str  # output key: the alias, or the name as written
+    name: str  # table name or foreign key column
+    inner: bool
+    selection: "Selection"
+
+
+@dataclass
+class Selection:
+    columns: List[Tuple[str, str]] = field(default_factory=list)  # (output key, column), ('*', '*') for all
+    embeds: List[Embed] = field(default_factory=list)
+
+
+@lru_cache(maxsize=1024)
+def parse_select(text: str) -> Selection:
+    selection = Selection()
+    for part in split_top_level(text or "*"):
+        if part.endswith(")") and "(" in part:
+            head, inner = part[:part.index("(")], part[part.index("(") + 1:-1]
+            alias, _, head = head.rpartition(":")
+            name, *hints = head.split("!")
+            selection.embeds.append(Embed(alias or name, name, "inner" in hints, parse_select(inner or "*")))
+        else:
+            column = part.split("::")[0]
+            alias, _, column = column.rpartition(":")
+            selection.columns.append((alias or column, column))
+    return selection
+
+
+# --- filters ---------------------------------------------------------------------
+
+@dataclass
+class Condition:
+    column: str  # 'embed.column' filters an embedded resource
+    op: str
+    value: Any
+    negate: bool = False
+
+
+@dataclass
+class Logic:
+    op: str  # 'and' or 'or'
+    nodes: List[Union[Condition, "Logic"]]
+    negate: bool = False
+
+
+def _parse_value(op: str, raw: str) -> Any:
+    if op == "in":
+        return [item.strip('"') for item in split_top_level(raw.strip("()"))]
+    if op == "is":
+        return {"null": None, "true": True, "false": False}.get(raw.lower(), raw)
+    if op in ("cs", "cd", "ov") and raw.startswith("{"):
+        return [item.strip('"') for item in split_top_level(raw.strip("{}"))]
+    return raw[1:-1] if len(raw) > 1 and raw[0] == raw[-1] == '"' else raw
+
+
+def parse_logic(text: str) -> List[Union[Condition, Logic]]:
+    """Parse a PostgREST logic tree such as `a.gt.1,and(b.eq.2,c.gt.3)`."""
+    nodes: List[Union[Condition, Logic]] = []
+    for part in split_top_level(text):
+        match = re.match(r"^(not\.)?(and|or)\((.*)\)$", part, re.S)
+        if match:
+            nodes.append(Logic(match.group(2), parse_logic(match.group(3)), bool(match.group(1))))
+            continue
+        column, rest = part.split(".", 1)
+        negate = rest.startswith("not.")
+        if negate:
+            rest = rest[4:]
+        op, raw = rest.split(".", 1)
+        nodes.append(Condition(column, op, _parse_value(op, raw), negate))
+    return nodes
+
+
+@lru_cache(maxsize=4096)
+def _timestamp(value: str) -> Optional[datetime]:
+    if not TIMESTAMP_RE.match(value):
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace(" ", "T", 1) if "T" not in value else value)
+    except ValueError:
+        return None
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+
+
+def _comparable(stored: Any, value: Any) -> Tuple[Any, Any]:
+    """Coerce a filter value to the stored value's type, as Postgres casts the literal."""
+    if isinstance(stored, bool):
+        return stored, value if isinstance(value, bool) else str(value).lower() in ("true", "t", "1")
+    if isinstance(stored, (int, float)):
+        try:
+            return stored, float(value)
+        except (TypeError, ValueError):
+            return str(stored), str(value)
+    if isinstance(stored, str):
+        value = value if isinstance(value, str) else str(value)
+        stored_ts, value_ts = _timestamp(stored), _timestamp(value)
+        if stored_ts is not None and value_ts is not None:
+            return stored_ts, value_ts
+    return stored, value
+
+
+def _like(pattern: str, text: str, ignore_case: bool) -> bool:
+    regex = "".join(
+        ".*" if char in "%*" else "." if char == "_" else re.escape(char)
+        for char in pattern
+    )
+    return re.fullmatch(regex, text, re.S | (re.I if ignore_case else 0)) is not None
+
+
+def _as_set(value: Any) -> set:
+    return set(map(str, value)) if isinstance(value, (list, tuple, set)) else {str(value)}
+
+
+def _compare(op: str, stored: Any, value: Any) -> bool:
+    if op == "eq":
+        a, b = _comparable(stored, value)
+        return a == b
+    if op == "neq":
+        a, b = _comparable(stored, value)
+        return a != b
+    if op in ORDERINGS:
+        a, b = _comparable(stored, value)
+        try:
+            return ORDERINGS[op](a, b)
+        except TypeError:
+            return False
+    if op in ("like", "ilike"):
+        return _like(str(value), str(stored), op == "ilike")
+    if op == "in":
+        return any(_compare("eq", stored, item) for item in value)
+    if op == "cs":
+        return _as_set(value) <= _as_set(stored)
+    if op == "cd":
+        return _as_set(stored) <= _as_set(value)
+    if op == "ov":
+        return bool(_as_set(stored) & _as_set(value))
+    if op in ("fts", "plfts", "phfts", "wfts"):
+        words = re.findall(r"\w+", str(value).lower())
+        return all(word in str(stored).lower() for word in words)
+    raise _error(f'"failed to parse filter ({op})"', "PGRST100")
+
+
+def matches(row: Dict[str, Any], node: Union[Condition, Logic]) -> bool:
+    if isinstance(node, Logic):
+        results = (matches(row, child) for child in node.nodes)
+        result = all(results) if node.op == "and" else any(results)
+        return result != node.negate
+
+    stored = row.get(node.column)
+    if node.op == "is":
+        return (stored is node.value or stored == node.value) != node.negate
+    # Comparisons with NULL are never true, negated or not
+    if stored is None:
+        return False
+    return _compare(node.op, stored, node.value) != node.negate
+
+
+def _sort_value(value: Any) -> Any:
+    return _timestamp(value) or value if isinstance(value, str) else value
+
+
+def _copy_row(row: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        key: copy.deepcopy(value) if isinstance(value, (list, dict)) else value
+        for key, value in row.items()
+    }
+
+
+def _value(value: Any) -> Any:
+    """Enum members (CountMethod, ReturnMethod) to their string values"""
+    return getattr(value, "value", value)
+
+
+# --- builders --------------------------------------------------------------------
+
+class _Request:
+    """Stand-in for postgrest's RequestConfig; observers may add headers."""
+
+    def __init__(self):
+        self.headers = httpx.Headers()
+
+
+class _FilterBuilder:
+    """Filters, ordering, paging and result shaping shared by table and RPC builders"""
+
+    def __init__(self, client: "FakeAsyncClient"):
+        self._client = client
+        self.request = _Request()
+        self._selection = parse_select("*")
+        self._conditions: List[Union[Condition, Logic]] = []
+        self._order: List[Tuple[str, bool, Optional[bool]]] = []
+        self._limit: Optional[int] = None
+        self._offset = 0
+        self._single: Optional[str] = None  # 'single' or 'maybe'
+        self._count: Optional[str] = None
+        self._negate_next = False
+
+    @property
+    def _db(self) -> FakeDatabase:
+        return self._client.database
+
+    # Filters
+
+    def filter(self, column: str, operator: str, criteria: Any) -> "_FilterBuilder":
+        negate = operator.startswith("not.")
+        op = operator[4:] if negate else operator
+        value = _parse_value(op, criteria) if isinstance(criteria, str) else criteria
+        self._conditions.append(Condition(column, op, value, negate != self._negate_next))
+        self._negate_next = False
+        return self
+
+    def _add(self, column: str, op: str, value: Any) -> "_FilterBuilder":
+        self._conditions.append(Condition(column, op, value, self._negate_next))
+        self._negate_next = False
+        return self
+
+    @property
+    def not_(self) -> "_FilterBuilder":
+        self._negate_next = True
+        return self
+
+    def eq(self, column: str, value: Any) -> "_FilterBuilder":
+        return self._add(column, "eq", value)
+
+    def neq(self, column: str, value: Any) -> "_FilterBuilder":
+        return self._add(column, "neq", value)
+
+    def gt(self, column: str, value: Any) -> "_FilterBuilder":
+        return self._add(column, "gt", value)
+
+    def gte(self, column: str, value: Any) -> "_FilterBuilder":
+        return self._add(column, "gte", value)
+
+    def lt(self, column: str, value: Any) -> "_FilterBuilder":
+        return self._add(column, "lt", value)
+
+    def lte(self, column: str, value: Any) -> "_FilterBuilder":
+        return self._add(column, "lte", value)
+
+    def like(self, column: str, pattern: str) -> "_FilterBuilder":
+        return self._add(column, "like", pattern)
+
+    def ilike(self, column: str, pattern: str) -> "_FilterBuilder":
+        return self._add(column, "ilike", pattern)
+
+    def is_(self, column: str, value: Any) -> "_FilterBuilder":
+        return self._add(column, "is", _parse_value("is", str(value)) if isinstance(value, str) else value)
+
+    def in_(self, column: str, values: Sequence[Any]) -> "_FilterBuilder":
+        return self._add(column, "in", list(values))
+
+    def contains(self, column: str, value: Any) -> "_FilterBuilder":
+        return self._add(column, "cs", value)
+
+    def contained_by(self, column: str, value: Any) -> "_FilterBuilder":
+        return self._add(column, "cd", value)
+
+    def ov(self, column: str, value: Any) -> "_FilterBuilder":
+        return self._add(column, "ov", value)
+
+    overlaps = ov
+
+    def text_search(self, column: str, query: str, options: Optional[Dict[str, Any]] = None) -> "_FilterBuilder":
+        return self._add(column, "fts", query)
+
+    def match(self, query: Dict[str, Any]) -> "_FilterBuilder":
+        for column, value in query.items():
+            self.eq(column, value)
+        return self
+
+    def or_(self, filters: str, reference_table: Optional[str] = None) -> "_FilterBuilder":
+        nodes = parse_logic(filters)
+        if reference_table:
+            for node in nodes:
+                if isinstance(node, Condition):
+                    node.column = f"{reference_table}.{node.column}"
+        self._conditions.append(Logic("or", nodes, self._negate_next))
+        self._negate_next = False
+        return self
+
+    # Ordering and paging
+
+    def order(
+        self,
+        column: str,
+        *,
+        desc: bool = False,
+        nullsfirst: Optional[bool] = None,
+        foreign_table: Optional[str] = None,
+    ) -> "_FilterBuilder":
+        self._order.append((f"{foreign_table}.{column}" if foreign_table else column, desc, nullsfirst))
+        return self
+
+    def limit(self, size: int, *, foreign_table: Optional[str] = None) -> "_FilterBuilder":
+        if foreign_table is None:
+            self._limit = size
+        return self
+
+    def offset(self, size: int) -> "_FilterBuilder":
+        self._offset = size
+        return self
+
+    def range(self, start: int, end: int, foreign_table: Optional[str] = None) -> "_FilterBuilder":
+        if foreign_table is None:
+            self._offset, self._limit = start, end - start + 1
+        return self
+
+    def single(self) -> "_FilterBuilder":
+        self._single = "single"
+        return self
+
+    def maybe_single(self) -> "_FilterBuilder":
+        self._single = "maybe"
+        return self
+
+    # Evaluation
+
+    def _top_level(self) -> List[Union[Condition, Logic]]:
+        return [node for node in self._conditions if isinstance(node, Logic) or "." not in node.column]
+
+    def _embedded(self, key: str) -> List[Condition]:
+        prefix = f"{key}."
+        return [
+            Condition(node.column[len(prefix):], node.op, node.value, node.negate)
+            for node in self._conditions
+            if isinstance(node, Condition)
+            and node.column.startswith(prefix)
+            and "." not in node.column[len(prefix):]
+        ]
+
+    def _sort(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        keys = [(column, desc, nullsfirst) for column, desc, nullsfirst in self._order if "." not in column]
+        if not keys:
+            return rows
+
+        def compare(a: Dict[str, Any], b: Dict[str, Any]) -> int:
+            for column, desc, nullsfirst in keys:
+                x, y = a.get(column), b.get(column)
+                if x is None or y is None:
+                    if x is None and y is None:
+                        continue
+                    # Postgres puts NULLs last ascending and first descending
+                    nulls_first = desc if nullsfirst is None else nullsfirst
+                    return (-1 if nulls_first else 1) * (1 if x is None else -1)
+                x, y = _sort_value(x), _sort_value(y)
+                try:
+                    result = (x > y) - (x < y)
+                except TypeError:
+                    result = (str(x) > str(y)) - (str(x) < str(y))
+                if result:
+                    return -result if desc else result
+            return 0
+
+        return sorted(rows, key=cmp_to_key(compare))
+
+    def _page(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        end = None if self._limit is None else self._offset + self._limit
+        return rows[self._offset:end]
+
+    def _project(self, table: Optional[FakeTable], row: Dict[str, Any], selection: Selection) -> Dict[str, Any]:
+        output: Dict[str, Any] = {}
+        for key, column in selection.columns:
+            if column == "*":
+                output.update(_copy_row(row))
+            elif column in row:
+                value = row[column]
+                output[key] = copy.deepcopy(value) if isinstance(value, (list, dict)) else value
+            else:
+                name = table.name if table is not None else "result"
+                raise _error(f"column {name}.{column} does not exist", "42703")
+        return output
+
+    def _respond(self, rows: List[Dict[str, Any]], count: Optional[int]) -> Any:
+        if self._single is None:
+            return APIResponse.model_construct(data=rows, count=count)
+        if len(rows) == 1:
+            return SingleAPIResponse.model_construct(data=rows[0], count=count)
+        if self._single == "maybe" and not rows:
+            return None
+        raise _error(
+            "JSON object requested, multiple (or no) rows returned",
+            "PGRST116",
+            f"The result contains {len(rows)} rows",
+        )
+
+
+class FakeQueryBuilder(_FilterBuilder):
+    """table(name) builder: select, insert, upsert, update or delete plus filters"""
+
+    def __init__(self, client: "FakeAsyncClient", table: str):
+        super().__init__(client)
+        self._table_name = table
+        self._verb = "select"
+        self._payload: Any = None
+        self._returning = "representation"
+        self._on_conflict: Optional[Tuple[str, ...]] = None
+        self._ignore_duplicates = False
+
+    def select(self, *columns: str, count: Any = None, head: Optional[bool] = None) -> "FakeQueryBuilder":
+        self._selection = parse_select(",".join(columns) or "*")
+        if self._verb == "select":
+            self._count = _value(count)
+        else:
+            # select() after a write asks for the written rows back
+            self._returning = "representation"
+        return self
+
+    def insert(
+        self,
+        json: Any,
+        *,
+        count: Any = None,
+        returning: Any = "representation",
+        upsert: bool = False,
+        default_to_null: bool = True,
+    ) -> "FakeQueryBuilder":
+        self._verb = "upsert" if upsert else "insert"
+        self._payload, self._count, self._returning = json, _value(count), _value(returning)
+        return self
+
+    def upsert(
+        self,
+        json: Any,
+        *,
+        count: Any = None,
+        returning: Any = "representation",
+        ignore_duplicates: bool = False,
+        on_conflict: str = "",
+        default_to_null: bool = True,
+    ) -> "FakeQueryBuilder":
+        self.insert(json, count=count, returning=returning, upsert=True)
+        self._ignore_duplicates = ignore_duplicates
+        self._on_conflict = tuple(column.strip() for column in on_conflict.split(",")) if on_conflict else None
+        return self
+
+    def update(self, json: Dict[str, Any], *, count: Any = None, returning: Any = "representation") -> "FakeQueryBuilder":
+        self._verb = "update"
+        self._payload, self._count, self._returning = json, _value(count), _value(returning)
+        return self
+
+    def delete(self, *, count: Any = None, returning: Any = "representation") -> "FakeQueryBuilder":
+        self._verb = "delete"
+        self._count, self._returning = _value(count), _value(returning)
+        return self
+
+    async def execute(self) -> Any:
+        await self._client.simulate_latency()
+        table = self._db.table(self._table_name)
+
+        if self._verb == "select":
+            return self._select(table)
+        if self._verb in ("insert", "upsert"):
+            return self._insert(table)
+        if self._verb == "update":
+            return self._write(table, self._update_rows)
+        return self._write(table, self._delete_rows)
+
+    # Reads
+
+    def _candidates(self, table: FakeTable) -> List[int]:
+        """Rowids passing the top-level filters, narrowed through the best hash index."""
+        best = None
+        for node in self._top_level():
+            if isinstance(node, Condition) and not node.negate and node.op in ("eq", "in"):
+                found = table.lookup(node.column, node.value if node.op == "in" else [node.value])
+                if found is not None and (best is None or len(found) < len(best)):
+                    best = found
+
+        rowids = sorted(best) if best is not None else list(table.rows)
+        conditions = self._top_level()
+        return [rowid for rowid in rowids if all(matches(table.rows[rowid], node) for node in conditions)]
+
+    def _relation(self, table: FakeTable, name: str) -> Tuple[str, FakeTable, str, str]:
+        """('one' | 'many', target table, local column, remote column) for an embed"""
+        foreign_keys = table.schema.foreign_keys
+        if name in foreign_keys:
+            return "one", self._db.table(foreign_keys[name]), name, "id"
+
+        if name in self._db.tables:
+            target = self._db.tables[name]
+            local = [column for column, referenced in foreign_keys.items() if referenced == name]
+            remote = [column for column, referenced in target.schema.foreign_keys.items() if referenced == table.name]
+            if len(local) == 1:
+                return "one", target, local[0], "id"
+            if not local and len(remote) == 1:
+                return "many", target, "id", remote[0]
+            if local or len(remote) > 1:
+                raise _error(
+                    f"Could not embed because more than one relationship was found for '{table.name}' and '{name}'",
+                    "PGRST201",
+                )
+
+        raise _error(
+            f"Could not find a relationship between '{table.name}' and '{name}' in the schema cache",
+            "PGRST200",
+        )
+
+    def _embed(self, table: FakeTable, row: Dict[str, Any], selection: Selection, path: str = "") -> Optional[Dict[str, Any]]:
+        """Project a row with its embedded resources; None if an inner embed matched nothing."""
+        output = self._project(table, row, selection)
+        for embed in selection.embeds:
+            kind, target, local, remote = self._relation(table, embed.name)
+            key = f"{path}{embed.key}"
+            conditions = self._embedded(key)
+
+            related = []
+            value = row.get(local)
+            if value is not None:
+                for rowid in target.find(remote, value):
+                    candidate = target.rows[rowid]
+                    if all(matches(candidate, condition) for condition in conditions):
+                        embedded = self._embed(target, candidate, embed.selection, f"{key}.")
+                        if embedded is not None:
+                            related.append(embedded)
+
+            if embed.inner and not related:
+                return None
+            output[embed.key] = related if kind == "many" else (related[0] if related else None)
+        return output
+
+    def _select(self, table: FakeTable) -> Any:
+        rows = [table.rows[rowid] for rowid in self._candidates(table)]
+        has_inner = any(embed.inner for embed in self._selection.embeds)
+
+        if has_inner:
+            # Inner embeds drop parent rows, so they decide what gets counted and paged
+            pairs = [(row, self._embed(table, row, self._selection)) for row in rows]
+            pairs = [(row, output) for row, output in pairs if output is not None]
+            outputs = {id(row): output for row, output in pairs}
+            rows = self._sort([row for row, _ in pairs])
+            count = len(rows)
+            result = [outputs[id(row)] for row in self._page(rows)]
+        else:
+            rows = self._sort(rows)
+            count = len(rows)
+            result = [self._embed(table, row, self._selection) for row in self._page(rows)]
+
+        return self._respond(result, count if self._count else None)
+
+    # Writes
+
+    def _returned(self, table: FakeTable, rows: List[Dict[str, Any]]) -> Any:
+        count = len(rows) if self._count else None
+        if self._returning == "minimal":
+            return APIResponse.model_construct(data=[], count=count)
+        return self._respond([self._embed(table, row, self._selection) for row in rows], count)
+
+    def _insert(self, table: FakeTable) -> Any:
+        payload = self._payload if isinstance(self._payload, list) else [self._payload]
+        undo: List[Tuple[int, Optional[Dict[str, Any]]]] = []
+        written: List[int] = []
+        try:
+            for values in payload:
+                existing = table.find_conflict(values, self._on_conflict) if self._verb == "upsert" else None
+                if existing is None:
+                    rowid = table.insert(values)
+                    undo.append((rowid, None))
+                    written.append(rowid)
+                elif not self._ignore_duplicates:
+                    undo.append((existing, dict(table.rows[existing])))
+                    table.update(existing, values)
+                    written.append(existing)
+        except APIError:
+            # Statements are atomic
+            for rowid, previous in reversed(undo):
+                if previous is None:
+                    table.delete(rowid)
+                else:
+                    table.update(rowid, previous)
+            raise
+        return self._returned(table, [table.rows[rowid] for rowid in written])
+
+    def _update_rows(self, table: FakeTable, rowids: List[int]) -> List[Dict[str, Any]]:
+        for rowid in rowids:
+            table.update(rowid, self._payload)
+        return [table.rows[rowid] for rowid in rowids]
+
+    def _delete_rows(self, table: FakeTable, rowids: List[int]) -> List[Dict[str, Any]]:
+        deleted = [dict(table.rows[rowid]) for rowid in rowids]
+        for rowid in rowids:
+            if rowid in table.rows:
+                self._db.delete_cascade(table.name, rowid)
+        return deleted
+
+    def _write(self, table: FakeTable, apply: Any) -> Any:
+        rows = apply(table, self._candidates(table))
+        if self._verb == "update":
+            rows = self._sort(rows)
+        return self._returned(table, rows)
+
+
+class FakeRPCBuilder(_FilterBuilder):
+    """rpc(fn, params) builder; set-returning results can be filtered, ordered and paged"""
+
+    def __init__(self, client: "FakeAsyncClient", fn: str, params: Dict[str, Any], count: Any = None):
+        super().__init__(client)
+        self._fn = fn
+        self._params = params
+        self._count = _value(count)
+
+    def select(self, *columns: str) -> "FakeRPCBuilder":
+        self._selection = parse_select(",".join(columns) or "*")
+        return self
+
+    async def execute(self) -> Any:
+        await self._client.simulate_latency()
+        function = self._db.functions.get(self._fn)
+        if function is None:
+            raise _error(
+                f"Could not find the function public.{self._fn} in the schema cache",
+                "PGRST202",
+            )
+
+        result = function(self._db, copy.deepcopy(self._params), self._client.user_id)
+        if not (isinstance(result, list) and all(isinstance(row, dict) for row in result)):
+            return APIResponse.model_construct(data=result, count=None)
+
+        rows = self._sort([row for row in result if all(matches(row, node) for node in self._top_level())])
+        count = len(rows) if self._count else None
+        return self._respond([self._project(None, row, self._selection) for row in self._page(rows)], count)
@@ -0,0 +1,76 @@
+"""Per-request accounting of Supabase calls"""
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from .instrumented import CallObserver, SupabaseCall
+
+
+class CallBudgetExceeded(Exception):
+    """Raised when a request makes more Supabase calls than its budget allows"""
+
+
+class CallLedger(CallObserver):
+    """
+    Records every Supabase call made while serving one request.
+
+    Calls that share a shape (same table or function, verb and filtered columns)
+    and repeat at least ``n_plus_one_threshold`` times are reported as a probable
+    N+1: one query per parent row where a single batched query would do.
+
+    Args:
+        budget: Maximum number of calls; the call past it raises CallBudgetExceeded
+            before it is sent. None means unlimited.
+        n_plus_one_threshold: Repetitions of one shape that count as an N+1
+    """
+
+    def __init__(self, budget: Optional[int] = None, n_plus_one_threshold: int = 3):
+        self.budget = budget
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self.calls: List[SupabaseCall] = []
+        self.started = 0
+
+    def call_started(self, call: SupabaseCall) -> None:
+        self.started += 1
+        if self.budget is not None and self.started > self.budget:
+            raise CallBudgetExceeded(
+                f"Supabase call budget of {self.budget} exceeded by {call.shape}"
+            )
+
+    def call_finished(self, call: SupabaseCall) -> None:
+        self.calls.append(call)
+
+    @property
+    def count(self) -> int:
+        """Number of completed calls"""
+        return len(self.calls)
+
+    @property
+    def total_duration(self) -> float:
+        """Seconds spent waiting on calls (concurrent calls overlap)"""
+        return sum(call.duration or 0 for call in self.calls)
+
+    def suspected_n_plus_one(self) -> Dict[str, int]:
+        """Shapes repeated at least n_plus_one_threshold times, with their counts"""
+        counts = Counter(call.shape for call in self.calls)
+        return {
+            shape: count
+            for shape, count in counts.most_common()
+            if count >= self.n_plus_one_threshold
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """JSON-serializable report of the request's calls"""
+        return {
+            "count": self.count,
+            "totalMs": round(self.total_duration * 1000, 3),
+            "calls": [
+                {
+                    "shape": call.shape,
+                    "ms": round((call.duration or 0) * 1000, 3),
+                    "rows": call.rows,
+                    "error": type(call.error).__name__ if call.error else None,
+                }
+                for call in self.calls
+            ],
+            "suspectedNPlusOne": self.suspected_n_plus_one(),
+        }
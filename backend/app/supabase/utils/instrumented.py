@@ -0,0 +1,151 @@
+"""Supabase client wrapper that reports every PostgREST and RPC call to observers."""
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Any, Dict, List, Optional, Sequence
+
+from supabase import AsyncClient
+
+
+# Builder methods that choose what a table call does
+VERBS = {"select", "insert", "update", "upsert", "delete"}
+
+# Builder methods whose first argument is a column name; the column is part of the
+# call's shape, the value never is
+COLUMN_METHODS = {
+    "eq", "neq", "gt", "gte", "lt", "lte", "like", "ilike", "is_", "in_",
+    "contains", "contained_by", "ov", "overlaps", "fts", "plfts", "phfts", "wfts",
+    "text_search", "filter", "order",
+}
+
+# Builder methods recorded by name only
+SHAPE_METHODS = {"or_", "not_", "limit", "range", "offset", "single", "maybe_single", "csv"}
+
+
+@dataclass
+class SupabaseCall:
+    """One PostgREST request, described by its shape rather than its values"""
+
+    kind: str  # 'table' or 'rpc'
+    target: str  # table or function name
+    verb: Optional[str] = None  # 'select', 'insert', 'update', 'upsert', 'delete' or 'rpc'
+    filters: List[str] = field(default_factory=list)  # e.g. ['eq:household_id', 'order:created_at', 'limit']
+    duration: Optional[float] = None  # seconds
+    rows: Optional[int] = None
+    error: Optional[BaseException] = None
+    headers: Dict[str, str] = field(default_factory=dict)  # Added to the request, e.g. trace context
+
+    @property
+    def shape(self) -> str:
+        """Calls with the same shape differ only in the values they filter by"""
+        return f"{self.verb or 'select'} {self.target} [{', '.join(self.filters)}]"
+
+    def record(self, method: str, args: Sequence[Any]) -> None:
+        """Account for a builder method call."""
+        if method in VERBS:
+            if self.verb is None:
+                self.verb = method
+        elif method in COLUMN_METHODS and args and isinstance(args[0], str):
+            self.filters.append(f"{method.rstrip('_')}:{args[0]}")
+        elif method == "match" and args and isinstance(args[0], dict):
+            self.filters.extend(f"eq:{column}" for column in sorted(args[0]))
+        elif method in SHAPE_METHODS:
+            self.filters.append(method.rstrip("_"))
+
+
+class CallObserver:
+    """Receives every call made through an InstrumentedClient"""
+
+    def call_started(self, call: SupabaseCall) -> None:
+        """Called just before the request is sent; may add call.headers or raise to cancel it."""
+
+    def call_finished(self, call: SupabaseCall) -> None:
+        """Called once the request completed, failed or was cancelled; duration, rows and error are set."""
+
+
+def _row_count(result: Any) -> Optional[int]:
+    data = getattr(result, "data", None)
+    if isinstance(data, list):
+        return len(data)
+    if data is None:
+        return 0
+    return 1
+
+
+class _InstrumentedBuilder:
+    """Wraps a postgrest request builder, recording its shape and timing execute()."""
+
+    __slots__ = ("_builder", "_call", "_observers")
+
+    def __init__(self, builder: Any, call: SupabaseCall, observers: Sequence[CallObserver]):
+        self._builder = builder
+        self._call = call
+        self._observers = observers
+
+    def _wrap(self, result: Any) -> Any:
+        if hasattr(result, "execute"):
+            return _InstrumentedBuilder(result, self._call, self._observers)
+        return result
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._builder, name)
+
+        if not callable(attr):
+            # Properties such as `not_` return the builder itself
+            if name in SHAPE_METHODS:
+                self._call.record(name, ())
+            return self._wrap(attr)
+
+        def method(*args: Any, **kwargs: Any) -> Any:
+            self._call.record(name, args)
+            return self._wrap(attr(*args, **kwargs))
+
+        return method
+
+    async def execute(self) -> Any:
+        call = self._call
+        started: List[CallObserver] = []
+        start = perf_counter()
+        try:
+            for observer in self._observers:
+                observer.call_started(call)
+                started.append(observer)
+
+            if call.headers:
+                self._builder.request.headers.update(call.headers)
+            result = await self._builder.execute()
+            call.rows = _row_count(result)
+            return result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            call.duration = perf_counter() - start
+            # Only observers that saw the call start hear about its end
+            for observer in started:
+                observer.call_finished(call)
+
+
+class InstrumentedClient:
+    """
+    Drop-in wrapper around a Supabase AsyncClient.
+
+    table()/from_() and rpc() return builders that report each execute() to the
+    observers; everything else (auth, storage, ...) is passed through untouched.
+    """
+
+    def __init__(self, client: AsyncClient, observers: Sequence[CallObserver]):
+        self.client = client
+        self.observers = list(observers)
+
+    def table(self, table_name: str) -> Any:
+        return _InstrumentedBuilder(self.client.table(table_name), SupabaseCall("table", table_name), self.observers)
+
+    def from_(self, table_name: str) -> Any:
+        return self.table(table_name)
+
+    def rpc(self, fn: str, params: Optional[dict] = None, *args: Any, **kwargs: Any) -> Any:
+        builder = self.client.rpc(fn, params or {}, *args, **kwargs)
+        return _InstrumentedBuilder(builder, SupabaseCall("rpc", fn, verb="rpc"), self.observers)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.client, name)
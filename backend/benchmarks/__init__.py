@@ -0,0 +1,38 @@
+"""
+End-to-end GraphQL benchmarks.
+
+Drives the FastAPI app in-process through httpx's ASGI transport with a
+weighted mix of the app's common operations (households with roommates and
+profiles, chat history, expenses with splits, chore assignments, creating
+expenses, sending messages), against the in-memory Supabase stand-in seeded
+with a synthetic dataset. Latency per Supabase call and the dataset size are
+tunable.
+
+Reports throughput and p50/p95/p99 latency per operation, Supabase calls per
+operation (from the call accounting extension) and peak memory allocated per
+request (from a separate, sequential pass under tracemalloc), and compares a
+run against a stored baseline. See ``python -m benchmarks --help``.
+
+Baselines are machine specific and are not committed; record one with
+``--save-baseline`` before making a change and compare after it.
+"""
+from .environment import configure_environment
+
+configure_environment()
+
+from .dataset import Dataset, DatasetConfig, build_dataset
+from .runner import BenchmarkConfig, BenchmarkRunner, compare, format_report, run_benchmark
+from .workload import WORKLOAD, Operation
+
+__all__ = [
+    "Dataset",
+    "DatasetConfig",
+    "build_dataset",
+    "BenchmarkConfig",
+    "BenchmarkRunner",
+    "compare",
+    "format_report",
+    "run_benchmark",
+    "WORKLOAD",
+    "Operation",
+]
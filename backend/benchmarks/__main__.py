@@ -0,0 +1,90 @@
+"""
+Command line entry point:
+
+    python -m benchmarks --requests 2000 --concurrency 16 --latency-ms 2
+    python -m benchmarks --save-baseline           # record benchmarks/baseline.json
+    python -m benchmarks --fail-on-regression      # exit 1 if worse than the baseline
+"""
+import argparse
+import asyncio
+import json
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from .dataset import DatasetConfig
+from .runner import BenchmarkConfig, compare, format_report, run_benchmark
+
+
+DEFAULT_BASELINE = Path(__file__).parent / "baseline.json"
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    benchmark, dataset = BenchmarkConfig(), DatasetConfig()
+    parser = argparse.ArgumentParser(description="Benchmark the GraphQL API against the in-memory Supabase stand-in")
+    parser.add_argument("--requests", type=int, default=benchmark.requests)
+    parser.add_argument("--concurrency", type=int, default=benchmark.concurrency)
+    parser.add_argument("--warmup", type=int, default=benchmark.warmup)
+    parser.add_argument("--latency-ms", type=float, default=benchmark.latency_ms, help="simulated latency per Supabase call")
+    parser.add_argument("--jitter-ms", type=float, default=benchmark.jitter_ms)
+    parser.add_argument("--alloc-samples", type=int, default=benchmark.alloc_samples, help="requests per operation measured under tracemalloc (0 skips)")
+    parser.add_argument("--seed", type=int, default=benchmark.seed)
+    parser.add_argument("--operation", action="append", default=[], help="only run this operation (repeatable)")
+    parser.add_argument("--households", type=int, default=dataset.households)
+    parser.add_argument("--members", type=int, default=dataset.members)
+    parser.add_argument("--messages", type=int, default=dataset.messages, help="per household")
+    parser.add_argument("--expenses", type=int, default=dataset.expenses, help="per household")
+    parser.add_argument("--chores", type=int, default=dataset.chores, help="per household")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="write this run's report to --baseline")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="percent a latency or allocation figure may worsen")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--json", type=Path, help="also write the report to this file")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_benchmark(
+        BenchmarkConfig(
+            requests=args.requests,
+            concurrency=args.concurrency,
+            warmup=args.warmup,
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            alloc_samples=args.alloc_samples,
+            seed=args.seed,
+            operations=args.operation,
+        ),
+        DatasetConfig(
+            households=args.households,
+            members=args.members,
+            messages=args.messages,
+            expenses=args.expenses,
+            chores=args.chores,
+        ),
+    ))
+
+    baseline = None
+    if not args.save_baseline and args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+    print(format_report(report, baseline))
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2))
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"baseline saved to {args.baseline}")
+        return 0
+
+    if baseline is None:
+        return 0
+    regressions = compare(report, baseline, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) against {args.baseline}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1 if args.fail_on_regression else 0
+    print(f"\nno regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,144 @@
+"""Synthetic households seeded into the in-memory Supabase stand-in"""
+import random
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List
+
+from app.supabase.fake import FakeDatabase, create_fake_database
+
+
+@dataclass
+class DatasetConfig:
+    """Size of the generated dataset"""
+
+    households: int = 50
+    members: int = 4  # accepted roommates per household
+    messages: int = 200  # per household
+    expenses: int = 40  # per household, each split between every member
+    chores: int = 10  # per household
+    assignments: int = 5  # per chore, rotating through the members
+    seed: int = 42
+
+
+@dataclass
+class Dataset:
+    """A seeded database and the ids the workload picks from"""
+
+    config: DatasetConfig
+    database: FakeDatabase
+    users: List[str] = field(default_factory=list)
+    households: List[str] = field(default_factory=list)
+    invite_codes: Dict[str, str] = field(default_factory=dict)  # household id -> invite code
+    members: Dict[str, List[str]] = field(default_factory=dict)  # household id -> user ids
+    household_of: Dict[str, str] = field(default_factory=dict)  # user id -> household id
+    expenses: Dict[str, List[str]] = field(default_factory=dict)  # household id -> expense ids
+    chores: Dict[str, List[str]] = field(default_factory=dict)  # household id -> chore ids
+    assignments: Dict[str, List[str]] = field(default_factory=dict)  # user id -> chore assignment ids
+
+
+def build_dataset(config: DatasetConfig = DatasetConfig()) -> Dataset:
+    """
+    Seed a fresh database with ``config.households`` households.
+
+    Ids, amounts and timestamps come from a random generator seeded with
+    ``config.seed``, so two runs with the same config see the same data.
+    """
+    rng = random.Random(config.seed)
+    dataset = Dataset(config=config, database=create_fake_database())
+    db = dataset.database
+    now = datetime.now(timezone.utc)
+
+    def uid() -> str:
+        return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+    def ago(days: float) -> str:
+        return (now - timedelta(days=days)).isoformat()
+
+    for h in range(config.households):
+        members = [uid() for _ in range(config.members)]
+        db.seed("profiles", [
+            {"id": user_id, "email": f"user{h}-{m}@example.com", "full_name": f"User {h}-{m}"}
+            for m, user_id in enumerate(members)
+        ])
+
+        household_id = uid()
+        db.seed("households", [{
+            "id": household_id,
+            "name": f"Household {h}",
+            "created_by": members[0],
+            "invite_code": f"BENCH{h:05d}",
+            "created_at": ago(120),
+        }])
+        db.seed("roommates", [
+            {"user_id": user_id, "household_id": household_id, "status": "accepted", "joined_at": ago(120)}
+            for user_id in members
+        ])
+
+        db.seed("messages", [
+            {
+                "household_id": household_id,
+                "sender_id": rng.choice(members),
+                "content": f"Message {i}",
+                "created_at": ago(90 * (config.messages - i) / config.messages),
+            }
+            for i in range(config.messages)
+        ])
+
+        expenses = db.seed("expenses", [
+            {
+                "household_id": household_id,
+                "title": f"Expense {i}",
+                "amount": round(rng.uniform(5, 500), 2),
+                "category": rng.choice(["rent", "utilities", "groceries", "other"]),
+                "paid_by": rng.choice(members),
+                "created_at": ago(rng.uniform(0, 90)),
+                "due_date": ago(rng.uniform(-30, 60)),
+            }
+            for i in range(config.expenses)
+        ])
+        db.seed("expense_splits", [
+            {
+                "expense_id": expense["id"],
+                "user_id": user_id,
+                "amount": round(expense["amount"] / len(members), 2),
+                "is_paid": user_id == expense["paid_by"] or rng.random() < 0.5,
+            }
+            for expense in expenses
+            for user_id in members
+        ])
+
+        chores = db.seed("chores", [
+            {
+                "household_id": household_id,
+                "title": f"Chore {i}",
+                "points": rng.randint(1, 10),
+                "recurrence": "weekly",
+                "created_by": members[0],
+            }
+            for i in range(config.chores)
+        ])
+        assignments = db.seed("chore_assignments", [
+            {
+                "chore_id": chore["id"],
+                "user_id": members[(c + week) % len(members)],
+                "due_date": ago(7 * (config.assignments - week - 2)),
+                "is_complete": week < config.assignments - 2,
+            }
+            for c, chore in enumerate(chores)
+            for week in range(config.assignments)
+        ])
+
+        dataset.users.extend(members)
+        dataset.households.append(household_id)
+        dataset.invite_codes[household_id] = f"BENCH{h:05d}"
+        dataset.members[household_id] = members
+        dataset.household_of.update((user_id, household_id) for user_id in members)
+        dataset.expenses[household_id] = [expense["id"] for expense in expenses]
+        dataset.chores[household_id] = [chore["id"] for chore in chores]
+        for user_id in members:
+            dataset.assignments[user_id] = [
+                assignment["id"] for assignment in assignments if assignment["user_id"] == user_id
+            ]
+
+    return dataset
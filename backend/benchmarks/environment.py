@@ -0,0 +1,19 @@
+"""Environment the app is imported with when benchmarked"""
+import os
+
+
+def configure_environment() -> None:
+    """
+    Dummy Supabase settings, a known JWT secret, quiet logs and call accounting.
+
+    The app's config objects read the environment when first imported, so this
+    runs from the package's __init__, before anything under app is imported.
+    Values already set are kept, except call accounting, which the per-operation
+    call counts come from.
+    """
+    os.environ.setdefault("SUPABASE_URL", "http://localhost")
+    os.environ.setdefault("SUPABASE_KEY", "benchmark")
+    os.environ.setdefault("SUPABASE_ANON_KEY", "benchmark")
+    os.environ.setdefault("SUPABASE_JWT_SECRET", "benchmark-secret")
+    os.environ.setdefault("LOG_LEVEL", "ERROR")
+    os.environ["SUPABASE_CALL_ACCOUNTING"] = "true"
@@ -0,0 +1,283 @@
+"""
+Replays captured GraphQL traffic against the app.
+
+    python -m benchmarks.replay capture.jsonl                # original pace
+    python -m benchmarks.replay capture.jsonl --speed 10     # ten times faster
+    python -m benchmarks.replay capture.jsonl --speed 0      # as fast as --concurrency allows
+
+Captures come from TrafficCaptureMiddleware (TRAFFIC_CAPTURE_PATH) and hold no
+ids or text, so each request is re-issued against a synthetic dataset, as in
+the benchmark: every captured caller becomes one dataset user, and string
+variables and blanked string literals are filled by name (householdId with the
+user's household, expenseId with one of its expenses, and so on). Floats get a
+random value; ints, booleans and list lengths are as captured.
+
+With a positive speed, requests are sent on the captured schedule whether or
+not earlier ones have finished, so a slower app builds up load as production
+would. Reports latency per operation next to the latency it had when captured,
+in the benchmark's report format, so --baseline and --save-baseline work as
+they do there.
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from graphql import ArgumentNode, ObjectFieldNode, StringValueNode, Visitor, parse, print_ast, visit
+
+from app.observability import CapturedRequest, LatencyHistogram, read_capture
+
+from .dataset import Dataset, DatasetConfig, build_dataset
+from .runner import (
+    BenchmarkConfig,
+    BenchmarkRunner,
+    OperationStats,
+    build_report,
+    compare,
+    format_report,
+    load_app,
+    record_response,
+)
+from .workload import Operation
+
+
+@dataclass
+class ReplayConfig:
+    speed: float = 1.0  # 0 sends as fast as `concurrency` workers can
+    concurrency: int = 16
+    limit: Optional[int] = None  # replay only the first `limit` requests
+    latency_ms: float = 2.0
+    jitter_ms: float = 1.0
+    seed: int = 7
+
+
+@dataclass
+class Caller:
+    """The dataset user a captured caller is replayed as"""
+
+    user_id: Optional[str]
+    household_id: str
+
+
+# Values for string variables and literals, by the variable or argument name
+POOLS: Dict[str, Callable[[Dataset, Caller], List[str]]] = {
+    "householdId": lambda dataset, caller: [caller.household_id],
+    "expenseId": lambda dataset, caller: dataset.expenses[caller.household_id],
+    "choreId": lambda dataset, caller: dataset.chores[caller.household_id],
+    "assignmentId": lambda dataset, caller: dataset.assignments.get(caller.user_id, []),
+    "userId": lambda dataset, caller: dataset.members[caller.household_id],
+    "splitWith": lambda dataset, caller: dataset.members[caller.household_id],
+    "inviteCode": lambda dataset, caller: [dataset.invite_codes[caller.household_id]],
+}
+
+
+def _pool(name: Optional[str], dataset: Dataset, caller: Caller) -> List[str]:
+    pool = POOLS.get(name or "")
+    return pool(dataset, caller) if pool else []
+
+
+def _fill_string(name: Optional[str], rng: random.Random, dataset: Dataset, caller: Caller) -> str:
+    pool = _pool(name, dataset, caller)
+    return rng.choice(pool) if pool else "replay"
+
+
+def fill_variables(shape: Any, rng: random.Random, dataset: Dataset, caller: Caller, name: Optional[str] = None) -> Any:
+    """Concrete variables for a captured shape"""
+    if isinstance(shape, dict):
+        return {key: fill_variables(value, rng, dataset, caller, key) for key, value in shape.items()}
+    if isinstance(shape, list):
+        pool = _pool(name, dataset, caller)
+        if pool and all(item == "str" for item in shape):
+            # Distinct ids, as in e.g. the users an expense is split with
+            return rng.sample(pool, min(len(shape), len(pool)))
+        return [fill_variables(item, rng, dataset, caller, name) for item in shape]
+    if shape == "str":
+        return _fill_string(name, rng, dataset, caller)
+    if shape == "float":
+        return round(rng.uniform(1, 100), 2)
+    return shape
+
+
+class _FillLiterals(Visitor):
+    def __init__(self, rng: random.Random, dataset: Dataset, caller: Caller):
+        super().__init__()
+        self.fill = lambda name: StringValueNode(value=_fill_string(name, rng, dataset, caller))
+
+    def enter_argument(self, node: ArgumentNode, *_):
+        if isinstance(node.value, StringValueNode):
+            return ArgumentNode(name=node.name, value=self.fill(node.name.value))
+
+    def enter_object_field(self, node: ObjectFieldNode, *_):
+        if isinstance(node.value, StringValueNode):
+            return ObjectFieldNode(name=node.name, value=self.fill(node.name.value))
+
+
+class ReplayRunner(BenchmarkRunner):
+    """Re-issues captured requests and collects per-operation stats"""
+
+    def __init__(self, app, secret: str, dataset: Dataset, config: ReplayConfig, captured: List[CapturedRequest]):
+        super().__init__(app, secret, dataset, BenchmarkConfig(concurrency=config.concurrency, seed=config.seed))
+        self.replay_config = config
+        self.captured = captured
+        self._callers: Dict[Optional[str], Caller] = {}
+        self._next_user = 0
+        self._documents: Dict[str, Any] = {}
+
+    def caller(self, pseudonym: Optional[str]) -> Caller:
+        """Captured callers map to dataset users in order of first appearance."""
+        caller = self._callers.get(pseudonym)
+        if caller is None:
+            if pseudonym is None:
+                caller = Caller(None, self.rng.choice(self.dataset.households))
+            else:
+                user_id = self.dataset.users[self._next_user % len(self.dataset.users)]
+                self._next_user += 1
+                caller = Caller(user_id, self.dataset.household_of[user_id])
+            self._callers[pseudonym] = caller
+        return caller
+
+    def prepare(self, request: CapturedRequest) -> tuple:
+        """(operation, user id, variables) to send for a captured request"""
+        caller = self.caller(request.user)
+        query = request.document
+        if '""' in query:
+            document = self._documents.get(request.document_hash)
+            if document is None:
+                document = self._documents[request.document_hash] = parse(request.document, no_location=True)
+            query = print_ast(visit(document, _FillLiterals(self.rng, self.dataset, caller)))
+        name = request.operation or f"anonymous:{request.document_hash[:8]}"
+        variables = fill_variables(request.variables, self.rng, self.dataset, caller)
+        return Operation(name, 0, query, None), caller.user_id, variables
+
+    async def replay(self) -> Dict[str, Any]:
+        stats: Dict[str, OperationStats] = {}
+        captured_latency: Dict[str, LatencyHistogram] = {}
+        overall = LatencyHistogram()
+        planned = []
+        for request in self.captured:
+            operation, user_id, variables = self.prepare(request)
+            planned.append((request.ts, operation, user_id, variables))
+            stats.setdefault(operation.name, OperationStats())
+            captured_latency.setdefault(operation.name, LatencyHistogram()).record(request.duration_ms / 1000)
+
+        async def issue(operation: Operation, user_id: Optional[str], variables: Dict[str, Any]) -> None:
+            elapsed, body = await self.send(operation, user_id, variables)
+            record_response(stats[operation.name], overall, elapsed, body)
+
+        started = time.perf_counter()
+        try:
+            if self.replay_config.speed > 0 and planned:
+                first = planned[0][0]
+                tasks = []
+                for ts, operation, user_id, variables in planned:
+                    due = (ts - first) / self.replay_config.speed
+                    delay = due - (time.perf_counter() - started)
+                    if delay > 0:
+                        await asyncio.sleep(delay)
+                    tasks.append(asyncio.create_task(issue(operation, user_id, variables)))
+                await asyncio.gather(*tasks)
+            else:
+                planned.reverse()
+
+                async def worker():
+                    while planned:
+                        _, operation, user_id, variables = planned.pop()
+                        await issue(operation, user_id, variables)
+
+                await asyncio.gather(*(worker() for _ in range(self.replay_config.concurrency)))
+        finally:
+            await self.client.aclose()
+        duration = time.perf_counter() - started
+
+        report = build_report(
+            {"replay": asdict(self.replay_config), "dataset": asdict(self.dataset.config)},
+            stats,
+            overall,
+            duration,
+        )
+        for name, histogram in captured_latency.items():
+            report["operations"][name]["captured_p50_ms"] = round(histogram.percentile(50) * 1000, 3)
+            report["operations"][name]["captured_p95_ms"] = round(histogram.percentile(95) * 1000, 3)
+        return report
+
+
+async def replay_capture(
+    path: str,
+    config: ReplayConfig = ReplayConfig(),
+    dataset_config: DatasetConfig = DatasetConfig(),
+) -> Dict[str, Any]:
+    """Seed a dataset, replay the capture at `path` against it and return the report"""
+    captured = list(read_capture(path))
+    if config.limit is not None:
+        captured = captured[:config.limit]
+    dataset = build_dataset(dataset_config)
+    app, secret = load_app(dataset, BenchmarkConfig(latency_ms=config.latency_ms, jitter_ms=config.jitter_ms))
+    return await ReplayRunner(app, secret, dataset, config, captured).replay()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    replay, dataset = ReplayConfig(), DatasetConfig()
+    parser = argparse.ArgumentParser(description="Replay captured GraphQL traffic against the in-memory Supabase stand-in")
+    parser.add_argument("capture", type=Path)
+    parser.add_argument("--speed", type=float, default=replay.speed, help="multiple of the captured pace; 0 sends as fast as possible")
+    parser.add_argument("--concurrency", type=int, default=replay.concurrency, help="workers when --speed is 0")
+    parser.add_argument("--limit", type=int, help="replay only the first LIMIT requests")
+    parser.add_argument("--latency-ms", type=float, default=replay.latency_ms, help="simulated latency per Supabase call")
+    parser.add_argument("--jitter-ms", type=float, default=replay.jitter_ms)
+    parser.add_argument("--seed", type=int, default=replay.seed)
+    parser.add_argument("--households", type=int, default=dataset.households)
+    parser.add_argument("--members", type=int, default=dataset.members)
+    parser.add_argument("--messages", type=int, default=dataset.messages, help="per household")
+    parser.add_argument("--expenses", type=int, default=dataset.expenses, help="per household")
+    parser.add_argument("--chores", type=int, default=dataset.chores, help="per household")
+    parser.add_argument("--baseline", type=Path, help="report of an earlier replay to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="write this replay's report to --baseline")
+    parser.add_argument("--tolerance", type=float, default=10.0, help="percent a latency figure may worsen")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args(argv)
+    if args.save_baseline and args.baseline is None:
+        parser.error("--save-baseline needs --baseline")
+
+    report = asyncio.run(replay_capture(
+        str(args.capture),
+        ReplayConfig(
+            speed=args.speed,
+            concurrency=args.concurrency,
+            limit=args.limit,
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            seed=args.seed,
+        ),
+        DatasetConfig(
+            households=args.households,
+            members=args.members,
+            messages=args.messages,
+            expenses=args.expenses,
+            chores=args.chores,
+        ),
+    ))
+
+    baseline = None
+    if args.baseline is not None and not args.save_baseline and args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+    print(format_report(report, baseline))
+
+    if args.save_baseline:
+        args.baseline.write_text(json.dumps(report, indent=2))
+        print(f"baseline saved to {args.baseline}")
+        return 0
+    if baseline is None:
+        return 0
+    regressions = compare(report, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"  regression: {regression}")
+    return 1 if regressions and args.fail_on_regression else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
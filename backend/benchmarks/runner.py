@@ -0,0 +1,266 @@
+"""Drives the ASGI app in-process and measures each operation of the workload"""
+import asyncio
+import random
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from jose import jwt
+
+from app.observability import LatencyHistogram
+from app.supabase.fake import fake_client_factory
+
+from .dataset import Dataset, DatasetConfig, build_dataset
+from .workload import Operation, select_operations
+
+
+@dataclass
+class BenchmarkConfig:
+    """How a run drives the app"""
+
+    requests: int = 2000
+    concurrency: int = 16
+    warmup: int = 200
+    latency_ms: float = 2.0  # simulated PostgREST round trip per Supabase call
+    jitter_ms: float = 1.0
+    alloc_samples: int = 20  # per operation, measured separately under tracemalloc
+    seed: int = 7
+    operations: List[str] = field(default_factory=list)  # empty runs the whole workload
+
+
+@dataclass
+class OperationStats:
+    histogram: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: int = 0
+    supabase_calls: int = 0
+    alloc_bytes: List[int] = field(default_factory=list)
+
+    def summary(self) -> Dict[str, Any]:
+        count = self.histogram.count
+        return {
+            "count": count,
+            "errors": self.errors,
+            "mean_ms": round(self.histogram.sum / count * 1000, 3) if count else 0.0,
+            "p50_ms": round(self.histogram.percentile(50) * 1000, 3),
+            "p95_ms": round(self.histogram.percentile(95) * 1000, 3),
+            "p99_ms": round(self.histogram.percentile(99) * 1000, 3),
+            "supabase_calls": round(self.supabase_calls / count, 2) if count else 0.0,
+            "alloc_kib": round(sum(self.alloc_bytes) / len(self.alloc_bytes) / 1024, 1) if self.alloc_bytes else 0.0,
+        }
+
+
+def load_app(dataset: Dataset, config: BenchmarkConfig):
+    """
+    Import the FastAPI app configured for benchmarking, with Supabase replaced
+    by the in-memory stand-in. Returns the app and the JWT secret to sign with.
+    """
+    import api
+
+    api.create_authenticated_client = fake_client_factory(
+        dataset.database,
+        latency=config.latency_ms / 1000,
+        jitter=config.jitter_ms / 1000,
+    )
+    return api.app, api.supabase_config.jwt_secret
+
+
+class BenchmarkRunner:
+    """Sends the workload to the app and collects per-operation stats"""
+
+    def __init__(self, app, secret: str, dataset: Dataset, config: BenchmarkConfig):
+        self.dataset = dataset
+        self.config = config
+        self.operations = select_operations(config.operations)
+        self.rng = random.Random(config.seed)
+        self.client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://benchmark")
+        self._secret = secret
+        self._tokens: Dict[str, str] = {}
+
+    def _token(self, user_id: str) -> str:
+        token = self._tokens.get(user_id)
+        if token is None:
+            token = self._tokens[user_id] = jwt.encode({"sub": user_id, "role": "authenticated"}, self._secret, algorithm="HS256")
+        return token
+
+    def plan(self, count: int) -> List[Tuple[Operation, str, Dict[str, Any]]]:
+        """`count` requests drawn from the weighted mix, with their variables"""
+        weights = [operation.weight for operation in self.operations]
+        chosen = self.rng.choices(self.operations, weights=weights, k=count)
+        return [(operation, *operation.variables(self.rng, self.dataset)) for operation in chosen]
+
+    async def send(self, operation: Operation, user_id: Optional[str], variables: Dict[str, Any]) -> Tuple[float, Dict[str, Any]]:
+        """Send one request, unauthenticated without a user; returns its wall time and the decoded response."""
+        headers = {"Authorization": f"Bearer {self._token(user_id)}"} if user_id else {}
+        started = time.perf_counter()
+        response = await self.client.post(
+            "/graphql",
+            json={"query": operation.query, "variables": variables},
+            headers=headers,
+        )
+        elapsed = time.perf_counter() - started
+        body = response.json() if response.headers.get("content-type", "").startswith("application/json") else {}
+        if response.status_code != 200:
+            body.setdefault("errors", [{"message": f"HTTP {response.status_code}"}])
+        return elapsed, body
+
+    async def load(self, stats: Optional[Dict[str, OperationStats]], overall: Optional[LatencyHistogram], count: int) -> float:
+        """Send `count` requests from `concurrency` workers; returns the wall time."""
+        queue = self.plan(count)
+        queue.reverse()
+
+        async def worker():
+            while queue:
+                operation, user_id, variables = queue.pop()
+                elapsed, body = await self.send(operation, user_id, variables)
+                if stats is not None:
+                    record_response(stats[operation.name], overall, elapsed, body)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(self.config.concurrency)))
+        return time.perf_counter() - started
+
+    async def measure_allocations(self, stats: Dict[str, OperationStats]) -> None:
+        """
+        Peak memory allocated while serving one request of each operation, sent
+        one at a time so concurrent requests don't share the peak.
+        """
+        tracemalloc.start()
+        try:
+            for operation in self.operations:
+                for _ in range(self.config.alloc_samples):
+                    user_id, variables = operation.variables(self.rng, self.dataset)
+                    before, _ = tracemalloc.get_traced_memory()
+                    tracemalloc.reset_peak()
+                    await self.send(operation, user_id, variables)
+                    _, peak = tracemalloc.get_traced_memory()
+                    stats[operation.name].alloc_bytes.append(peak - before)
+        finally:
+            tracemalloc.stop()
+
+    async def run(self) -> Dict[str, Any]:
+        stats = {operation.name: OperationStats() for operation in self.operations}
+        overall = LatencyHistogram()
+        try:
+            if self.config.warmup:
+                await self.load(None, None, self.config.warmup)
+            duration = await self.load(stats, overall, self.config.requests)
+            if self.config.alloc_samples:
+                await self.measure_allocations(stats)
+        finally:
+            await self.client.aclose()
+
+        return build_report(
+            {"benchmark": asdict(self.config), "dataset": asdict(self.dataset.config)},
+            stats,
+            overall,
+            duration,
+        )
+
+
+def record_response(entry: OperationStats, overall: LatencyHistogram, elapsed: float, body: Dict[str, Any]) -> None:
+    """Add one response's latency, errors and Supabase calls to the stats"""
+    overall.record(elapsed)
+    entry.histogram.record(elapsed)
+    if body.get("errors"):
+        entry.errors += 1
+    entry.supabase_calls += body.get("extensions", {}).get("supabaseCalls", {}).get("count", 0)
+
+
+def build_report(
+    config: Dict[str, Any],
+    stats: Dict[str, OperationStats],
+    overall: LatencyHistogram,
+    duration: float,
+) -> Dict[str, Any]:
+    """The report format_report and compare read, for a run described by `config`"""
+    return {
+        "config": config,
+        "requests": overall.count,
+        "errors": sum(entry.errors for entry in stats.values()),
+        "duration_s": round(duration, 3),
+        "throughput": round(overall.count / duration, 1) if duration else 0.0,
+        "p50_ms": round(overall.percentile(50) * 1000, 3),
+        "p95_ms": round(overall.percentile(95) * 1000, 3),
+        "p99_ms": round(overall.percentile(99) * 1000, 3),
+        "operations": {name: entry.summary() for name, entry in stats.items()},
+    }
+
+
+async def run_benchmark(
+    config: BenchmarkConfig = BenchmarkConfig(),
+    dataset_config: DatasetConfig = DatasetConfig(),
+) -> Dict[str, Any]:
+    """Seed a dataset, run the workload against it and return the report"""
+    dataset = build_dataset(dataset_config)
+    app, secret = load_app(dataset, config)
+    return await BenchmarkRunner(app, secret, dataset, config).run()
+
+
+# Metric -> (direction, whether the tolerance applies). Call counts are exact,
+# so any increase is a regression.
+COMPARED_METRICS = {
+    "p50_ms": ("lower", True),
+    "p95_ms": ("lower", True),
+    "p99_ms": ("lower", True),
+    "supabase_calls": ("lower", False),
+    "alloc_kib": ("lower", True),
+}
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """
+    Regressions of `report` against `baseline`, one line each.
+
+    Latency, allocation and throughput figures regress when they are worse by
+    more than `tolerance` percent; Supabase calls per operation regress on any
+    increase.
+    """
+    regressions = []
+    slack = tolerance / 100
+
+    if report["throughput"] < baseline.get("throughput", 0) * (1 - slack):
+        regressions.append(f"throughput: {report['throughput']} req/s (baseline {baseline['throughput']})")
+
+    for name, current in report["operations"].items():
+        previous = baseline.get("operations", {}).get(name)
+        if previous is None:
+            continue
+        for metric, (_, tolerant) in COMPARED_METRICS.items():
+            if metric not in previous or not previous[metric]:
+                continue
+            limit = previous[metric] * (1 + slack) if tolerant else previous[metric]
+            if current[metric] > limit:
+                change = (current[metric] - previous[metric]) / previous[metric] * 100
+                regressions.append(f"{name}.{metric}: {current[metric]} (baseline {previous[metric]}, +{change:.1f}%)")
+    return regressions
+
+
+def format_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> str:
+    """Human-readable table of a report, with the change from baseline when given"""
+    columns = ["count", "errors", "p50_ms", "p95_ms", "p99_ms", "supabase_calls", "alloc_kib"]
+    headers = ["operation", "count", "errors", "p50 ms", "p95 ms", "p99 ms", "calls/op", "KiB/req"]
+
+    def delta(name: str, metric: str, value: Any) -> str:
+        previous = ((baseline or {}).get("operations", {}).get(name) or {}).get(metric)
+        if metric in ("count", "errors") or not previous:
+            return str(value)
+        return f"{value} ({(value - previous) / previous * 100:+.0f}%)"
+
+    rows = [headers] + [
+        [name] + [delta(name, metric, stats[metric]) for metric in columns]
+        for name, stats in report["operations"].items()
+    ]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(headers))]
+    lines = ["  ".join(cell.ljust(widths[i]) for i, cell in enumerate(row)).rstrip() for row in rows]
+    lines.insert(1, "  ".join("-" * width for width in widths))
+    lines.append("")
+    lines.append(
+        f"{report['requests']} requests in {report['duration_s']}s: {report['throughput']} req/s, "
+        f"p50 {report['p50_ms']} ms, p95 {report['p95_ms']} ms, p99 {report['p99_ms']} ms, "
+        f"{report['errors']} errors"
+    )
+    if baseline and baseline.get("config") != report["config"]:
+        lines.append("note: baseline was recorded with a different configuration")
+    return "\n".join(lines)
@@ -0,0 +1,123 @@
+"""The operations a benchmark run sends, and how often"""
+import random
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .dataset import Dataset
+
+
+# (user id the request authenticates as, GraphQL variables)
+Request = Tuple[str, Dict[str, Any]]
+
+
+@dataclass
+class Operation:
+    """A GraphQL document, its share of the mix and how to pick its variables"""
+
+    name: str
+    weight: int
+    query: str
+    variables: Callable[[random.Random, Dataset], Request]
+
+
+def _member(rng: random.Random, dataset: Dataset) -> Tuple[str, str]:
+    user_id = rng.choice(dataset.users)
+    return user_id, dataset.household_of[user_id]
+
+
+def _my_households(rng: random.Random, dataset: Dataset) -> Request:
+    return rng.choice(dataset.users), {}
+
+
+def _household(rng: random.Random, dataset: Dataset) -> Request:
+    user_id, household_id = _member(rng, dataset)
+    return user_id, {"householdId": household_id}
+
+
+def _expense_list(rng: random.Random, dataset: Dataset) -> Request:
+    user_id, household_id = _member(rng, dataset)
+    return user_id, {
+        "householdId": household_id,
+        "expenseId": rng.choice(dataset.expenses[household_id]),
+    }
+
+
+def _create_expense(rng: random.Random, dataset: Dataset) -> Request:
+    user_id, household_id = _member(rng, dataset)
+    return user_id, {"input": {
+        "householdId": household_id,
+        "title": "Benchmark expense",
+        "amount": round(rng.uniform(5, 200), 2),
+        "category": "groceries",
+        "splitWith": dataset.members[household_id],
+    }}
+
+
+def _send_message(rng: random.Random, dataset: Dataset) -> Request:
+    user_id, household_id = _member(rng, dataset)
+    return user_id, {"input": {"householdId": household_id, "content": "Benchmark message"}}
+
+
+WORKLOAD: List[Operation] = [
+    Operation("my_households", 20, """
+        query MyHouseholds {
+          households {
+            myHouseholds {
+              id name
+              roommates { userId status points profile { id fullName avatarUrl } }
+            }
+          }
+        }
+    """, _my_households),
+    Operation("chat_history", 25, """
+        query ChatHistory($householdId: String!) {
+          messages {
+            householdMessages(householdId: $householdId, limit: 50) {
+              id senderId content messageType createdAt
+            }
+          }
+        }
+    """, _household),
+    Operation("expense_list", 15, """
+        query ExpenseList($householdId: String!, $expenseId: String!) {
+          expenses {
+            householdExpenses(householdId: $householdId, limit: 20) {
+              id title amount currency category paidBy dueDate
+            }
+            expenseSplits(expenseId: $expenseId) { id userId amount isPaid }
+          }
+        }
+    """, _expense_list),
+    Operation("chore_assignments", 15, """
+        query ChoreAssignments($householdId: String!) {
+          chores {
+            householdChoreAssignments(householdId: $householdId, limit: 50) {
+              id dueDate isComplete
+              chore { id title points }
+              user { id fullName }
+            }
+          }
+        }
+    """, _household),
+    Operation("create_expense", 10, """
+        mutation CreateExpense($input: CreateExpenseInput!) {
+          expenses { createExpense(input: $input) { id title amount } }
+        }
+    """, _create_expense),
+    Operation("send_message", 15, """
+        mutation SendMessage($input: CreateMessageInput!) {
+          messages { sendMessage(input: $input) { id content createdAt } }
+        }
+    """, _send_message),
+]
+
+
+def select_operations(names: Optional[List[str]] = None) -> List[Operation]:
+    """The workload, or only the named operations of it"""
+    if not names:
+        return WORKLOAD
+    known = {operation.name: operation for operation in WORKLOAD}
+    unknown = [name for name in names if name not in known]
+    if unknown:
+        raise Exception(f"Unknown benchmark operations: {', '.join(unknown)}")
+    return [known[name] for name in names]
@@ -0,0 +1,19 @@
+-- Indexes for the household activity feed (the activityFeed query)
+-- The feed merges four newest-first streams, each read a page at a time after a
+-- (timestamp, id) position, so each needs an index in that order.
+
+CREATE INDEX IF NOT EXISTS idx_messages_household_created_at
+  ON public.messages(household_id, created_at DESC, id DESC);
+
+CREATE INDEX IF NOT EXISTS idx_expenses_household_created_at
+  ON public.expenses(household_id, created_at DESC, id DESC);
+
+-- Payments and completed chores reach their household through the expense or
+-- chore, which the partial indexes below are joined to
+CREATE INDEX IF NOT EXISTS idx_expense_splits_paid_at
+  ON public.expense_splits(paid_at DESC, id DESC)
+  WHERE is_paid AND paid_at IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS idx_chore_assignments_completed_at
+  ON public.chore_assignments(completed_at DESC, id DESC)
+  WHERE is_complete AND completed_at IS NOT NULL;
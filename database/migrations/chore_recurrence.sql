@@ -0,0 +1,102 @@
+-- Support for the recurring chore scheduler (app/jobs/chore_recurrence.py)
+-- The job materializes upcoming chore_assignments for every recurring chore in bulk.
+-- Every due date it generates is claimed in chore_recurrence_slots first, so
+-- re-running the job (or two overlapping runs) never assigns a chore's due date
+-- twice. Assignments made by hand are not constrained: a chore can still be
+-- given to two roommates for the same due date.
+
+-- The job pages through recurring chores in (household_id, id) order
+CREATE INDEX IF NOT EXISTS idx_chores_recurring_household
+  ON public.chores(household_id, id)
+  WHERE recurrence <> 'none';
+
+-- Open assignments per user are the rotation's pending load
+CREATE INDEX IF NOT EXISTS idx_chore_assignments_open_user
+  ON public.chore_assignments(user_id)
+  WHERE is_complete = false;
+
+-- Due dates the job has generated an assignment for; a chore's latest one is
+-- where generation resumes
+CREATE TABLE IF NOT EXISTS public.chore_recurrence_slots (
+  chore_id UUID REFERENCES public.chores(id) ON DELETE CASCADE NOT NULL,
+  due_date TIMESTAMP WITH TIME ZONE NOT NULL,
+  PRIMARY KEY (chore_id, due_date)
+);
+
+ALTER TABLE public.chore_recurrence_slots ENABLE ROW LEVEL SECURITY;
+
+-- Each chore's latest generated due date. Assignments made by hand are left
+-- out, so one far in the future does not hold back the slots before it.
+CREATE OR REPLACE FUNCTION public.recurring_chore_latest_due(p_chore_ids UUID[])
+RETURNS TABLE (chore_id UUID, due_date TIMESTAMP WITH TIME ZONE)
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+  SELECT s.chore_id, MAX(s.due_date)
+  FROM public.chore_recurrence_slots s
+  WHERE s.chore_id = ANY(p_chore_ids)
+  GROUP BY s.chore_id
+  ORDER BY s.chore_id;
+$$;
+
+-- Each accepted roommate's rotation load: their points plus the points of
+-- their open assignments in the household
+CREATE OR REPLACE FUNCTION public.household_rotation_loads(p_household_ids UUID[])
+RETURNS TABLE (household_id UUID, user_id UUID, load INTEGER)
+LANGUAGE sql
+STABLE
+SET search_path = public
+AS $$
+  SELECT r.household_id, r.user_id,
+         (COALESCE(r.points, 0) + COALESCE((
+           SELECT SUM(COALESCE(c.points, 0))
+           FROM public.chore_assignments ca
+           JOIN public.chores c ON c.id = ca.chore_id
+           WHERE ca.user_id = r.user_id
+             AND c.household_id = r.household_id
+             AND ca.is_complete = false
+         ), 0))::INTEGER
+  FROM public.roommates r
+  WHERE r.household_id = ANY(p_household_ids)
+    AND r.status = 'accepted'
+  ORDER BY r.household_id, r.user_id;
+$$;
+
+-- Inserts the planned assignments whose (chore, due date) no run has claimed yet
+CREATE OR REPLACE FUNCTION public.materialize_chore_assignments(p_assignments JSONB)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SET search_path = public
+AS $$
+DECLARE
+  v_inserted INTEGER;
+BEGIN
+  WITH planned AS (
+    SELECT *
+    FROM jsonb_to_recordset(p_assignments) AS p(chore_id UUID, user_id UUID, due_date TIMESTAMP WITH TIME ZONE)
+  ), claimed AS (
+    INSERT INTO public.chore_recurrence_slots (chore_id, due_date)
+    SELECT chore_id, due_date FROM planned
+    ORDER BY chore_id, due_date
+    ON CONFLICT (chore_id, due_date) DO NOTHING
+    RETURNING chore_id, due_date
+  )
+  -- In household order, so the change log's per-household locks are always
+  -- taken in the same order (household_change_log.sql)
+  INSERT INTO public.chore_assignments (chore_id, user_id, due_date)
+  SELECT p.chore_id, p.user_id, p.due_date
+  FROM planned p
+  JOIN claimed c ON c.chore_id = p.chore_id AND c.due_date = p.due_date
+  JOIN public.chores ch ON ch.id = p.chore_id
+  ORDER BY ch.household_id, p.chore_id, p.due_date;
+
+  GET DIAGNOSTICS v_inserted = ROW_COUNT;
+  RETURN v_inserted;
+END;
+$$;
+
+-- Only the job, with the service role key, calls these
+REVOKE EXECUTE ON FUNCTION public.recurring_chore_latest_due(UUID[]) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.household_rotation_loads(UUID[]) FROM PUBLIC, anon, authenticated;
+REVOKE EXECUTE ON FUNCTION public.materialize_chore_assignments(JSONB) FROM PUBLIC, anon, authenticated;
@@ -0,0 +1,95 @@
+-- Return the completed assignment together with its chore and user
+-- complete_chore_and_award_points used to return only the chore_assignments row,
+-- so the API issued two follow-up queries (chore, profile) after every completion.
+-- It now returns one JSONB document: the assignment row with "chore" and "user"
+-- embedded, each projected to the columns the caller asks for.
+
+-- Keep only the requested keys of a JSONB object (NULL keeps everything)
+CREATE OR REPLACE FUNCTION public.project_jsonb(p_row JSONB, p_fields TEXT[])
+RETURNS JSONB
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  SELECT CASE
+    WHEN p_fields IS NULL THEN p_row
+    ELSE COALESCE(
+      (SELECT jsonb_object_agg(key, value) FROM jsonb_each(p_row) WHERE key = ANY(p_fields)),
+      '{}'::jsonb
+    )
+  END
+$$;
+
+-- The return type changes from a row to JSONB, so the old function must go first
+DROP FUNCTION IF EXISTS public.complete_chore_and_award_points(UUID, UUID, TEXT);
+
+CREATE OR REPLACE FUNCTION public.complete_chore_and_award_points(
+  p_assignment_id UUID,
+  p_user_id UUID,
+  p_proof_url TEXT DEFAULT NULL,
+  p_chore_fields TEXT[] DEFAULT NULL,
+  p_user_fields TEXT[] DEFAULT NULL
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_assignment public.chore_assignments%ROWTYPE;
+  v_chore public.chores%ROWTYPE;
+  v_profile public.profiles%ROWTYPE;
+BEGIN
+  -- Callers may only complete their own assignments; callers without a JWT not at all
+  IF auth.uid() IS DISTINCT FROM p_user_id THEN
+    RAISE EXCEPTION 'Not authorized to complete this chore assignment';
+  END IF;
+
+  SELECT * INTO v_assignment
+  FROM public.chore_assignments
+  WHERE id = p_assignment_id
+  FOR UPDATE;
+
+  IF NOT FOUND THEN
+    RAISE EXCEPTION 'Chore assignment not found';
+  END IF;
+
+  IF v_assignment.user_id <> p_user_id THEN
+    RAISE EXCEPTION 'Not authorized to complete this chore assignment';
+  END IF;
+
+  IF v_assignment.is_complete THEN
+    RAISE EXCEPTION 'Chore assignment is already complete';
+  END IF;
+
+  SELECT * INTO v_chore FROM public.chores WHERE id = v_assignment.chore_id;
+
+  IF v_chore.requires_proof AND p_proof_url IS NULL THEN
+    RAISE EXCEPTION 'This chore requires proof of completion';
+  END IF;
+
+  UPDATE public.chore_assignments
+  SET is_complete = true,
+      completed_at = NOW(),
+      proof_url = COALESCE(p_proof_url, proof_url)
+  WHERE id = p_assignment_id
+  RETURNING * INTO v_assignment;
+
+  UPDATE public.profiles
+  SET points = COALESCE(points, 0) + COALESCE(v_chore.points, 0)
+  WHERE id = p_user_id
+  RETURNING * INTO v_profile;
+
+  UPDATE public.roommates
+  SET points = COALESCE(points, 0) + COALESCE(v_chore.points, 0)
+  WHERE user_id = p_user_id
+    AND household_id = v_chore.household_id;
+
+  RETURN to_jsonb(v_assignment) || jsonb_build_object(
+    'chore', public.project_jsonb(to_jsonb(v_chore), p_chore_fields),
+    'user', public.project_jsonb(to_jsonb(v_profile), p_user_fields)
+  );
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.complete_chore_and_award_points(UUID, UUID, TEXT, TEXT[], TEXT[]) FROM PUBLIC, anon;
+GRANT EXECUTE ON FUNCTION public.complete_chore_and_award_points(UUID, UUID, TEXT, TEXT[], TEXT[]) TO authenticated;
@@ -0,0 +1,56 @@
+-- Single-statement, membership-checked chore updates
+-- update_chore used to SELECT the chore, SELECT the caller's membership and only then
+-- UPDATE, which cost three round trips and left a window between check and write.
+-- The membership check is now part of the UPDATE itself; only when no row matched
+-- does the function look again, to report whether the chore exists at all.
+CREATE OR REPLACE FUNCTION public.update_household_chore(
+  p_chore_id UUID,
+  p_user_id UUID,
+  p_changes JSONB,
+  p_fields TEXT[] DEFAULT NULL
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_chore public.chores%ROWTYPE;
+BEGIN
+  -- Callers may only act as themselves; callers without a JWT not at all
+  IF auth.uid() IS DISTINCT FROM p_user_id THEN
+    RETURN jsonb_build_object('status', 'forbidden');
+  END IF;
+
+  UPDATE public.chores c
+  SET title = COALESCE(p_changes->>'title', c.title),
+      description = COALESCE(p_changes->>'description', c.description),
+      recurrence = COALESCE(p_changes->>'recurrence', c.recurrence),
+      points = COALESCE((p_changes->>'points')::INTEGER, c.points),
+      requires_proof = COALESCE((p_changes->>'requires_proof')::BOOLEAN, c.requires_proof)
+  WHERE c.id = p_chore_id
+    AND EXISTS (
+      SELECT 1 FROM public.roommates r
+      WHERE r.household_id = c.household_id
+      AND r.user_id = p_user_id
+      AND r.status = 'accepted'
+    )
+  RETURNING * INTO v_chore;
+
+  IF FOUND THEN
+    RETURN jsonb_build_object(
+      'status', 'updated',
+      'chore', public.project_jsonb(to_jsonb(v_chore), p_fields)
+    );
+  END IF;
+
+  IF EXISTS (SELECT 1 FROM public.chores WHERE id = p_chore_id) THEN
+    RETURN jsonb_build_object('status', 'forbidden');
+  END IF;
+
+  RETURN jsonb_build_object('status', 'not_found');
+END;
+$$;
+
+REVOKE EXECUTE ON FUNCTION public.update_household_chore(UUID, UUID, JSONB, TEXT[]) FROM PUBLIC, anon;
+GRANT EXECUTE ON FUNCTION public.update_household_chore(UUID, UUID, JSONB, TEXT[]) TO authenticated;
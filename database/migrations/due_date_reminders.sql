@@ -0,0 +1,24 @@
+-- Support for the due-date reminder scheduler (app/jobs/reminders.py)
+
+-- Progress of long-running jobs, so they can resume where they stopped after a restart
+CREATE TABLE IF NOT EXISTS public.job_watermarks (
+  job_name TEXT PRIMARY KEY,
+  watermark TIMESTAMP WITH TIME ZONE NOT NULL,
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+ALTER TABLE public.job_watermarks ENABLE ROW LEVEL SECURITY;
+
+-- Chore reminders get their own notification type
+ALTER TABLE public.notifications DROP CONSTRAINT IF EXISTS notifications_type_check;
+ALTER TABLE public.notifications ADD CONSTRAINT notifications_type_check
+  CHECK (type IN ('expense', 'message', 'roommate', 'system', 'chore'));
+
+-- Range scans over upcoming due dates, in the scheduler's keyset order
+CREATE INDEX IF NOT EXISTS idx_chore_assignments_open_due_date
+  ON public.chore_assignments(due_date, id)
+  WHERE is_complete = false;
+
+CREATE INDEX IF NOT EXISTS idx_expenses_due_date
+  ON public.expenses(due_date, id)
+  WHERE due_date IS NOT NULL;
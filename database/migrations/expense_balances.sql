@@ -0,0 +1,169 @@
+-- Outstanding balances between roommates
+-- household_balances holds, per household, debtor, creditor and currency, the
+-- sum of the debtor's unpaid splits of expenses the creditor paid for. Triggers
+-- on expense_splits and expenses keep it current, so a user's balances are read
+-- from a handful of rows however long their expense history is.
+
+CREATE TABLE IF NOT EXISTS public.household_balances (
+  household_id UUID REFERENCES public.households(id) ON DELETE CASCADE NOT NULL,
+  debtor_id UUID REFERENCES public.profiles(id) ON DELETE CASCADE NOT NULL,
+  creditor_id UUID REFERENCES public.profiles(id) ON DELETE CASCADE NOT NULL,
+  currency TEXT NOT NULL DEFAULT 'USD',
+  amount DECIMAL(12,2) NOT NULL DEFAULT 0,
+  PRIMARY KEY (household_id, debtor_id, creditor_id, currency)
+);
+
+CREATE INDEX IF NOT EXISTS idx_household_balances_debtor
+  ON public.household_balances(debtor_id)
+  WHERE amount <> 0;
+
+CREATE INDEX IF NOT EXISTS idx_household_balances_creditor
+  ON public.household_balances(creditor_id)
+  WHERE amount <> 0;
+
+ALTER TABLE public.household_balances ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view their own balances" ON public.household_balances
+  FOR SELECT USING (debtor_id = auth.uid() OR creditor_id = auth.uid());
+
+-- my_expenses: the caller's splits, newest expense first
+CREATE INDEX IF NOT EXISTS idx_expense_splits_user_id
+  ON public.expense_splits(user_id, expense_id);
+
+CREATE OR REPLACE FUNCTION public.adjust_household_balance(
+  p_household_id UUID,
+  p_debtor_id UUID,
+  p_creditor_id UUID,
+  p_currency TEXT,
+  p_amount DECIMAL
+)
+RETURNS VOID
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  -- Only unpaid splits of someone else's expense are debts
+  INSERT INTO public.household_balances AS b (household_id, debtor_id, creditor_id, currency, amount)
+  SELECT p_household_id, p_debtor_id, p_creditor_id, COALESCE(p_currency, 'USD'), p_amount
+  WHERE p_household_id IS NOT NULL
+    AND p_debtor_id IS NOT NULL
+    AND p_creditor_id IS NOT NULL
+    AND p_debtor_id <> p_creditor_id
+    AND COALESCE(p_amount, 0) <> 0
+  ON CONFLICT (household_id, debtor_id, creditor_id, currency)
+  DO UPDATE SET amount = b.amount + EXCLUDED.amount;
+$$;
+
+CREATE OR REPLACE FUNCTION public.track_expense_split_balance()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_expense public.expenses;
+BEGIN
+  IF TG_OP <> 'INSERT' AND NOT OLD.is_paid THEN
+    -- Missing when the split goes with its expense, whose trigger already took it off
+    SELECT * INTO v_expense FROM public.expenses WHERE id = OLD.expense_id;
+    IF FOUND THEN
+      PERFORM public.adjust_household_balance(
+        v_expense.household_id, OLD.user_id, v_expense.paid_by, v_expense.currency, -OLD.amount
+      );
+    END IF;
+  END IF;
+  IF TG_OP <> 'DELETE' AND NOT NEW.is_paid THEN
+    SELECT * INTO v_expense FROM public.expenses WHERE id = NEW.expense_id;
+    IF FOUND THEN
+      PERFORM public.adjust_household_balance(
+        v_expense.household_id, NEW.user_id, v_expense.paid_by, v_expense.currency, NEW.amount
+      );
+    END IF;
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+-- Moves the unpaid splits of an expense whose payer, household or currency
+-- changes, and takes them off before the expense (and its splits) is deleted
+CREATE OR REPLACE FUNCTION public.track_expense_balance()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  IF TG_OP = 'UPDATE' AND (NEW.paid_by, NEW.household_id, NEW.currency)
+                          IS NOT DISTINCT FROM (OLD.paid_by, OLD.household_id, OLD.currency) THEN
+    RETURN NULL;
+  END IF;
+
+  PERFORM public.adjust_household_balance(OLD.household_id, s.user_id, OLD.paid_by, OLD.currency, -s.amount)
+  FROM public.expense_splits s
+  WHERE s.expense_id = OLD.id AND NOT s.is_paid;
+
+  IF TG_OP = 'UPDATE' THEN
+    PERFORM public.adjust_household_balance(NEW.household_id, s.user_id, NEW.paid_by, NEW.currency, s.amount)
+    FROM public.expense_splits s
+    WHERE s.expense_id = NEW.id AND NOT s.is_paid;
+    RETURN NULL;
+  END IF;
+  RETURN OLD;
+END;
+$$;
+
+-- Backfill from the splits unpaid so far
+INSERT INTO public.household_balances AS b (household_id, debtor_id, creditor_id, currency, amount)
+SELECT e.household_id, s.user_id, e.paid_by, COALESCE(e.currency, 'USD'), SUM(s.amount)
+FROM public.expense_splits s
+JOIN public.expenses e ON e.id = s.expense_id
+WHERE NOT s.is_paid
+  AND e.household_id IS NOT NULL
+  AND e.paid_by IS NOT NULL
+  AND s.user_id <> e.paid_by
+GROUP BY e.household_id, s.user_id, e.paid_by, COALESCE(e.currency, 'USD')
+ON CONFLICT (household_id, debtor_id, creditor_id, currency)
+DO UPDATE SET amount = EXCLUDED.amount;
+
+DROP TRIGGER IF EXISTS track_expense_splits_balance ON public.expense_splits;
+CREATE TRIGGER track_expense_splits_balance AFTER INSERT OR UPDATE OR DELETE ON public.expense_splits
+  FOR EACH ROW EXECUTE FUNCTION public.track_expense_split_balance();
+
+DROP TRIGGER IF EXISTS track_expenses_balance ON public.expenses;
+CREATE TRIGGER track_expenses_balance AFTER UPDATE ON public.expenses
+  FOR EACH ROW EXECUTE FUNCTION public.track_expense_balance();
+
+DROP TRIGGER IF EXISTS untrack_expenses_balance ON public.expenses;
+CREATE TRIGGER untrack_expenses_balance BEFORE DELETE ON public.expenses
+  FOR EACH ROW EXECUTE FUNCTION public.track_expense_balance();
+
+-- The caller's outstanding balances, per household, counterparty and currency:
+-- what they owe the counterparty and what the counterparty owes them
+CREATE OR REPLACE FUNCTION public.my_balance_summary()
+RETURNS TABLE (
+  household_id UUID,
+  counterparty_id UUID,
+  currency TEXT,
+  owed_by_me DECIMAL,
+  owed_to_me DECIMAL
+)
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  SELECT b.household_id,
+         CASE WHEN b.debtor_id = auth.uid() THEN b.creditor_id ELSE b.debtor_id END,
+         b.currency,
+         SUM(CASE WHEN b.debtor_id = auth.uid() THEN b.amount ELSE 0 END),
+         SUM(CASE WHEN b.creditor_id = auth.uid() THEN b.amount ELSE 0 END)
+  FROM (
+    SELECT * FROM public.household_balances WHERE debtor_id = auth.uid() AND amount <> 0
+    UNION ALL
+    SELECT * FROM public.household_balances WHERE creditor_id = auth.uid() AND amount <> 0
+  ) b
+  GROUP BY 1, 2, 3
+  ORDER BY 1, 2, 3;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.my_balance_summary() TO authenticated;
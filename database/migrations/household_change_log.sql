@@ -0,0 +1,341 @@
+-- Per-household change log for delta sync (the householdChanges query)
+-- Triggers record every insert, update and delete of a household's rows, so a
+-- client that has synced up to some version fetches only what changed since,
+-- through household_changes_since(), instead of the whole household.
+--
+-- Each household has its own version counter in household_sync_state. Bumping
+-- it locks the household's counter row until the transaction ends, so versions
+-- are handed out in commit order: once a client has seen version N, every
+-- change it has not seen commits with a version above N. Statements that write
+-- to many households at once (the recurring chore and expense jobs) insert in
+-- household_id order, so concurrent writers take the counter locks in the same
+-- order and cannot deadlock on them.
+--
+-- The log keeps one entry per row, the row's latest change: a later change of
+-- the same row replaces its entry with a new version, so reading the changes
+-- since N costs one entry per changed row however often it changed. Entries of
+-- deleted rows (tombstones) are removed by compact_household_changes() once
+-- they are older than the retention period (app/jobs/change_log_compaction.py);
+-- a client whose version is older than the last removed tombstone is told to
+-- resync from scratch.
+--
+-- Splits and assignments reach their household through their expense or chore,
+-- so deleting an expense or a chore logs only its own tombstone: clients drop
+-- its splits or assignments with it.
+
+CREATE TABLE IF NOT EXISTS public.household_sync_state (
+  household_id UUID REFERENCES public.households(id) ON DELETE CASCADE PRIMARY KEY,
+  version BIGINT NOT NULL DEFAULT 0,
+  -- Tombstones up to this version have been compacted away
+  compacted_through BIGINT NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS public.household_changes (
+  household_id UUID REFERENCES public.households(id) ON DELETE CASCADE NOT NULL,
+  table_name TEXT NOT NULL CHECK (table_name IN (
+    'households', 'roommates', 'chores', 'chore_assignments', 'expenses', 'expense_splits', 'messages'
+  )),
+  row_id UUID NOT NULL,
+  version BIGINT NOT NULL,
+  deleted BOOLEAN NOT NULL DEFAULT false,
+  changed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  PRIMARY KEY (household_id, table_name, row_id)
+);
+
+-- Reads scan a household's entries in version order
+CREATE INDEX IF NOT EXISTS idx_household_changes_version
+  ON public.household_changes(household_id, version);
+
+-- Cascaded deletes of splits and assignments drop their entries by row
+CREATE INDEX IF NOT EXISTS idx_household_changes_row
+  ON public.household_changes(table_name, row_id);
+
+-- Compaction finds old tombstones without scanning live entries
+CREATE INDEX IF NOT EXISTS idx_household_changes_tombstones
+  ON public.household_changes(changed_at)
+  WHERE deleted;
+
+-- Only read through household_changes_since() and written by the triggers below
+ALTER TABLE public.household_sync_state ENABLE ROW LEVEL SECURITY;
+ALTER TABLE public.household_changes ENABLE ROW LEVEL SECURITY;
+
+CREATE OR REPLACE FUNCTION public.record_household_change(
+  p_household_id UUID,
+  p_table TEXT,
+  p_row_id UUID,
+  p_deleted BOOLEAN
+)
+RETURNS VOID
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_version BIGINT;
+BEGIN
+  -- Households being deleted take their log with them
+  IF p_household_id IS NULL OR NOT EXISTS (SELECT 1 FROM public.households WHERE id = p_household_id) THEN
+    RETURN;
+  END IF;
+
+  INSERT INTO public.household_sync_state AS s (household_id, version)
+  VALUES (p_household_id, 1)
+  ON CONFLICT (household_id)
+  DO UPDATE SET version = s.version + 1, updated_at = NOW()
+  RETURNING s.version INTO v_version;
+
+  INSERT INTO public.household_changes AS c (household_id, table_name, row_id, version, deleted)
+  VALUES (p_household_id, p_table, p_row_id, v_version, p_deleted)
+  ON CONFLICT (household_id, table_name, row_id)
+  DO UPDATE SET version = EXCLUDED.version, deleted = EXCLUDED.deleted, changed_at = NOW();
+END;
+$$;
+
+-- Tables with a household_id column (or households itself: TG_ARGV[0] = 'id').
+-- A row moved to another household is a delete in the old one.
+CREATE OR REPLACE FUNCTION public.record_household_change_trigger()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_column TEXT := COALESCE(TG_ARGV[0], 'household_id');
+  v_old UUID;
+  v_new UUID;
+BEGIN
+  IF TG_OP <> 'INSERT' THEN
+    v_old := (to_jsonb(OLD) ->> v_column)::UUID;
+  END IF;
+  IF TG_OP <> 'DELETE' THEN
+    v_new := (to_jsonb(NEW) ->> v_column)::UUID;
+  END IF;
+
+  IF TG_OP <> 'INSERT' AND v_old IS DISTINCT FROM v_new THEN
+    PERFORM public.record_household_change(v_old, TG_TABLE_NAME, OLD.id, true);
+  END IF;
+  IF TG_OP <> 'DELETE' THEN
+    PERFORM public.record_household_change(v_new, TG_TABLE_NAME, NEW.id, false);
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+-- Tables whose household is their parent's: TG_ARGV[0] is the parent table,
+-- TG_ARGV[1] the column referencing it
+CREATE OR REPLACE FUNCTION public.record_child_household_change_trigger()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_lookup TEXT := format('SELECT household_id FROM public.%I WHERE id = $1', TG_ARGV[0]);
+  v_old UUID;
+  v_new UUID;
+BEGIN
+  IF TG_OP <> 'INSERT' THEN
+    EXECUTE v_lookup INTO v_old USING (to_jsonb(OLD) ->> TG_ARGV[1])::UUID;
+  END IF;
+  IF TG_OP <> 'DELETE' THEN
+    EXECUTE v_lookup INTO v_new USING (to_jsonb(NEW) ->> TG_ARGV[1])::UUID;
+  END IF;
+
+  IF TG_OP = 'DELETE' AND v_old IS NULL THEN
+    -- Deleted along with its parent, whose tombstone covers it
+    DELETE FROM public.household_changes WHERE table_name = TG_TABLE_NAME AND row_id = OLD.id;
+  ELSIF TG_OP <> 'INSERT' AND v_old IS DISTINCT FROM v_new THEN
+    PERFORM public.record_household_change(v_old, TG_TABLE_NAME, OLD.id, true);
+  END IF;
+  IF TG_OP <> 'DELETE' THEN
+    PERFORM public.record_household_change(v_new, TG_TABLE_NAME, NEW.id, false);
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+-- Rows that predate the log, numbered per household in creation order. Existing
+-- entries are kept, so re-running this migration is safe.
+WITH existing AS (
+  SELECT h.id AS household_id, 'households' AS table_name, h.id AS row_id, h.created_at AS created_at
+  FROM public.households h
+  UNION ALL
+  SELECT r.household_id, 'roommates', r.id, r.joined_at FROM public.roommates r
+  UNION ALL
+  SELECT c.household_id, 'chores', c.id, c.created_at FROM public.chores c
+  UNION ALL
+  SELECT c.household_id, 'chore_assignments', a.id, a.created_at
+  FROM public.chore_assignments a
+  JOIN public.chores c ON c.id = a.chore_id
+  UNION ALL
+  SELECT e.household_id, 'expenses', e.id, e.created_at FROM public.expenses e
+  UNION ALL
+  SELECT e.household_id, 'expense_splits', s.id, e.created_at
+  FROM public.expense_splits s
+  JOIN public.expenses e ON e.id = s.expense_id
+  UNION ALL
+  SELECT m.household_id, 'messages', m.id, m.created_at FROM public.messages m
+)
+INSERT INTO public.household_changes (household_id, table_name, row_id, version)
+SELECT household_id, table_name, row_id,
+       ROW_NUMBER() OVER (PARTITION BY household_id ORDER BY created_at, table_name, row_id)
+FROM existing
+WHERE household_id IS NOT NULL
+ON CONFLICT (household_id, table_name, row_id) DO NOTHING;
+
+INSERT INTO public.household_sync_state (household_id, version)
+SELECT household_id, MAX(version)
+FROM public.household_changes
+GROUP BY household_id
+ON CONFLICT (household_id)
+DO UPDATE SET version = GREATEST(public.household_sync_state.version, EXCLUDED.version);
+
+DROP TRIGGER IF EXISTS log_households_change ON public.households;
+CREATE TRIGGER log_households_change AFTER INSERT OR UPDATE ON public.households
+  FOR EACH ROW EXECUTE FUNCTION public.record_household_change_trigger('id');
+
+DROP TRIGGER IF EXISTS log_roommates_change ON public.roommates;
+CREATE TRIGGER log_roommates_change AFTER INSERT OR UPDATE OR DELETE ON public.roommates
+  FOR EACH ROW EXECUTE FUNCTION public.record_household_change_trigger();
+
+DROP TRIGGER IF EXISTS log_chores_change ON public.chores;
+CREATE TRIGGER log_chores_change AFTER INSERT OR UPDATE OR DELETE ON public.chores
+  FOR EACH ROW EXECUTE FUNCTION public.record_household_change_trigger();
+
+DROP TRIGGER IF EXISTS log_chore_assignments_change ON public.chore_assignments;
+CREATE TRIGGER log_chore_assignments_change AFTER INSERT OR UPDATE OR DELETE ON public.chore_assignments
+  FOR EACH ROW EXECUTE FUNCTION public.record_child_household_change_trigger('chores', 'chore_id');
+
+DROP TRIGGER IF EXISTS log_expenses_change ON public.expenses;
+CREATE TRIGGER log_expenses_change AFTER INSERT OR UPDATE OR DELETE ON public.expenses
+  FOR EACH ROW EXECUTE FUNCTION public.record_household_change_trigger();
+
+DROP TRIGGER IF EXISTS log_expense_splits_change ON public.expense_splits;
+CREATE TRIGGER log_expense_splits_change AFTER INSERT OR UPDATE OR DELETE ON public.expense_splits
+  FOR EACH ROW EXECUTE FUNCTION public.record_child_household_change_trigger('expenses', 'expense_id');
+
+DROP TRIGGER IF EXISTS log_messages_change ON public.messages;
+CREATE TRIGGER log_messages_change AFTER INSERT OR UPDATE OR DELETE ON public.messages
+  FOR EACH ROW EXECUTE FUNCTION public.record_household_change_trigger();
+
+-- The caller's household's changes after version p_since, oldest first, at most
+-- p_limit of them: {"version", "full_resync", "changes": [{"table", "id",
+-- "version", "deleted", "row"}]}. "version" is the household's current version,
+-- "row" the changed row as it is now (null for deletes).
+--
+-- When p_since is 0, or tombstones after it have been compacted away, the
+-- changes are every live row from the start, without tombstones, and
+-- "full_resync" tells the client to replace what it holds with them.
+CREATE OR REPLACE FUNCTION public.household_changes_since(
+  p_household_id UUID,
+  p_since BIGINT DEFAULT 0,
+  p_limit INTEGER DEFAULT 500
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_since BIGINT := GREATEST(COALESCE(p_since, 0), 0);
+  v_version BIGINT := 0;
+  v_compacted_through BIGINT := 0;
+  v_full_resync BOOLEAN;
+  v_changes JSONB;
+BEGIN
+  IF NOT EXISTS (
+    SELECT 1 FROM public.roommates
+    WHERE household_id = p_household_id AND user_id = auth.uid() AND status = 'accepted'
+  ) THEN
+    RAISE EXCEPTION 'Not a member of this household';
+  END IF;
+
+  SELECT s.version, s.compacted_through INTO v_version, v_compacted_through
+  FROM public.household_sync_state s
+  WHERE s.household_id = p_household_id;
+
+  v_full_resync := v_since = 0 OR v_since < COALESCE(v_compacted_through, 0);
+  IF v_full_resync THEN
+    v_since := 0;
+  END IF;
+
+  SELECT COALESCE(jsonb_agg(jsonb_build_object(
+           'table', page.table_name,
+           'id', page.row_id,
+           'version', page.version,
+           'deleted', page.deleted,
+           'row', page.row
+         ) ORDER BY page.version), '[]'::jsonb)
+  INTO v_changes
+  FROM (
+    SELECT c.table_name, c.row_id, c.version, c.deleted,
+           CASE c.table_name
+             WHEN 'households' THEN to_jsonb(h)
+             WHEN 'roommates' THEN to_jsonb(r)
+             WHEN 'chores' THEN to_jsonb(ch)
+             WHEN 'chore_assignments' THEN to_jsonb(a)
+             WHEN 'expenses' THEN to_jsonb(e)
+             WHEN 'expense_splits' THEN to_jsonb(s)
+             WHEN 'messages' THEN to_jsonb(m)
+           END AS row
+    FROM public.household_changes c
+    LEFT JOIN public.households h ON c.table_name = 'households' AND h.id = c.row_id
+    LEFT JOIN public.roommates r ON c.table_name = 'roommates' AND r.id = c.row_id
+    LEFT JOIN public.chores ch ON c.table_name = 'chores' AND ch.id = c.row_id
+    LEFT JOIN public.chore_assignments a ON c.table_name = 'chore_assignments' AND a.id = c.row_id
+    LEFT JOIN public.expenses e ON c.table_name = 'expenses' AND e.id = c.row_id
+    LEFT JOIN public.expense_splits s ON c.table_name = 'expense_splits' AND s.id = c.row_id
+    LEFT JOIN public.messages m ON c.table_name = 'messages' AND m.id = c.row_id
+    WHERE c.household_id = p_household_id
+      AND c.version > v_since
+      AND NOT (v_full_resync AND c.deleted)
+    ORDER BY c.version
+    LIMIT p_limit
+  ) page;
+
+  RETURN jsonb_build_object(
+    'version', COALESCE(v_version, 0),
+    'full_resync', v_full_resync,
+    'changes', v_changes
+  );
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.household_changes_since(UUID, BIGINT, INTEGER) TO authenticated;
+
+-- Remove tombstones older than p_retention and record, per household, the
+-- newest version removed. Returns the number of entries removed.
+CREATE OR REPLACE FUNCTION public.compact_household_changes(
+  p_retention INTERVAL DEFAULT INTERVAL '30 days'
+)
+RETURNS INTEGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_removed INTEGER;
+BEGIN
+  WITH removed AS (
+    DELETE FROM public.household_changes
+    WHERE deleted AND changed_at < NOW() - p_retention
+    RETURNING household_id, version
+  ), horizons AS (
+    SELECT household_id, MAX(version) AS version, COUNT(*) AS entries
+    FROM removed
+    GROUP BY household_id
+  ), advanced AS (
+    UPDATE public.household_sync_state s
+    SET compacted_through = GREATEST(s.compacted_through, h.version), updated_at = NOW()
+    FROM horizons h
+    WHERE s.household_id = h.household_id
+  )
+  SELECT COALESCE(SUM(entries), 0) INTO v_removed FROM horizons;
+  RETURN v_removed;
+END;
+$$;
+
+-- For the service role only
+REVOKE EXECUTE ON FUNCTION public.compact_household_changes(INTERVAL) FROM PUBLIC, anon, authenticated;
@@ -0,0 +1,80 @@
+-- Household points leaderboard
+-- All-time standings are read from roommates.points; weekly and monthly standings
+-- come from per-(household, period, user) aggregates that a trigger on
+-- chore_assignments keeps up to date as chores are completed, so every leaderboard
+-- window is a single index-ordered read.
+
+-- All-time leaderboard
+CREATE INDEX IF NOT EXISTS idx_roommates_household_points
+  ON public.roommates(household_id, points DESC NULLS LAST);
+
+-- Points earned per roommate per week / month (periods start Monday / the 1st, UTC)
+CREATE TABLE IF NOT EXISTS public.household_points_periods (
+  household_id UUID REFERENCES public.households(id) ON DELETE CASCADE NOT NULL,
+  user_id UUID REFERENCES public.profiles(id) ON DELETE CASCADE NOT NULL,
+  period TEXT NOT NULL CHECK (period IN ('weekly', 'monthly')),
+  period_start DATE NOT NULL,
+  points INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (household_id, period, period_start, user_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_household_points_periods_ranking
+  ON public.household_points_periods(household_id, period, period_start, points DESC);
+
+ALTER TABLE public.household_points_periods ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view points in their households" ON public.household_points_periods
+  FOR SELECT USING (
+    EXISTS (
+      SELECT 1 FROM public.roommates
+      WHERE roommates.household_id = household_points_periods.household_id
+      AND roommates.user_id = auth.uid()
+      AND roommates.status = 'accepted'
+    )
+  );
+
+CREATE OR REPLACE FUNCTION public.points_period_start(p_period TEXT, p_at TIMESTAMP WITH TIME ZONE)
+RETURNS DATE
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  SELECT date_trunc(CASE p_period WHEN 'weekly' THEN 'week' ELSE 'month' END, p_at AT TIME ZONE 'UTC')::date
+$$;
+
+-- Backfill from chores completed so far
+INSERT INTO public.household_points_periods (household_id, user_id, period, period_start, points)
+SELECT c.household_id, ca.user_id, p.period,
+       public.points_period_start(p.period, ca.completed_at), SUM(COALESCE(c.points, 0))
+FROM public.chore_assignments ca
+JOIN public.chores c ON c.id = ca.chore_id
+CROSS JOIN (VALUES ('weekly'), ('monthly')) AS p(period)
+WHERE ca.is_complete AND ca.completed_at IS NOT NULL
+GROUP BY 1, 2, 3, 4
+ON CONFLICT (household_id, period, period_start, user_id) DO NOTHING;
+
+-- Completing a chore credits the week and month it was completed in
+CREATE OR REPLACE FUNCTION public.credit_household_points_periods()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  INSERT INTO public.household_points_periods AS hpp
+    (household_id, user_id, period, period_start, points)
+  SELECT c.household_id, NEW.user_id, p.period,
+         public.points_period_start(p.period, NEW.completed_at), COALESCE(c.points, 0)
+  FROM public.chores c
+  CROSS JOIN (VALUES ('weekly'), ('monthly')) AS p(period)
+  WHERE c.id = NEW.chore_id
+  ON CONFLICT (household_id, period, period_start, user_id)
+  DO UPDATE SET points = hpp.points + EXCLUDED.points;
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS credit_household_points_periods ON public.chore_assignments;
+CREATE TRIGGER credit_household_points_periods AFTER UPDATE OF is_complete ON public.chore_assignments
+  FOR EACH ROW
+  WHEN (NEW.is_complete AND NOT OLD.is_complete AND NEW.completed_at IS NOT NULL)
+  EXECUTE FUNCTION public.credit_household_points_periods();
@@ -0,0 +1,103 @@
+-- Faceted search over available household listings
+-- Every facet has an index restricted to available listings, so Postgres can
+-- combine the selective ones (bitmap AND) instead of scanning the table.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+-- amenities @> ARRAY[...]
+CREATE INDEX IF NOT EXISTS idx_households_available_amenities
+  ON public.households USING GIN (amenities)
+  WHERE is_available;
+
+-- Rent range
+CREATE INDEX IF NOT EXISTS idx_households_available_rent
+  ON public.households(rent_amount)
+  WHERE is_available;
+
+-- Type filter
+CREATE INDEX IF NOT EXISTS idx_households_available_type
+  ON public.households(household_type)
+  WHERE is_available;
+
+-- Text match on name, description and address; search_household_listings()
+-- must use this exact expression for the index to apply
+CREATE INDEX IF NOT EXISTS idx_households_available_text_trgm
+  ON public.households USING GIN (
+    (COALESCE(name, '') || ' ' || COALESCE(description, '') || ' ' || COALESCE(address, '')) gin_trgm_ops
+  )
+  WHERE is_available;
+
+-- Pagination order
+CREATE INDEX IF NOT EXISTS idx_households_available_created_at
+  ON public.households(created_at DESC, id DESC)
+  WHERE is_available;
+
+-- Available listings matching every given filter, newest first, keyset-paginated
+-- on (created_at, id). Pass the last row's created_at and id to get the next page.
+-- Listings are public but household rows are only visible to their members, so
+-- this runs with the owner's privileges and never returns invite_code.
+CREATE OR REPLACE FUNCTION public.search_household_listings(
+  p_query TEXT DEFAULT NULL,
+  p_min_rent NUMERIC DEFAULT NULL,
+  p_max_rent NUMERIC DEFAULT NULL,
+  p_household_types TEXT[] DEFAULT NULL,
+  p_amenities TEXT[] DEFAULT NULL,
+  p_after_created_at TIMESTAMP WITH TIME ZONE DEFAULT NULL,
+  p_after_id UUID DEFAULT NULL,
+  p_limit INTEGER DEFAULT 20
+)
+RETURNS TABLE (
+  id UUID,
+  name TEXT,
+  description TEXT,
+  address TEXT,
+  rent_amount DECIMAL(10,2),
+  currency TEXT,
+  household_type TEXT,
+  amenities TEXT[],
+  images TEXT[],
+  is_available BOOLEAN,
+  created_by UUID,
+  created_at TIMESTAMP WITH TIME ZONE,
+  updated_at TIMESTAMP WITH TIME ZONE
+)
+LANGUAGE plpgsql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  -- Only the filters actually given make it into the statement, so each search
+  -- is planned for its own combination of facets
+  v_sql TEXT := 'SELECT h.id, h.name, h.description, h.address, h.rent_amount, h.currency, h.household_type,
+                        h.amenities, h.images, h.is_available, h.created_by, h.created_at, h.updated_at
+                 FROM public.households h
+                 WHERE h.is_available';
+BEGIN
+  IF p_min_rent IS NOT NULL THEN
+    v_sql := v_sql || ' AND h.rent_amount >= $1';
+  END IF;
+  IF p_max_rent IS NOT NULL THEN
+    v_sql := v_sql || ' AND h.rent_amount <= $2';
+  END IF;
+  IF p_household_types IS NOT NULL THEN
+    v_sql := v_sql || ' AND h.household_type = ANY($3)';
+  END IF;
+  IF p_amenities IS NOT NULL THEN
+    v_sql := v_sql || ' AND h.amenities @> $4';
+  END IF;
+  IF p_query IS NOT NULL THEN
+    v_sql := v_sql || $q$ AND (COALESCE(h.name, '') || ' ' || COALESCE(h.description, '') || ' ' || COALESCE(h.address, ''))
+                          ILIKE '%' || replace(replace(replace($5, '\', '\\'), '%', '\%'), '_', '\_') || '%'$q$;
+  END IF;
+  IF p_after_id IS NOT NULL THEN
+    v_sql := v_sql || ' AND (h.created_at, h.id) < ($6, $7)';
+  END IF;
+
+  RETURN QUERY EXECUTE v_sql || ' ORDER BY h.created_at DESC, h.id DESC LIMIT $8'
+  USING p_min_rent, p_max_rent, p_household_types, p_amenities, p_query,
+        p_after_created_at, p_after_id, p_limit;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.search_household_listings(TEXT, NUMERIC, NUMERIC, TEXT[], TEXT[], TIMESTAMP WITH TIME ZONE, UUID, INTEGER) TO authenticated;
@@ -0,0 +1,176 @@
+-- Household spending analytics (the householdSpending query)
+-- household_spending_months holds, per household, month, category, currency and
+-- roommate, what the roommate paid for the household's expenses and their share
+-- of them (the sum of their splits). Triggers on expenses and expense_splits keep
+-- it current, so a year of spending is read from a few rows per month however
+-- many expenses there were. An expense counts towards the (UTC) month of its due
+-- date, or of its creation when it has none; expenses without a category are
+-- 'uncategorized'. Expenses without a payer are counted, with what they cost, on
+-- the row whose user_id is NULL.
+
+CREATE TABLE IF NOT EXISTS public.household_spending_months (
+  household_id UUID REFERENCES public.households(id) ON DELETE CASCADE NOT NULL,
+  month DATE NOT NULL,
+  category TEXT NOT NULL,
+  currency TEXT NOT NULL DEFAULT 'USD',
+  user_id UUID REFERENCES public.profiles(id) ON DELETE CASCADE,
+  paid DECIMAL(12,2) NOT NULL DEFAULT 0,
+  share DECIMAL(12,2) NOT NULL DEFAULT 0,
+  expense_count INTEGER NOT NULL DEFAULT 0,
+  -- One row per roommate, and one without a payer, for each household, month,
+  -- category and currency
+  UNIQUE NULLS NOT DISTINCT (household_id, month, category, currency, user_id)
+);
+
+ALTER TABLE public.household_spending_months ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Users can view spending in their households" ON public.household_spending_months
+  FOR SELECT USING (
+    EXISTS (
+      SELECT 1 FROM public.roommates
+      WHERE roommates.household_id = household_spending_months.household_id
+      AND roommates.user_id = auth.uid()
+      AND roommates.status = 'accepted'
+    )
+  );
+
+CREATE OR REPLACE FUNCTION public.adjust_household_spending(
+  p_expense public.expenses,
+  p_user_id UUID,
+  p_paid DECIMAL,
+  p_share DECIMAL,
+  p_expense_count INTEGER
+)
+RETURNS VOID
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  INSERT INTO public.household_spending_months AS m
+    (household_id, month, category, currency, user_id, paid, share, expense_count)
+  SELECT p_expense.household_id,
+         date_trunc('month', COALESCE(p_expense.due_date, p_expense.created_at) AT TIME ZONE 'UTC')::date,
+         COALESCE(p_expense.category, 'uncategorized'),
+         COALESCE(p_expense.currency, 'USD'),
+         p_user_id, p_paid, p_share, p_expense_count
+  WHERE p_expense.household_id IS NOT NULL
+  ON CONFLICT (household_id, month, category, currency, user_id)
+  DO UPDATE SET paid = m.paid + EXCLUDED.paid,
+                share = m.share + EXCLUDED.share,
+                expense_count = m.expense_count + EXCLUDED.expense_count;
+$$;
+
+CREATE OR REPLACE FUNCTION public.track_expense_split_spending()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_expense public.expenses;
+BEGIN
+  -- Paying a split does not change anyone's share
+  IF TG_OP = 'UPDATE' AND (NEW.expense_id, NEW.user_id, NEW.amount)
+                          IS NOT DISTINCT FROM (OLD.expense_id, OLD.user_id, OLD.amount) THEN
+    RETURN NULL;
+  END IF;
+
+  IF TG_OP <> 'INSERT' THEN
+    -- Missing when the split goes with its expense, whose trigger already took it off
+    SELECT * INTO v_expense FROM public.expenses WHERE id = OLD.expense_id;
+    IF FOUND THEN
+      PERFORM public.adjust_household_spending(v_expense, OLD.user_id, 0, -OLD.amount, 0);
+    END IF;
+  END IF;
+  IF TG_OP <> 'DELETE' THEN
+    SELECT * INTO v_expense FROM public.expenses WHERE id = NEW.expense_id;
+    IF FOUND THEN
+      PERFORM public.adjust_household_spending(v_expense, NEW.user_id, 0, NEW.amount, 0);
+    END IF;
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+-- Counts an expense for its payer (or for no one when it has none), and moves its splits' shares when its
+-- household, month, category or currency changes. Deletes are taken off before
+-- the expense (and its splits) goes.
+CREATE OR REPLACE FUNCTION public.track_expense_spending()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_moved BOOLEAN := TG_OP = 'DELETE';
+BEGIN
+  IF TG_OP = 'UPDATE' THEN
+    v_moved := (NEW.household_id, NEW.category, NEW.currency,
+                date_trunc('month', COALESCE(NEW.due_date, NEW.created_at) AT TIME ZONE 'UTC')::date)
+               IS DISTINCT FROM
+               (OLD.household_id, OLD.category, OLD.currency,
+                date_trunc('month', COALESCE(OLD.due_date, OLD.created_at) AT TIME ZONE 'UTC')::date);
+    IF NOT v_moved AND (NEW.paid_by, NEW.amount) IS NOT DISTINCT FROM (OLD.paid_by, OLD.amount) THEN
+      RETURN NULL;
+    END IF;
+  END IF;
+
+  IF TG_OP <> 'INSERT' THEN
+    PERFORM public.adjust_household_spending(OLD, OLD.paid_by, -OLD.amount, 0, -1);
+    IF v_moved THEN
+      PERFORM public.adjust_household_spending(OLD, s.user_id, 0, -s.amount, 0)
+      FROM public.expense_splits s
+      WHERE s.expense_id = OLD.id;
+    END IF;
+  END IF;
+
+  IF TG_OP <> 'DELETE' THEN
+    PERFORM public.adjust_household_spending(NEW, NEW.paid_by, NEW.amount, 0, 1);
+    IF v_moved THEN
+      PERFORM public.adjust_household_spending(NEW, s.user_id, 0, s.amount, 0)
+      FROM public.expense_splits s
+      WHERE s.expense_id = NEW.id;
+    END IF;
+    RETURN NULL;
+  END IF;
+  RETURN OLD;
+END;
+$$;
+
+-- Backfill from the expenses so far
+INSERT INTO public.household_spending_months AS m
+  (household_id, month, category, currency, user_id, paid, share, expense_count)
+SELECT household_id, month, category, currency, user_id, SUM(paid), SUM(share), SUM(expense_count)
+FROM (
+  SELECT e.household_id,
+         date_trunc('month', COALESCE(e.due_date, e.created_at) AT TIME ZONE 'UTC')::date AS month,
+         COALESCE(e.category, 'uncategorized') AS category,
+         COALESCE(e.currency, 'USD') AS currency,
+         e.paid_by AS user_id, e.amount AS paid, 0 AS share, 1 AS expense_count
+  FROM public.expenses e
+  WHERE e.household_id IS NOT NULL
+  UNION ALL
+  SELECT e.household_id,
+         date_trunc('month', COALESCE(e.due_date, e.created_at) AT TIME ZONE 'UTC')::date,
+         COALESCE(e.category, 'uncategorized'),
+         COALESCE(e.currency, 'USD'),
+         s.user_id, 0, s.amount, 0
+  FROM public.expense_splits s
+  JOIN public.expenses e ON e.id = s.expense_id
+  WHERE e.household_id IS NOT NULL
+) contributions
+GROUP BY 1, 2, 3, 4, 5
+ON CONFLICT (household_id, month, category, currency, user_id)
+DO UPDATE SET paid = EXCLUDED.paid, share = EXCLUDED.share, expense_count = EXCLUDED.expense_count;
+
+DROP TRIGGER IF EXISTS track_expense_splits_spending ON public.expense_splits;
+CREATE TRIGGER track_expense_splits_spending AFTER INSERT OR UPDATE OR DELETE ON public.expense_splits
+  FOR EACH ROW EXECUTE FUNCTION public.track_expense_split_spending();
+
+DROP TRIGGER IF EXISTS track_expenses_spending ON public.expenses;
+CREATE TRIGGER track_expenses_spending AFTER INSERT OR UPDATE ON public.expenses
+  FOR EACH ROW EXECUTE FUNCTION public.track_expense_spending();
+
+DROP TRIGGER IF EXISTS untrack_expenses_spending ON public.expenses;
+CREATE TRIGGER untrack_expenses_spending BEFORE DELETE ON public.expenses
+  FOR EACH ROW EXECUTE FUNCTION public.track_expense_spending();
@@ -0,0 +1,170 @@
+-- Household version stamps for the API's response cache
+-- Every change to a household's members, chores or expenses bumps a per-(household,
+-- scope) version, from triggers, so it holds whoever makes the change: the API,
+-- the jobs or the SQL editor. The API derives cache validity and ETags from these
+-- versions (RESPONSE_CACHE=true), re-checking them with one cache_versions() call
+-- instead of re-running a query's reads.
+--
+-- Scopes:
+--   members  - the household row, its roommates and their profiles
+--   chores   - chores and chore assignments
+--   expenses - expenses and expense splits
+
+CREATE TABLE IF NOT EXISTS public.household_versions (
+  household_id UUID REFERENCES public.households(id) ON DELETE CASCADE NOT NULL,
+  scope TEXT NOT NULL CHECK (scope IN ('members', 'chores', 'expenses')),
+  version BIGINT NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  PRIMARY KEY (household_id, scope)
+);
+
+-- Only read through cache_versions() and written by the triggers below
+ALTER TABLE public.household_versions ENABLE ROW LEVEL SECURITY;
+
+CREATE OR REPLACE FUNCTION public.bump_household_version(p_household_id UUID, p_scope TEXT)
+RETURNS VOID
+LANGUAGE sql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  -- The EXISTS skips households being deleted, whose cascaded deletes fire these
+  -- triggers after the household row itself is gone
+  INSERT INTO public.household_versions AS hv (household_id, scope, version)
+  SELECT p_household_id, p_scope, 1
+  WHERE p_household_id IS NOT NULL
+    AND EXISTS (SELECT 1 FROM public.households WHERE id = p_household_id)
+  ON CONFLICT (household_id, scope)
+  DO UPDATE SET version = hv.version + 1, updated_at = NOW();
+$$;
+
+-- Tables with a household_id column (or households itself: TG_ARGV[1] = 'id')
+CREATE OR REPLACE FUNCTION public.bump_household_version_trigger()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_scope TEXT := TG_ARGV[0];
+  v_column TEXT := COALESCE(TG_ARGV[1], 'household_id');
+BEGIN
+  IF TG_OP <> 'INSERT' THEN
+    PERFORM public.bump_household_version((to_jsonb(OLD) ->> v_column)::UUID, v_scope);
+  END IF;
+  IF TG_OP <> 'DELETE'
+     AND (TG_OP = 'INSERT' OR (to_jsonb(NEW) ->> v_column) IS DISTINCT FROM (to_jsonb(OLD) ->> v_column)) THEN
+    PERFORM public.bump_household_version((to_jsonb(NEW) ->> v_column)::UUID, v_scope);
+  END IF;
+  RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.bump_chore_assignment_household_version()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  PERFORM public.bump_household_version(c.household_id, 'chores')
+  FROM public.chores c
+  WHERE c.id IN (
+    CASE WHEN TG_OP <> 'INSERT' THEN OLD.chore_id END,
+    CASE WHEN TG_OP <> 'DELETE' THEN NEW.chore_id END
+  );
+  RETURN NULL;
+END;
+$$;
+
+CREATE OR REPLACE FUNCTION public.bump_expense_split_household_version()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  PERFORM public.bump_household_version(e.household_id, 'expenses')
+  FROM public.expenses e
+  WHERE e.id IN (
+    CASE WHEN TG_OP <> 'INSERT' THEN OLD.expense_id END,
+    CASE WHEN TG_OP <> 'DELETE' THEN NEW.expense_id END
+  );
+  RETURN NULL;
+END;
+$$;
+
+-- A profile appears in every household its user belongs to
+CREATE OR REPLACE FUNCTION public.bump_profile_household_versions()
+RETURNS TRIGGER
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+BEGIN
+  PERFORM public.bump_household_version(r.household_id, 'members')
+  FROM public.roommates r
+  WHERE r.user_id = NEW.id;
+  RETURN NULL;
+END;
+$$;
+
+DROP TRIGGER IF EXISTS bump_households_version ON public.households;
+CREATE TRIGGER bump_households_version AFTER INSERT OR UPDATE ON public.households
+  FOR EACH ROW EXECUTE FUNCTION public.bump_household_version_trigger('members', 'id');
+
+DROP TRIGGER IF EXISTS bump_roommates_version ON public.roommates;
+CREATE TRIGGER bump_roommates_version AFTER INSERT OR UPDATE OR DELETE ON public.roommates
+  FOR EACH ROW EXECUTE FUNCTION public.bump_household_version_trigger('members');
+
+DROP TRIGGER IF EXISTS bump_profiles_version ON public.profiles;
+CREATE TRIGGER bump_profiles_version AFTER UPDATE ON public.profiles
+  FOR EACH ROW EXECUTE FUNCTION public.bump_profile_household_versions();
+
+DROP TRIGGER IF EXISTS bump_chores_version ON public.chores;
+CREATE TRIGGER bump_chores_version AFTER INSERT OR UPDATE OR DELETE ON public.chores
+  FOR EACH ROW EXECUTE FUNCTION public.bump_household_version_trigger('chores');
+
+DROP TRIGGER IF EXISTS bump_chore_assignments_version ON public.chore_assignments;
+CREATE TRIGGER bump_chore_assignments_version AFTER INSERT OR UPDATE OR DELETE ON public.chore_assignments
+  FOR EACH ROW EXECUTE FUNCTION public.bump_chore_assignment_household_version();
+
+DROP TRIGGER IF EXISTS bump_expenses_version ON public.expenses;
+CREATE TRIGGER bump_expenses_version AFTER INSERT OR UPDATE OR DELETE ON public.expenses
+  FOR EACH ROW EXECUTE FUNCTION public.bump_household_version_trigger('expenses');
+
+DROP TRIGGER IF EXISTS bump_expense_splits_version ON public.expense_splits;
+CREATE TRIGGER bump_expense_splits_version AFTER INSERT OR UPDATE OR DELETE ON public.expense_splits
+  FOR EACH ROW EXECUTE FUNCTION public.bump_expense_split_household_version();
+
+-- Versions of the given households, plus every household the caller has joined
+-- when p_include_memberships, for each of p_scopes (0 where nothing has changed
+-- yet). Only households the caller is an accepted roommate of are returned, so
+-- versions don't reveal activity elsewhere, and joining or leaving a household
+-- changes the result. Ordered, so equal versions always serialize the same.
+CREATE OR REPLACE FUNCTION public.cache_versions(
+  p_household_ids UUID[],
+  p_scopes TEXT[],
+  p_include_memberships BOOLEAN DEFAULT false
+)
+RETURNS TABLE (household_id UUID, scope TEXT, version BIGINT)
+LANGUAGE sql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+  WITH households AS (
+    SELECT r.household_id
+    FROM public.roommates r
+    WHERE r.user_id = auth.uid()
+      AND r.status = 'accepted'
+      AND (p_include_memberships OR r.household_id = ANY(p_household_ids))
+  )
+  SELECT h.household_id, s.scope, COALESCE(v.version, 0)
+  FROM households h
+  CROSS JOIN unnest(p_scopes) AS s(scope)
+  LEFT JOIN public.household_versions v
+    ON v.household_id = h.household_id AND v.scope = s.scope
+  ORDER BY 1, 2;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.cache_versions(UUID[], TEXT[], BOOLEAN) TO authenticated;
@@ -0,0 +1,104 @@
+-- Full-text search over household messages
+-- A composite GIN index over (household_id, tsvector of content) lets one index
+-- scan find a household's matching messages, however many messages other
+-- households have. The tsvector is an index expression rather than a stored
+-- column so that select("*") reads of messages keep returning only the columns
+-- the Message type declares. Every word of the query matches as a prefix, so
+-- partial words find messages as they are typed ("piz" finds "pizza"). Queries
+-- with no searchable words (only stop words or punctuation) fall back to
+-- trigram matching on the raw content.
+-- Highlights are HTML: the content is escaped before matches are wrapped in
+-- <mark></mark>, so a message's own markup is never rendered.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE EXTENSION IF NOT EXISTS btree_gin;
+
+-- search_messages() must use this exact expression for the index to apply
+CREATE INDEX IF NOT EXISTS idx_messages_household_content_tsv
+  ON public.messages USING GIN (household_id, to_tsvector('english'::regconfig, content));
+
+CREATE INDEX IF NOT EXISTS idx_messages_household_content_trgm
+  ON public.messages USING GIN (household_id, content gin_trgm_ops);
+
+-- Escapes text for inclusion in HTML
+CREATE OR REPLACE FUNCTION public.html_escape(p_text TEXT)
+RETURNS TEXT
+LANGUAGE sql
+IMMUTABLE
+AS $$
+  SELECT replace(replace(replace(replace(replace(p_text,
+    '&', '&amp;'), '<', '&lt;'), '>', '&gt;'), '"', '&quot;'), '''', '&#39;')
+$$;
+
+-- Ranked, highlighted search results, keyset-paginated on (rank, created_at, id)
+-- descending. Pass the last row's rank, created_at and id to get the next page.
+-- Runs with the caller's privileges, so message RLS still applies.
+CREATE OR REPLACE FUNCTION public.search_messages(
+  p_household_id UUID,
+  p_query TEXT,
+  p_limit INTEGER DEFAULT 20,
+  p_after_rank DOUBLE PRECISION DEFAULT NULL,
+  p_after_created_at TIMESTAMP WITH TIME ZONE DEFAULT NULL,
+  p_after_id UUID DEFAULT NULL
+)
+RETURNS TABLE (
+  id UUID,
+  household_id UUID,
+  sender_id UUID,
+  content TEXT,
+  message_type TEXT,
+  metadata TEXT,
+  created_at TIMESTAMP WITH TIME ZONE,
+  rank DOUBLE PRECISION,
+  highlight TEXT
+)
+LANGUAGE plpgsql
+STABLE
+AS $$
+DECLARE
+  -- 'word1':* & 'word2':* ...; to_tsquery() stems the words and drops stop words
+  v_tsquery TSQUERY := (
+    SELECT to_tsquery('english', string_agg(word || ':*', ' & '))
+    FROM regexp_split_to_table(lower(p_query), '[^[:alnum:]]+') AS word
+    WHERE word <> ''
+  );
+  v_pattern TEXT := '%' || replace(replace(replace(p_query, '\', '\\'), '%', '\%'), '_', '\_') || '%';
+BEGIN
+  IF v_tsquery IS NOT NULL AND numnode(v_tsquery) > 0 THEN
+    RETURN QUERY
+    SELECT m.id, m.household_id, m.sender_id, m.content, m.message_type, m.metadata::text, m.created_at,
+           m.rank,
+           ts_headline('english', public.html_escape(m.content), v_tsquery,
+                       'StartSel=<mark>, StopSel=</mark>, MaxWords=35, MinWords=15, MaxFragments=2')
+    FROM (
+      SELECT msg.*, ts_rank_cd(to_tsvector('english'::regconfig, msg.content), v_tsquery)::double precision AS rank
+      FROM public.messages msg
+      WHERE msg.household_id = p_household_id
+        AND to_tsvector('english'::regconfig, msg.content) @@ v_tsquery
+    ) m
+    WHERE p_after_id IS NULL
+       OR (m.rank, m.created_at, m.id) < (p_after_rank, p_after_created_at, p_after_id)
+    ORDER BY m.rank DESC, m.created_at DESC, m.id DESC
+    LIMIT p_limit;
+  ELSE
+    RETURN QUERY
+    SELECT m.id, m.household_id, m.sender_id, m.content, m.message_type, m.metadata::text, m.created_at,
+           m.rank,
+           regexp_replace(public.html_escape(m.content),
+                          '(' || regexp_replace(public.html_escape(p_query), '([.^$*+?()\[\]{}|\\-])', '\\\1', 'g') || ')',
+                          '<mark>\1</mark>', 'gi')
+    FROM (
+      SELECT msg.*, similarity(msg.content, p_query)::double precision AS rank
+      FROM public.messages msg
+      WHERE msg.household_id = p_household_id
+        AND msg.content ILIKE v_pattern
+    ) m
+    WHERE p_after_id IS NULL
+       OR (m.rank, m.created_at, m.id) < (p_after_rank, p_after_created_at, p_after_id)
+    ORDER BY m.rank DESC, m.created_at DESC, m.id DESC
+    LIMIT p_limit;
+  END IF;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.search_messages(UUID, TEXT, INTEGER, DOUBLE PRECISION, TIMESTAMP WITH TIME ZONE, UUID) TO authenticated;
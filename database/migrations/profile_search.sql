@@ -0,0 +1,88 @@
+-- Typeahead search over profiles for roommate invites
+-- Name prefix matches are served by a text_pattern_ops btree index on the
+-- lowercased name, typo-tolerant matches by a trigram GIN index. An email only
+-- matches in full: prefix matching would let anyone enumerate which addresses
+-- have an account.
+
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS idx_profiles_full_name_prefix
+  ON public.profiles(lower(full_name) text_pattern_ops);
+
+CREATE INDEX IF NOT EXISTS idx_profiles_email_lower
+  ON public.profiles(lower(email));
+
+CREATE INDEX IF NOT EXISTS idx_profiles_full_name_trgm
+  ON public.profiles USING GIN (lower(full_name) gin_trgm_ops);
+
+-- Profiles whose name starts with the prefix or whose email is exactly it, then
+-- names similar to it. The caller is left out of each branch, before its LIMIT.
+-- Profiles are only visible to their owner under RLS, so this runs with the
+-- owner's privileges and returns only columns that are safe to show any user:
+-- email is matched but never returned.
+CREATE OR REPLACE FUNCTION public.search_profiles(
+  p_prefix TEXT,
+  p_limit INTEGER DEFAULT 10
+)
+RETURNS TABLE (
+  id UUID,
+  full_name TEXT,
+  avatar_url TEXT
+)
+LANGUAGE plpgsql
+STABLE
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_prefix TEXT := lower(trim(p_prefix));
+  v_pattern TEXT;
+  v_limit INTEGER := LEAST(GREATEST(COALESCE(p_limit, 10), 1), 20);
+BEGIN
+  IF auth.uid() IS NULL THEN
+    RAISE EXCEPTION 'Not authenticated';
+  END IF;
+
+  IF length(v_prefix) < 2 THEN
+    RETURN;
+  END IF;
+
+  v_pattern := replace(replace(replace(v_prefix, '\', '\\'), '%', '\%'), '_', '\_') || '%';
+
+  RETURN QUERY
+  SELECT matches.id, matches.full_name, matches.avatar_url
+  FROM (
+    (
+      SELECT p.id, p.full_name, p.avatar_url, 0 AS tier, 1.0::real AS score
+      FROM public.profiles p
+      WHERE lower(p.full_name) LIKE v_pattern
+        AND p.id <> auth.uid()
+      ORDER BY lower(p.full_name)
+      LIMIT v_limit
+    )
+    UNION ALL
+    (
+      SELECT p.id, p.full_name, p.avatar_url, 0 AS tier, 1.0::real AS score
+      FROM public.profiles p
+      WHERE lower(p.email) = v_prefix
+        AND p.id <> auth.uid()
+    )
+    UNION ALL
+    (
+      -- Trigrams need a few characters to be selective
+      SELECT p.id, p.full_name, p.avatar_url, 1 AS tier, similarity(lower(p.full_name), v_prefix) AS score
+      FROM public.profiles p
+      WHERE length(v_prefix) >= 3
+        AND lower(p.full_name) % v_prefix
+        AND p.id <> auth.uid()
+      ORDER BY lower(p.full_name) <-> v_prefix
+      LIMIT v_limit
+    )
+  ) matches
+  GROUP BY matches.id, matches.full_name, matches.avatar_url
+  ORDER BY MIN(matches.tier), MAX(matches.score) DESC, matches.full_name
+  LIMIT v_limit;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.search_profiles(TEXT, INTEGER) TO authenticated;
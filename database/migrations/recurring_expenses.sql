@@ -0,0 +1,185 @@
+-- Recurring expenses (app/jobs/recurring_expenses.py)
+-- An expense template is a bill a household pays every month: its rent, whose
+-- amount and currency follow households.rent_amount and households.currency, or
+-- a bill with its own amount. The job generates each month's expenses and splits
+-- for all templates in bulk. generated_expenses records the expense made from a
+-- template for a month, so a month is generated at most once however often the
+-- job runs, and deleting a generated expense does not bring it back.
+
+CREATE TABLE IF NOT EXISTS public.expense_templates (
+  id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+  household_id UUID REFERENCES public.households(id) ON DELETE CASCADE NOT NULL,
+  kind TEXT NOT NULL DEFAULT 'bill' CHECK (kind IN ('rent', 'bill')),
+  title TEXT NOT NULL,
+  description TEXT,
+  -- NULL for rent: the household's rent_amount when the month is generated
+  amount DECIMAL(10,2) CHECK (amount > 0),
+  currency TEXT,
+  category TEXT CHECK (category IN ('rent', 'utilities', 'groceries', 'cleaning', 'maintenance', 'other')),
+  paid_by UUID REFERENCES public.profiles(id) ON DELETE CASCADE NOT NULL,
+  -- NULL splits it between everyone in the household that month
+  split_with UUID[],
+  day_of_month SMALLINT NOT NULL DEFAULT 1 CHECK (day_of_month BETWEEN 1 AND 28),
+  is_active BOOLEAN NOT NULL DEFAULT true,
+  created_by UUID REFERENCES public.profiles(id) ON DELETE SET NULL,
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  CHECK (kind = 'rent' OR amount IS NOT NULL)
+);
+
+-- A household has one rent
+CREATE UNIQUE INDEX IF NOT EXISTS idx_expense_templates_rent
+  ON public.expense_templates(household_id)
+  WHERE kind = 'rent';
+
+CREATE INDEX IF NOT EXISTS idx_expense_templates_household
+  ON public.expense_templates(household_id);
+
+-- The job pages through active templates in id order
+CREATE INDEX IF NOT EXISTS idx_expense_templates_active
+  ON public.expense_templates(id)
+  WHERE is_active;
+
+DROP TRIGGER IF EXISTS update_expense_templates_updated_at ON public.expense_templates;
+CREATE TRIGGER update_expense_templates_updated_at BEFORE UPDATE ON public.expense_templates
+  FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+CREATE TABLE IF NOT EXISTS public.generated_expenses (
+  template_id UUID REFERENCES public.expense_templates(id) ON DELETE CASCADE NOT NULL,
+  period_start DATE NOT NULL,
+  -- Chosen when the month is claimed, before the expense is inserted
+  expense_id UUID DEFAULT gen_random_uuid()
+    REFERENCES public.expenses(id) ON DELETE SET NULL DEFERRABLE INITIALLY DEFERRED,
+  generated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  PRIMARY KEY (template_id, period_start)
+);
+
+CREATE INDEX IF NOT EXISTS idx_generated_expenses_expense_id
+  ON public.generated_expenses(expense_id);
+
+ALTER TABLE public.expense_templates ENABLE ROW LEVEL SECURITY;
+
+CREATE POLICY "Members can manage their household's expense templates" ON public.expense_templates
+  FOR ALL USING (
+    household_id IN (
+      SELECT household_id FROM public.roommates WHERE user_id = auth.uid() AND status = 'accepted'
+    )
+  );
+
+ALTER TABLE public.generated_expenses ENABLE ROW LEVEL SECURITY;
+
+-- A rent template for every household that has a rent_amount, paid by its
+-- creator (or its longest-standing roommate). They start inactive: rent_amount
+-- is also the asking rent of listings, so a household only starts getting
+-- monthly rent expenses once a roommate turns its template on.
+INSERT INTO public.expense_templates (household_id, kind, title, category, paid_by, is_active, created_by)
+SELECT h.id, 'rent', 'Rent', 'rent', payer.user_id, false, payer.user_id
+FROM public.households h
+CROSS JOIN LATERAL (
+  SELECT r.user_id
+  FROM public.roommates r
+  WHERE r.household_id = h.id AND r.status = 'accepted'
+  ORDER BY r.user_id = h.created_by DESC, r.joined_at, r.user_id
+  LIMIT 1
+) payer
+WHERE h.rent_amount > 0
+  AND NOT EXISTS (
+    SELECT 1 FROM public.expense_templates t WHERE t.household_id = h.id AND t.kind = 'rent'
+  );
+
+DROP TRIGGER IF EXISTS bump_expense_templates_version ON public.expense_templates;
+CREATE TRIGGER bump_expense_templates_version AFTER INSERT OR UPDATE OR DELETE ON public.expense_templates
+  FOR EACH ROW EXECUTE FUNCTION public.bump_household_version_trigger('expenses');
+
+-- Generates the month starting p_period_start for the given templates: one
+-- expense per template not yet generated for it, split evenly between its
+-- sharers, with the payer's own split paid. Splits are rounded to the cent and
+-- the rounding remainder goes on the payer's split (or the first sharer's when
+-- the payer doesn't share it), so they always add up to the expense. Three set-based statements,
+-- whatever the number of templates.
+CREATE OR REPLACE FUNCTION public.generate_recurring_expenses(
+  p_period_start DATE,
+  p_template_ids UUID[]
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_template_ids UUID[];
+  v_expense_ids UUID[];
+  v_splits INTEGER;
+BEGIN
+  IF p_period_start <> date_trunc('month', p_period_start)::DATE THEN
+    RAISE EXCEPTION 'A period starts on the first of a month';
+  END IF;
+
+  -- Claim the month for every template due that has an amount and someone to
+  -- split it with. A template claimed before, by an earlier or a concurrent
+  -- run, is skipped.
+  WITH claimed AS (
+    INSERT INTO public.generated_expenses (template_id, period_start)
+    SELECT t.id, p_period_start
+    FROM public.expense_templates t
+    JOIN public.households h ON h.id = t.household_id
+    WHERE t.id = ANY(p_template_ids)
+      AND t.is_active
+      AND COALESCE(t.amount, h.rent_amount) > 0
+      AND EXISTS (
+        SELECT 1 FROM public.roommates r
+        WHERE r.household_id = t.household_id
+          AND r.status = 'accepted'
+          AND (t.split_with IS NULL OR r.user_id = ANY(t.split_with))
+      )
+    ON CONFLICT (template_id, period_start) DO NOTHING
+    RETURNING template_id, expense_id
+  )
+  SELECT array_agg(template_id), array_agg(expense_id)
+  INTO v_template_ids, v_expense_ids
+  FROM claimed;
+
+  IF v_template_ids IS NULL THEN
+    RETURN jsonb_build_object('expenses', 0, 'splits', 0);
+  END IF;
+
+  -- Both inserts go in household order, so the per-household locks their
+  -- triggers take are always acquired in the same order (household_change_log.sql)
+  INSERT INTO public.expenses (id, household_id, title, description, amount, currency, category, paid_by, due_date)
+  SELECT g.expense_id, t.household_id, t.title, t.description,
+         COALESCE(t.amount, h.rent_amount), COALESCE(t.currency, h.currency, 'USD'), t.category, t.paid_by,
+         (p_period_start + t.day_of_month - 1)::TIMESTAMP AT TIME ZONE 'UTC'
+  FROM unnest(v_template_ids, v_expense_ids) AS g(template_id, expense_id)
+  JOIN public.expense_templates t ON t.id = g.template_id
+  JOIN public.households h ON h.id = t.household_id
+  ORDER BY t.household_id, g.expense_id;
+
+  INSERT INTO public.expense_splits (expense_id, user_id, amount, is_paid, paid_at)
+  SELECT s.expense_id, s.user_id,
+         s.share + CASE WHEN s.position = 1 THEN s.amount - s.share * s.sharers ELSE 0 END,
+         s.user_id = s.paid_by,
+         CASE WHEN s.user_id = s.paid_by THEN NOW() END
+  FROM (
+    SELECT sharer.*,
+           ROUND(sharer.amount / COUNT(*) OVER w, 2) AS share,
+           COUNT(*) OVER w AS sharers,
+           ROW_NUMBER() OVER (w ORDER BY sharer.user_id = sharer.paid_by DESC, sharer.user_id) AS position
+    FROM (
+      SELECT t.household_id, g.expense_id, r.user_id, t.paid_by, COALESCE(t.amount, h.rent_amount) AS amount
+      FROM unnest(v_template_ids, v_expense_ids) AS g(template_id, expense_id)
+      JOIN public.expense_templates t ON t.id = g.template_id
+      JOIN public.households h ON h.id = t.household_id
+      JOIN public.roommates r ON r.household_id = t.household_id AND r.status = 'accepted'
+      WHERE t.split_with IS NULL OR r.user_id = ANY(t.split_with)
+    ) sharer
+    WINDOW w AS (PARTITION BY sharer.expense_id)
+  ) s
+  ORDER BY s.household_id, s.expense_id, s.user_id;
+  GET DIAGNOSTICS v_splits = ROW_COUNT;
+
+  RETURN jsonb_build_object('expenses', cardinality(v_template_ids), 'splits', v_splits);
+END;
+$$;
+
+-- Only the job, with the service role key, generates expenses
+REVOKE EXECUTE ON FUNCTION public.generate_recurring_expenses(DATE, UUID[]) FROM PUBLIC, anon, authenticated;
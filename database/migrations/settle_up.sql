@@ -0,0 +1,91 @@
+-- Settling up between roommates (the settleUp mutation)
+-- settle_up() marks every matching unpaid split between the caller and their
+-- roommates paid in one conditional UPDATE, so the household_balances triggers
+-- (expense_balances.sql) update the balances in the same statement. It then
+-- sends each counterparty one notification for all of it.
+
+CREATE OR REPLACE FUNCTION public.settle_up(
+  p_household_id UUID,
+  p_counterparty_id UUID DEFAULT NULL,
+  p_split_ids UUID[] DEFAULT NULL
+)
+RETURNS JSONB
+LANGUAGE plpgsql
+SECURITY DEFINER
+SET search_path = public
+AS $$
+DECLARE
+  v_user_id UUID := auth.uid();
+  v_name TEXT;
+  v_result JSONB;
+BEGIN
+  IF (p_counterparty_id IS NULL) = (p_split_ids IS NULL) THEN
+    RAISE EXCEPTION 'Pass either a counterparty or split ids to settle';
+  END IF;
+
+  IF NOT EXISTS (
+    SELECT 1 FROM public.roommates
+    WHERE household_id = p_household_id AND user_id = v_user_id AND status = 'accepted'
+  ) THEN
+    RAISE EXCEPTION 'Not a member of this household';
+  END IF;
+
+  SELECT COALESCE(full_name, email) INTO v_name FROM public.profiles WHERE id = v_user_id;
+
+  -- Splits the caller owes on someone else's expense, or someone owes on theirs.
+  -- The NOT is_paid condition is re-checked on rows a concurrent settle-up
+  -- locked first, so no split is counted twice.
+  WITH settled AS (
+    UPDATE public.expense_splits s
+    SET is_paid = true, paid_at = NOW()
+    FROM public.expenses e
+    WHERE e.id = s.expense_id
+      AND e.household_id = p_household_id
+      AND NOT s.is_paid
+      AND s.user_id <> e.paid_by
+      AND (s.user_id = v_user_id OR e.paid_by = v_user_id)
+      AND (p_split_ids IS NULL OR s.id = ANY(p_split_ids))
+      AND (p_counterparty_id IS NULL OR p_counterparty_id IN (s.user_id, e.paid_by))
+    RETURNING s.id, s.user_id, e.paid_by, COALESCE(e.currency, 'USD') AS currency, s.amount
+  ), totals AS (
+    SELECT CASE WHEN st.user_id = v_user_id THEN st.paid_by ELSE st.user_id END AS counterparty_id,
+           st.currency,
+           COUNT(*)::INTEGER AS splits,
+           COALESCE(SUM(st.amount) FILTER (WHERE st.user_id = v_user_id), 0) AS paid,
+           COALESCE(SUM(st.amount) FILTER (WHERE st.paid_by = v_user_id), 0) AS received
+    FROM settled st
+    GROUP BY 1, 2
+  ), notified AS (
+    INSERT INTO public.notifications (user_id, title, message, type, metadata)
+    SELECT t.counterparty_id,
+           'Settled up',
+           format('%s settled %s expense split%s with you', COALESCE(v_name, 'A roommate'),
+                  SUM(t.splits), CASE WHEN SUM(t.splits) = 1 THEN '' ELSE 's' END),
+           'expense',
+           -- Stored as a JSON string, like every other notification's metadata
+           to_jsonb(jsonb_build_object(
+             'household_id', p_household_id,
+             'settled_by', v_user_id,
+             'totals', jsonb_agg(jsonb_build_object(
+               'currency', t.currency, 'splits', t.splits, 'paid_to_you', t.paid, 'received_from_you', t.received
+             ))
+           )::text)
+    FROM totals t
+    GROUP BY t.counterparty_id
+  )
+  SELECT jsonb_build_object(
+    'split_ids', COALESCE((SELECT jsonb_agg(st.id) FROM settled st), '[]'::jsonb),
+    'totals', COALESCE((
+      SELECT jsonb_agg(jsonb_build_object(
+        'counterparty_id', t.counterparty_id, 'currency', t.currency, 'splits', t.splits,
+        'paid', t.paid, 'received', t.received
+      ) ORDER BY t.counterparty_id, t.currency)
+      FROM totals t
+    ), '[]'::jsonb)
+  ) INTO v_result;
+
+  RETURN v_result;
+END;
+$$;
+
+GRANT EXECUTE ON FUNCTION public.settle_up(UUID, UUID, UUID[]) TO authenticated;